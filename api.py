@@ -0,0 +1,326 @@
+"""
+Read-only JSON feed API for aINeedToKnow - serves the ranked catalog from the shared snapshot
+(same hotness overlay as the app) with ETags and gzip, no Streamlit session per request
+
+Endpoints: /api/feed, /api/domains/<domain>, /api/search?q=..., /api/tools/<tool_id>
+(list endpoints take ?page= and ?per_page=)
+
+Usage: python api.py [--host 127.0.0.1] [--port 8502]
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+import numpy as np
+import pandas as pd
+from config import *
+from facets import FacetIndex
+from link_health import safe_url
+from search_index import SearchIndex
+from snapshot import get_snapshot_store, get_detail_cache
+
+
+class NotFound(Exception):
+    """Unknown endpoint, domain or tool"""
+
+
+class CatalogIndexes:
+    """Facet and search indexes for one catalog content version (hotness and link status
+    overlays don't change them), the search index built on first use"""
+
+    def __init__(self, snapshot):
+        self.content_version = snapshot.content_version
+        frame = snapshot.frame
+        self.facets = FacetIndex(frame)
+        self.positions = {int(tool_id): position for position, tool_id in enumerate(frame['tool_id'].tolist())}
+        self._frame = frame
+        self._search = None
+        self._lock = threading.Lock()
+
+    def search_index(self):
+        with self._lock:
+            if self._search is None:
+                self._search = SearchIndex(self._frame)
+        return self._search.update_details(get_detail_cache())
+
+
+class CatalogViews:
+    """Ranked order for one snapshot version, plus the indexes of its content version
+
+    previous: the views of the snapshot before, whose indexes (same content) and ranking
+    (same hotness too) are reused instead of rebuilt
+    """
+
+    def __init__(self, snapshot, previous=None):
+        self.snapshot = snapshot
+        self.frame = snapshot.frame
+        same_content = previous is not None and previous.snapshot.content_version == snapshot.content_version
+        self.indexes = previous.indexes if same_content else CatalogIndexes(snapshot)
+        if same_content and previous.snapshot.hotness_revision == snapshot.hotness_revision:
+            self.ranked = previous.ranked
+        else:
+            self.ranked = self._rank(self.frame)
+        self.facets = self.indexes.facets
+        self.positions = self.indexes.positions
+
+    @staticmethod
+    def _rank(frame):
+        # Same order as the app's feed: trending, then all-time votes, then newest (undated last)
+        dates = frame['Date_Added'].to_numpy(dtype='datetime64[ns]')
+        dates = np.where(np.isnat(dates), np.iinfo(np.int64).min + 1, dates.astype(np.int64))
+        return np.lexsort((
+            -dates,
+            -frame['hotness_count'].to_numpy(dtype=np.int64),
+            -frame['hotness_trending'].to_numpy(dtype=np.float64),
+        ))
+
+    def search_index(self):
+        return self.indexes.search_index()
+
+
+class FeedAPI:
+    """Request handling independent of the HTTP server: path + query in, (status, headers, body) out
+
+    Responses are cached per snapshot version, so repeated and conditional requests cost a
+    dict lookup until the next refresh or hotness update publishes a new snapshot.
+    """
+
+    def __init__(self, data_manager=None, cache_size=1024):
+        self.data_manager = data_manager
+        self.cache_size = cache_size
+        self._views = None
+        self._responses = OrderedDict()
+        self._lock = threading.Lock()
+
+    def connected_data_manager(self):
+        """The given DataManager, else the warm-up's shared one once it has connected"""
+        if self.data_manager is None:
+            from warmup import start_warm_up
+            dm = start_warm_up().data_manager
+        else:
+            dm = self.data_manager
+        return dm if dm is not None and dm.sheet else None
+
+    def current_snapshot(self):
+        """Shared snapshot, kicking off the app's background refreshes when it has gone stale"""
+        dm = self.connected_data_manager()
+        if dm is not None:
+            return dm.get_catalog_snapshot()
+        return get_snapshot_store().current()
+
+    def views(self, snapshot):
+        with self._lock:
+            if self._views is None or self._views.snapshot is not snapshot:
+                self._views = CatalogViews(snapshot, previous=self._views)
+                self._responses.clear()
+            return self._views
+
+    def handle(self, url, accept_encoding='', if_none_match=None):
+        snapshot = self.current_snapshot()
+        if snapshot is None or snapshot.empty:
+            status, body, _, _ = self._encode(503, {'error': "Catalog is still loading"})
+            return status, {'Content-Type': 'application/json; charset=utf-8', 'Retry-After': '5'}, body
+
+        views = self.views(snapshot)
+        with self._lock:
+            cached = self._responses.get(url)
+        if cached is None:
+            try:
+                payload, cacheable = self._route(views, url)
+                status = 200
+            except NotFound as e:
+                status, payload, cacheable = 404, {'error': str(e)}, True
+            except ValueError as e:
+                status, payload, cacheable = 400, {'error': str(e)}, True
+            cached = self._encode(status, payload)
+            if cacheable:
+                with self._lock:
+                    self._responses[url] = cached
+                    while len(self._responses) > self.cache_size:
+                        self._responses.popitem(last=False)
+
+        status, body, gzipped, etag = cached
+        headers = {
+            'Content-Type': 'application/json; charset=utf-8',
+            'Cache-Control': 'public, max-age=60',
+            'ETag': etag,
+            'Vary': 'Accept-Encoding',
+            'X-Catalog-Version': snapshot.version,
+        }
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(',')]:
+            return 304, headers, b''
+        if gzipped is not None and 'gzip' in accept_encoding:
+            headers['Content-Encoding'] = 'gzip'
+            body = gzipped
+        return status, headers, body
+
+    def _encode(self, status, payload):
+        body = json.dumps(payload, separators=(',', ':'), default=str).encode('utf-8')
+        # Bodies this small don't shrink enough to be worth a gzip member
+        gzipped = gzip.compress(body, compresslevel=6) if len(body) > 1024 else None
+        etag = f'"{hashlib.sha1(body).hexdigest()[:20]}"'
+        return status, body, gzipped, etag
+
+    def _route(self, views, url):
+        """(payload, cacheable) for one GET"""
+        parts = urlsplit(url)
+        path = [unquote(part) for part in parts.path.strip('/').split('/')]
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+
+        if path == ['api', 'feed']:
+            return self._page(views, views.ranked, query), True
+
+        if len(path) == 3 and path[:2] == ['api', 'domains']:
+            if path[2] not in views.facets.domains:
+                raise NotFound(f"Unknown domain: {path[2]}")
+            mask = views.facets.domain_bitmap([path[2]])
+            return self._page(views, views.ranked[mask[views.ranked]], query, domain=path[2]), True
+
+        if path == ['api', 'search']:
+            search_query = query.get('q', '').strip()
+            if not search_query:
+                raise ValueError("Missing ?q=")
+            labels = views.search_index().search(search_query, hotness=views.frame['hotness_trending'].to_numpy())
+            positions = views.frame.index.get_indexer(labels)
+            return self._page(views, positions, query, q=search_query), True
+
+        if len(path) == 3 and path[:2] == ['api', 'tools']:
+            return self._tool(views, path[2])
+
+        raise NotFound(f"No such endpoint: {parts.path}")
+
+    def _page(self, views, positions, query, **meta):
+        try:
+            page = max(int(query.get('page', 1)), 1)
+            per_page = min(max(int(query.get('per_page', 30)), 1), 100)
+        except ValueError:
+            raise ValueError("page and per_page must be integers")
+
+        start = (page - 1) * per_page
+        rows = views.frame.iloc[positions[start:start + per_page]]
+        return {
+            'version': views.snapshot.version,
+            **meta,
+            'total': int(len(positions)),
+            'page': page,
+            'per_page': per_page,
+            'tools': [tool_record(row) for _, row in rows.iterrows()],
+        }
+
+    def _tool(self, views, tool_id):
+        try:
+            position = views.positions[int(tool_id)]
+        except (ValueError, KeyError):
+            raise NotFound(f"Unknown tool: {tool_id}")
+
+        row = views.frame.iloc[position]
+        tool_id = int(row['tool_id'])
+        details, missing = get_detail_cache().get_many([tool_id])
+        dm = self.connected_data_manager()
+        if missing and dm is not None:
+            details = dm.get_tool_details({tool_id: int(row['sheet_row'])})
+
+        record = tool_record(row)
+        record['details'] = {column: details.get(tool_id, {}).get(column, '') for column in DETAIL_COLUMNS}
+        # Don't cache a tool whose details couldn't be loaded yet
+        return {'version': views.snapshot.version, 'tool': record}, tool_id in details
+
+
+def tool_record(row):
+    """Public JSON form of one catalog row"""
+    date_added = row.get('Date_Added')
+    return {
+        'tool_id': int(row['tool_id']),
+        'title': str(row.get('Title', '')),
+        'summary': str(row.get('Summary', '')),
+        'source_url': safe_url(row.get('Source_URL', '')),
+        'author': str(row.get('Author/Company', '')),
+        'domain': str(row.get('Domain', '')),
+        'link_status': str(row.get('link_status', '') or '') or None,
+        'date_added': date_added.strftime('%Y-%m-%d') if pd.notna(date_added) else None,
+        'hotness': {
+            'total': int(row.get('hotness_count', 0)),
+            'today': int(row.get('hotness_today', 0)),
+            'week': int(row.get('hotness_week', 0)),
+            'trending': round(float(row.get('hotness_trending', 0)), 3),
+        },
+    }
+
+
+class FeedRequestHandler(BaseHTTPRequestHandler):
+    """GET/HEAD only, answered by the server's FeedAPI"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out as separate writes, don't let Nagle hold the body back on keep-alive
+    disable_nagle_algorithm = True
+
+    def do_GET(self, head=False):
+        try:
+            status, headers, body = self.server.api.handle(
+                self.path,
+                accept_encoding=self.headers.get('Accept-Encoding', ''),
+                if_none_match=self.headers.get('If-None-Match'),
+            )
+        except Exception as e:
+            print(f"❌ Feed API error for {self.path}: {e}")
+            status, headers, body = 500, {'Content-Type': 'application/json'}, b'{"error":"Internal error"}'
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if not head:
+            self.wfile.write(body)
+
+    def do_HEAD(self):
+        self.do_GET(head=True)
+
+    def log_message(self, format, *args):
+        pass  # One line per request would drown the app's own logging
+
+
+def serve_api(port=FEED_API_PORT, data_manager=None, host=FEED_API_HOST):
+    """HTTP server for the feed API (call serve_forever(), or use start_api_server)"""
+    server = ThreadingHTTPServer((host, port), FeedRequestHandler)
+    server.daemon_threads = True
+    server.api = FeedAPI(data_manager)
+    return server
+
+
+def start_api_server(port=FEED_API_PORT, data_manager=None, host=FEED_API_HOST):
+    """Serve the feed API from a background thread next to the Streamlit app
+
+    Returns None when the port can't be bound (e.g. taken by another replica); the app
+    runs on without the API.
+    """
+    try:
+        server = serve_api(port, data_manager, host)
+    except OSError as e:
+        print(f"⚠️ Feed API not started, could not listen on {host}:{port}: {e}")
+        return None
+    threading.Thread(target=server.serve_forever, name="feed-api", daemon=True).start()
+    print(f"🛰️ Feed API listening on http://{host}:{server.server_address[1]}/api/feed")
+    return server
+
+
+def main():
+    from warmup import start_warm_up
+
+    parser = argparse.ArgumentParser(description="aINeedToKnow read-only feed API")
+    parser.add_argument("--host", default=FEED_API_HOST)
+    parser.add_argument("--port", type=int, default=FEED_API_PORT)
+    args = parser.parse_args()
+
+    warm_up = start_warm_up()
+    server = serve_api(args.port, warm_up.wait_for_connection(timeout=30), args.host)
+    print(f"🛰️ Feed API listening on http://{args.host}:{args.port}/api/feed")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
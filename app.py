@@ -9,7 +9,20 @@ from datetime import datetime
 import time
 import os
 import hashlib
-from data_manager import DataManager
+from data_manager import DataManager, memory_report
+from search_index import SearchIndex
+from facets import FacetIndex, DATE_WINDOWS
+import numpy as np
+from snapshot import get_snapshot_store, get_detail_cache
+from warmup import start_warm_up
+from ui_state import get_tile_state, get_render_timeline, is_mobile_layout, set_viewport_width, session_memory_report
+from identity import get_session_identity
+from circuit_breaker import get_sheets_breaker
+from shared_cache import get_shared_cache
+from rate_limit import get_vote_limiter
+from link_health import LINK_DEAD, get_link_health, safe_url
+from hotness import get_hotness_counters
+from components.tile_grid import tile_grid
 from config import *
 
 # Page configuration
@@ -20,46 +33,6 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-def get_client_ip():
-    """Get client IP address for hotness tracking with browser fingerprinting"""
-    try:
-        # Try to get real IP from headers (for deployed apps)
-        if hasattr(st, 'session_state') and hasattr(st.session_state, '_get_widget_value'):
-            # In Streamlit Cloud, try to get real IP
-            import streamlit.web.server.websocket_headers as wsh
-            headers = wsh.get_websocket_headers()
-            if headers and 'x-forwarded-for' in headers:
-                real_ip = headers['x-forwarded-for'].split(',')[0].strip()
-                # Store real IP in session state for consistency
-                st.session_state.client_ip = real_ip
-                return real_ip
-            elif headers and 'x-real-ip' in headers:
-                real_ip = headers['x-real-ip']
-                st.session_state.client_ip = real_ip
-                return real_ip
-        
-        # Enhanced fingerprinting for local/dev environments
-        if 'client_ip' not in st.session_state:
-            # Create a more stable fingerprint using browser characteristics
-            import time
-            import hashlib
-            
-            # Use browser session + timestamp to create unique but persistent ID
-            browser_data = f"{st.session_state.get('session_id', 'unknown')}_{int(time.time() / 3600)}"  # Changes every hour
-            fingerprint = hashlib.md5(browser_data.encode()).hexdigest()[:16]
-            st.session_state.client_ip = f"dev_{fingerprint}"
-        
-        return st.session_state.client_ip
-    except Exception as e:
-        print(f"Error getting client IP: {e}")
-        # Final fallback - create persistent session ID
-        if 'client_ip' not in st.session_state:
-            import hashlib
-            import time
-            fallback_id = hashlib.md5(f"fallback_{time.time()}".encode()).hexdigest()[:16]
-            st.session_state.client_ip = f"session_{fallback_id}"
-        return st.session_state.client_ip
-
 # Custom CSS for mobile-friendly design and hotness feature
 st.markdown("""
 <style>
@@ -430,81 +403,170 @@ def render_header():
     </div>
     """, unsafe_allow_html=True)
 
-def render_filters(dm):
-    """Render clean filter with daily updates button"""
+@st.cache_resource(max_entries=2, show_spinner=False)
+def get_search_index(version, _df):
+    """Inverted index for one dataset version, built once and shared by all sessions
+
+    Detail fields (Integration_Steps) are added to it as tiles load them, see SearchIndex.update_details.
+    """
+    return SearchIndex(_df)
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def get_facet_index(version, _df):
+    """Domain/author bitmaps and date index for one dataset version, shared by all sessions"""
+    return FacetIndex(_df)
+
+def render_filters(df, version, mobile=False):
+    """Render domain, author and date filters plus the search box"""
     
-    # Get unique domains from the data
-    available_domains = dm.get_unique_domains()
+    facet_index = get_facet_index(version, df)
     
     # Check if domain filter was set by clicking a tile
     if 'selected_domain_filter' in st.session_state:
-        try:
-            default_index = available_domains.index(st.session_state.selected_domain_filter)
-        except ValueError:
-            default_index = 0
+        if st.session_state.selected_domain_filter in facet_index.domains:
+            st.session_state.domain_facet = [st.session_state.selected_domain_filter]
         # Clear the session state filter after using it
         del st.session_state.selected_domain_filter
-    else:
-        default_index = 0
     
-    # Create clean filter row with better alignment
-    col1, col2 = st.columns([1, 1])
+    if mobile:
+        # Phones: search box up front, the facets folded into one column below it
+        col2 = st.container()
+        col1 = col3 = col4 = st.expander("🔍 Filters", expanded=bool(st.session_state.get('domain_facet')))
+    else:
+        # Create clean filter rows with better alignment
+        col1, col2 = st.columns([1, 1])
+        col3, col4 = st.columns([1, 1])
     
     with col1:
-        selected_domain = st.selectbox(
+        selected_domains = st.multiselect(
             "🔍 Filter by Domain",
-            available_domains,
-            index=default_index,
-            help="Choose a domain to filter AI tools"
+            facet_index.domain_values(),
+            key="domain_facet",
+            placeholder="All domains",
+            help="Choose one or more domains to filter AI tools"
+        )
+    
+    with col2:
+        search_query = st.text_input(
+            "🔎 Search Tools",
+            placeholder="e.g. dashboard, SQL, forecasting",
+            help="Search titles, summaries and integration steps"
+        )
+    
+    with col3:
+        selected_authors = st.multiselect(
+            "🏢 Filter by Author/Company",
+            facet_index.author_values(),
+            key="author_facet",
+            placeholder="All authors"
         )
     
-    return selected_domain, 30  # Default to 30 days since we removed time filter
+    with col4:
+        date_window = st.selectbox(
+            "📅 Added",
+            list(DATE_WINDOWS),
+            key="date_facet"
+        )
+    
+    return selected_domains, selected_authors, DATE_WINDOWS[date_window], search_query
 
 def calculate_hotness_score(hotness_count, max_hotness):
     """Calculate hotness percentage for progress bar - DEPRECATED"""
     # This function is no longer used since we removed the progress bar
     return 0
 
-def render_news_feed(dm, selected_domain, selected_days):
-    """Render the news feed with spotlight layout and pagination"""
-    st.markdown("---")
+def render_tile_placeholders(count=6):
+    """Grey skeleton tiles shown while the first catalog fetch runs"""
+    st.caption("Loading latest AI tools with hotness...")
+    for _ in range(0, count, 2):
+        for col in st.columns(2):
+            with col:
+                with st.container(border=True):
+                    st.markdown("""
+                    <div style="height: 1.6rem; width: 60%; background: #e2e8f040; border-radius: 6px; margin-bottom: 1rem;"></div>
+                    <div style="height: 0.9rem; width: 95%; background: #e2e8f030; border-radius: 6px; margin-bottom: 0.5rem;"></div>
+                    <div style="height: 0.9rem; width: 80%; background: #e2e8f030; border-radius: 6px; margin-bottom: 1.2rem;"></div>
+                    """, unsafe_allow_html=True)
+
+def load_catalog(dm):
+    """Load the catalog with hotness from the shared snapshot (no per-rerun copies)
     
-    # Extract the actual domain name (remove "Coming Soon" text if any)
-    actual_domain = selected_domain.split(" (Coming Soon)")[0] if selected_domain else "All"
+    Returns the frame and its content version, which keys the search and facet indexes
+    (it comes with the snapshot, nothing is hashed per rerun).
+    """
     
     # Check if we should force refresh
     force_refresh = hasattr(st.session_state, 'force_refresh') and st.session_state.force_refresh
-    
-    # Fetch and filter data with hotness
-    with st.spinner("Loading latest AI tools with hotness..."):
-        df = dm.fetch_news_data_with_hotness(force_refresh=force_refresh)
+    if force_refresh:
+        st.session_state.force_refresh = False  # Reset the flag
+    
+    # Only block when there is nothing to serve yet, with skeleton tiles below the header meanwhile
+    if force_refresh or get_snapshot_store().current() is None:
+        skeleton = st.empty()
+        with skeleton.container():
+            render_tile_placeholders()
+        snapshot = dm.get_catalog_snapshot(force_refresh=force_refresh)
+        skeleton.empty()
+    else:
+        snapshot = dm.get_catalog_snapshot()
+    
+    if get_sheets_breaker().is_open():
+        st.caption("⚠️ Google Sheets isn't responding, data may be stale. Votes and signups will sync when it's back.")
+    elif snapshot is not None and snapshot.source == "disk":
+        st.caption("⏳ Showing the last saved catalog while fresh data loads...")
+    if snapshot is None:
+        return pd.DataFrame(), "empty"
+    return snapshot.frame, snapshot.content_version
+
+def render_news_feed(dm, df, version, selected_domains=(), selected_authors=(), selected_days=None, search_query="",
+                     mobile=False):
+    """Render the news feed with spotlight layout and pagination (one column and shorter pages on phones)"""
+    st.markdown("---")
     
     if df.empty:
-        st.info(f"No tools found for {actual_domain}. Check back soon! 🚀")
+        st.info("No tools found. Check back soon! 🚀")
         return
     
-    # Filter by domain (only if not "All")
-    if actual_domain != "All":
-        df = dm.filter_by_domain(df, actual_domain)
+    # Combine the facet bitmaps (no pandas scans over the string columns)
+    facet_mask = get_facet_index(version, df).filter(
+        domains=selected_domains, authors=selected_authors, days=selected_days
+    )
     
-    if df.empty:
-        st.info(f"No tools found for {actual_domain}. Try selecting 'All' to see all available tools! 🔍")
-        return
-    
-    # Sort by hotness (hottest first), then by date
-    df = df.sort_values(['hotness_count', 'Date_Added'], ascending=[False, False])
+    search_query = search_query.strip()
+    if search_query:
+        # Search results keep their relevance order
+        index = get_search_index(version, df).update_details(get_detail_cache())
+        df = df.loc[index.search(search_query, hotness=df['hotness_trending'].to_numpy(), mask=facet_mask)]
+        
+        if df.empty:
+            st.info(f"No tools match \"{search_query}\". Try a different search term or fewer filters! 🔍")
+            return
+    else:
+        df = df.iloc[np.flatnonzero(facet_mask)]
+        
+        if df.empty:
+            st.info("No tools match the selected filters. Try clearing some of them to see all available tools! 🔍")
+            return
+        
+        # Sort by trending score (recent votes weigh most), then all-time votes, then by date
+        df = df.sort_values(['hotness_trending', 'hotness_count', 'Date_Added'], ascending=[False, False, False])
     
     # Calculate max hotness for progress bars
     max_hotness = df['hotness_count'].max() if len(df) > 0 else 0
     
-    # Check if we have a spotlight tool (5+ votes)
-    has_spotlight = len(df) > 0 and df.iloc[0]['hotness_count'] >= 5
+    # Tiles go on screen first; vote status and detail fields fill into them at the end of the feed
+    timeline = get_render_timeline()
+    deferred = {'votes': [], 'details': []}
+    
+    # Check if we have a spotlight tool (enough votes this week), not while searching
+    has_spotlight = not search_query and len(df) > 0 and df.iloc[0]['hotness_week'] >= SPOTLIGHT_MIN_VOTES
     
     # Display tools count
+    sort_caption = f"Best matches for \"{search_query}\" 🔎" if search_query else "Sorted by hotness 🔥 • Most tempting tools first"
     st.markdown(f"""
     ### 🤖 {len(df)} AI Tools & Insights
     <div style="color: #6B7280; margin-bottom: 1rem;">
-        Sorted by hotness 🔥 • Most tempting tools first
+        {sort_caption}
     </div>
     """, unsafe_allow_html=True)
     
@@ -520,20 +582,22 @@ def render_news_feed(dm, selected_domain, selected_days):
         """, unsafe_allow_html=True)
         
         # Render spotlight tool in center
-        spotlight_tool = df.iloc[0]
-        render_ai_tile(spotlight_tool, 0, dm, max_hotness, is_spotlight=True)
+        if TILE_GRID_COMPONENT:
+            render_tile_grid(dm, df.iloc[:1], deferred, key="spotlight_grid", is_spotlight=True, mobile=mobile)
+        else:
+            spotlight_tool = df.iloc[0]
+            render_ai_tile(spotlight_tool, dm, max_hotness, is_spotlight=True, deferred=deferred)
         
         st.markdown('</div>', unsafe_allow_html=True)
+        timeline.mark('spotlight')
         
         # Remove spotlight tool from regular grid
-        remaining_df = df.iloc[1:].copy().reset_index(drop=True)
-        start_idx = 1  # Start indexing from 1 since spotlight tool is 0
+        remaining_df = df.iloc[1:]
     else:
-        remaining_df = df.copy()
-        start_idx = 0
+        remaining_df = df
     
     # Pagination setup for remaining tools
-    tools_per_page = 30
+    tools_per_page = CARDS_PER_PAGE if mobile else 30
     total_tools = len(remaining_df)
     
     if total_tools > 0:
@@ -543,12 +607,13 @@ def render_news_feed(dm, selected_domain, selected_days):
         if 'current_page' not in st.session_state:
             st.session_state.current_page = 1
         
-        # Reset to page 1 if domain changes
-        if 'last_selected_domain' not in st.session_state:
-            st.session_state.last_selected_domain = actual_domain
-        elif st.session_state.last_selected_domain != actual_domain:
+        # Reset to page 1 if filters or search change
+        current_filters = (tuple(selected_domains), tuple(selected_authors), selected_days, search_query)
+        if 'last_filters' not in st.session_state:
+            st.session_state.last_filters = current_filters
+        elif st.session_state.last_filters != current_filters:
             st.session_state.current_page = 1
-            st.session_state.last_selected_domain = actual_domain
+            st.session_state.last_filters = current_filters
         
         # Ensure current page is valid
         if st.session_state.current_page > total_pages:
@@ -570,32 +635,54 @@ def render_news_feed(dm, selected_domain, selected_days):
             """, unsafe_allow_html=True)
         
         # Get current page data
-        current_page_df = remaining_df.iloc[page_start:page_end].copy().reset_index(drop=True)
+        current_page_df = remaining_df.iloc[page_start:page_end]
         
-        # Create grid layout for tiles (2 columns)
-        for i in range(0, len(current_page_df), 2):
-            cols = st.columns(2)
-            
-            # First tile
-            tile_idx = start_idx + page_start + i
-            with cols[0]:
-                render_ai_tile(current_page_df.iloc[i], tile_idx, dm, max_hotness, is_spotlight=False)
-            
-            # Second tile (if exists)
-            if i + 1 < len(current_page_df):
-                tile_idx = start_idx + page_start + i + 1
-                with cols[1]:
-                    render_ai_tile(current_page_df.iloc[i + 1], tile_idx, dm, max_hotness, is_spotlight=False)
+        # Forget tile state for tools paged away from, past the per-session bound
+        visible_ids = current_page_df['tool_id'].tolist() + (df['tool_id'].iloc[:1].tolist() if has_spotlight else [])
+        get_tile_state().evict(keep=visible_ids)
+        
+        # Load detail fields for this page and the next one in the background while this one is read,
+        # so flipping a tile or clicking "Next" doesn't wait on Google Sheets
+        prefetch_df = remaining_df.iloc[page_start:page_end + tools_per_page]
+        if has_spotlight:
+            prefetch_df = pd.concat([df.iloc[:1], prefetch_df])
+        dm.prefetch_tool_details(dict(zip(prefetch_df['tool_id'].tolist(), prefetch_df['sheet_row'].tolist())))
+        
+        # One grid component for the whole page: flip/expand happen in the browser
+        if TILE_GRID_COMPONENT:
+            render_tile_grid(dm, current_page_df, deferred, mobile=mobile)
+            timeline.mark('first_tiles')
+        else:
+            # Create grid layout for tiles (2 columns, 1 on phones)
+            tiles_per_row = 1 if mobile else 2
+            for i in range(0, len(current_page_df), tiles_per_row):
+                cols = st.columns(tiles_per_row)
+                
+                # First tile
+                with cols[0]:
+                    render_ai_tile(current_page_df.iloc[i], dm, max_hotness, is_spotlight=False, deferred=deferred)
+                
+                # Second tile (if exists)
+                if tiles_per_row > 1 and i + 1 < len(current_page_df):
+                    with cols[1]:
+                        render_ai_tile(current_page_df.iloc[i + 1], dm, max_hotness, is_spotlight=False, deferred=deferred)
+                
+                timeline.mark('first_tiles')
+        timeline.mark('tiles')
         
         # Pagination controls at bottom
         if total_pages > 1:
             st.markdown("---")
-            col1, col2, col3, col4, col5 = st.columns([1, 1, 2, 1, 1])
-            
-            with col1:
-                if st.button("⏮️ First", disabled=(st.session_state.current_page == 1)):
-                    st.session_state.current_page = 1
-                    st.rerun()
+            # Phones only get Previous/Next
+            if mobile:
+                col2, col3, col4 = st.columns([1, 2, 1])
+            else:
+                col1, col2, col3, col4, col5 = st.columns([1, 1, 2, 1, 1])
+                
+                with col1:
+                    if st.button("⏮️ First", disabled=(st.session_state.current_page == 1)):
+                        st.session_state.current_page = 1
+                        st.rerun()
             
             with col2:
                 if st.button("◀️ Previous", disabled=(st.session_state.current_page == 1)):
@@ -614,63 +701,176 @@ def render_news_feed(dm, selected_domain, selected_days):
                     st.session_state.current_page += 1
                     st.rerun()
             
-            with col5:
-                if st.button("Last ⏭️", disabled=(st.session_state.current_page == total_pages)):
-                    st.session_state.current_page = total_pages
-                    st.rerun()
+            if not mobile:
+                with col5:
+                    if st.button("Last ⏭️", disabled=(st.session_state.current_page == total_pages)):
+                        st.session_state.current_page = total_pages
+                        st.rerun()
+    
+    # Stream vote status (may load the hotness counters) and flipped tiles' details into their slots
+    for fill in deferred['votes']:
+        fill()
+    timeline.mark('vote_status')
+    for fill in deferred['details']:
+        fill()
+    timeline.mark('details')
+
+def format_date(date_added):
+    """Tile date as MM/DD/YYYY ('Recent' when missing)"""
+    try:
+        if pd.notna(date_added):
+            return pd.to_datetime(date_added).strftime('%m/%d/%Y')
+    except Exception:
+        pass
+    return 'Recent'
 
-def render_ai_tile(row, idx, dm, max_hotness, is_spotlight=False):
-    """Render individual AI tile card with hotness feature"""
+def hotness_tooltip(hotness_today, hotness_week):
+    """Tooltip for the fire button with today's and this week's votes"""
+    if hotness_today == 0 and hotness_week == 0:
+        return "If you're tempted to try this AI, hit this button"
+    elif hotness_today == 0:
+        return f"If you're tempted to try this AI, hit this button • {hotness_week} clicked this week"
+    elif hotness_today == 1:
+        return f"If you're tempted to try this AI, hit this button • 1 person clicked this today ({hotness_week} this week)"
+    else:
+        return f"If you're tempted to try this AI, hit this button • {hotness_today} people clicked this today ({hotness_week} this week)"
+
+def vote_error(identity):
+    """Message for a vote that didn't go through"""
+    retry_after = get_vote_limiter().retry_after(identity)
+    if retry_after > 0:
+        return f"🐢 Too many votes, try again in {max(int(retry_after), 1)}s"
+    return "Already voted or error occurred"
+
+def tile_payload(row, voted=None, steps=None, is_spotlight=False):
+    """One tile of the grid component as plain JSON (voted/steps None while still loading)"""
+    domain = str(row.get('Domain', 'General'))
+    source_url = safe_url(row.get('Source_URL', ''))
+    link_status = str(row.get('link_status', '') or '')
+    if link_status == LINK_DEAD and LINK_HIDE_DEAD:
+        source_url = ''
+    hotness_today = int(row.get('hotness_today', 0))
+    hotness_week = int(row.get('hotness_week', 0))
+    return {
+        'tool_id': int(row.get('tool_id', 0)),
+        'title': str(row.get('Title', 'No Title')),
+        'summary': str(row.get('Summary', 'No summary available')),
+        'source_url': source_url,
+        'link_dead': link_status == LINK_DEAD,
+        'author': str(row.get('Author/Company', 'Unknown')),
+        'domain': domain,
+        'color': DOMAIN_COLORS.get(domain, "#667eea"),
+        'date': format_date(row.get('Date_Added', '')),
+        'tooltip': hotness_tooltip(hotness_today, hotness_week),
+        'voted': voted,
+        'steps': steps,
+        'spotlight': is_spotlight,
+    }
+
+def render_tile_grid(dm, rows, deferred, key="tile_grid", is_spotlight=False, mobile=False):
+    """Render rows as one tile grid component and handle the event it sent back
+    
+    Vote status and detail fields go in when they are already in memory. Otherwise the tiles
+    show them as loading: a deferred fill loads the vote status and reruns once, and integration
+    steps (prefetched with the page, see render_news_feed) are sent when a loading tile is flipped.
+    In mobile mode integration steps are only sent for tiles the user has flipped.
+    """
+    identity = get_session_identity()
+    counters = get_hotness_counters()
+    votes_ready = counters.loaded_at is not None or not dm.hotness_sheet
+    
+    tool_ids = rows['tool_id'].tolist()
+    sheet_rows = dict(zip(tool_ids, rows['sheet_row'].tolist()))
+    titles = dict(zip(tool_ids, rows['Title'].tolist()))
+    tile_state = get_tile_state()
+    wanted = [tool_id for tool_id in tool_ids if tile_state.is_flipped(tool_id)] if mobile else tool_ids
+    details, _ = get_detail_cache().get_many(wanted)
+    
+    tiles = [
+        tile_payload(
+            row,
+            voted=counters.has_voted(tool_id, identity.voter) if votes_ready else None,
+            steps=details[tool_id].get('Integration_Steps', '') if tool_id in details else None,
+            is_spotlight=is_spotlight,
+        )
+        for tool_id, (_, row) in zip(tool_ids, rows.iterrows())
+    ]
+    event = tile_grid(tiles, columns=1 if mobile else 2, mobile=mobile, report_viewport=not is_spotlight, key=key)
+    
+    # A turned-down vote reruns too, so the grid drops its optimistic 🔥 right away
+    error_key = f"{key}_vote_error"
+    if error_key in st.session_state:
+        st.error(st.session_state.pop(error_key))
+    
+    if event and event.get('type') == 'vote' and event.get('tool_id') in titles:
+        if not dm.record_hotness_vote(event['tool_id'], identity, tool_title=titles[event['tool_id']]):
+            st.session_state[error_key] = vote_error(identity)
+        st.rerun()
+    elif event and event.get('type') == 'filter':
+        st.session_state.selected_domain_filter = event.get('domain')
+        st.rerun()
+    elif event and event.get('type') == 'details' and event.get('tool_id') in sheet_rows:
+        # A flipped tile still loading its steps (or any tile in mobile mode): send them from now on,
+        # reusing the page prefetch if it is still on its way
+        tile_state.set_flipped(event['tool_id'])
+        dm.wait_for_tool_details({event['tool_id']: sheet_rows[event['tool_id']]})
+        st.rerun()
+    elif event and event.get('type') == 'viewport':
+        if set_viewport_width(event.get('width')):
+            st.rerun()
+    
+    if votes_ready:
+        return
+    
+    def fill():
+        dm.check_if_ip_voted(tool_ids[0], identity.voter)  # Loads the counters on first use
+        if get_hotness_counters().loaded_at is not None:
+            st.rerun()
+    
+    deferred['votes'].append(fill)
+
+def render_ai_tile(row, dm, max_hotness, is_spotlight=False, deferred=None):
+    """Render individual AI tile card with hotness feature
+    
+    deferred: {'votes': [], 'details': []} to leave placeholders for the vote button and the
+    integration steps and queue their fills (see render_news_feed), None to render them inline
+    """
     
     # Clean data
     title = row.get('Title', 'No Title')
     summary = row.get('Summary', 'No summary available')
-    source_url = row.get('Source_URL', '')
+    source_url = safe_url(row.get('Source_URL', ''))
+    link_dead = str(row.get('link_status', '') or '') == LINK_DEAD
+    if link_dead and LINK_HIDE_DEAD:
+        source_url = ''
     author = row.get('Author/Company', 'Unknown')
     domain = row.get('Domain', 'General')
-    integration_steps = row.get('Integration_Steps', '')
+    tool_id = int(row.get('tool_id', 0))
+    sheet_row = int(row.get('sheet_row', 0))
     date_added = row.get('Date_Added', '')
     hotness_count = row.get('hotness_count', 0)
+    hotness_today = int(row.get('hotness_today', 0))
+    hotness_week = int(row.get('hotness_week', 0))
     
     # Format date
-    try:
-        if pd.notna(date_added):
-            date_str = pd.to_datetime(date_added).strftime('%m/%d/%Y')
-        else:
-            date_str = 'Recent'
-    except:
-        date_str = 'Recent'
+    date_str = format_date(date_added)
     
     # Create short summary (first 20 words)
     words = summary.split()
     short_summary = ' '.join(words[:20])
     show_see_more = len(words) > 20
     
-    # Define color scheme for different domains
-    domain_colors = {
-        'Data Preparation & Automation': '#667eea',
-        'Spreadsheets & Documents': '#38ef7d', 
-        'Code Generation & Debugging': '#ff6b6b',
-        'Dashboards & Reports': '#4ecdc4',
-        'Natural Language Queries': '#45b7d1',
-        'AutoML & Predictive Analytics': '#6c5ce7',
-        'Meetings': '#fd79a8'
-    }
+    domain_color = DOMAIN_COLORS.get(domain, "#667eea")
     
-    domain_color = domain_colors.get(domain, "#667eea")
+    # Unique key for each tile: the stable tool ID, so state follows the tool when the order changes
+    tile_key = f"tile_{tool_id}"
     
-    # Unique key for each tile
-    tile_key = f"tile_{idx}"
+    # Flipped/expanded state lives in one compact per-session structure
+    tile_state = get_tile_state()
+    expanded = tile_state.is_expanded(tool_id)
     
-    # Initialize session state
-    if f"{tile_key}_flipped" not in st.session_state:
-        st.session_state[f"{tile_key}_flipped"] = False
-    if f"{tile_key}_expanded" not in st.session_state:
-        st.session_state[f"{tile_key}_expanded"] = False
-    
-    # Get client IP and check if already voted
-    client_ip = get_client_ip()
-    has_voted = dm.check_if_ip_voted_cached(title, client_ip)
+    # Same precomputed voter key for every tile of the session
+    identity = get_session_identity()
     
     # Calculate hotness percentage - no longer needed
     # hotness_percentage = calculate_hotness_score(hotness_count, max_hotness) if max_hotness > 0 else 0
@@ -703,7 +903,7 @@ def render_ai_tile(row, idx, dm, max_hotness, is_spotlight=False):
             </div>
             """, unsafe_allow_html=True)
         
-        if not st.session_state[f"{tile_key}_flipped"]:
+        if not tile_state.is_flipped(tool_id):
             # Front of the card with hotness button
             
             # Create a container for title and hotness button
@@ -718,50 +918,58 @@ def render_ai_tile(row, idx, dm, max_hotness, is_spotlight=False):
                 
                 st.markdown(f"""
                 <h2 style="color: {title_color} !important; font-size: 1.5rem; font-weight: 700; 
-                           margin-bottom: 1rem; position: relative;" id="title_{idx}">
+                           margin-bottom: 1rem; position: relative;" id="title_{tool_id}">
                     🤖 {title}
                 </h2>
                 """, unsafe_allow_html=True)
             
             with col_hotness:
                 # Create tooltip text
-                if hotness_count == 0:
-                    tooltip_text = "If you're tempted to try this AI, hit this button"
-                elif hotness_count == 1:
-                    tooltip_text = "If you're tempted to try this AI, hit this button • 1 person clicked this today"
-                else:
-                    tooltip_text = f"If you're tempted to try this AI, hit this button • {hotness_count} people clicked this today"
+                tooltip_text = hotness_tooltip(hotness_today, hotness_week)
                 
                 # Container for right-aligned fire button
                 st.markdown('<div class="hotness-container">', unsafe_allow_html=True)
                 
-                # Use only Streamlit button with enhanced interactivity
-                if not has_voted:
-                    # Create a unique key for the button
-                    button_key = f"hotness_btn_{idx}_{title[:10]}"
-                    
-                    if st.button("🔥", key=button_key, help=tooltip_text, use_container_width=False):
-                        success = dm.record_hotness_vote(title, client_ip)
-                        if success:
-                            st.success("🔥 Marked as hot!")
-                            # Longer delay to let user see the success message
-                            time.sleep(0.5)
-                            st.rerun()
+                vote_slot = st.empty()
+                
+                def render_vote():
+                    with vote_slot.container():
+                        # Use only Streamlit button with enhanced interactivity
+                        if not dm.check_if_ip_voted(tool_id, identity.voter):
+                            # Create a unique key for the button
+                            button_key = f"hotness_btn_{tool_id}"
+                            
+                            if st.button("🔥", key=button_key, help=tooltip_text, use_container_width=False):
+                                success = dm.record_hotness_vote(tool_id, identity, tool_title=title)
+                                if success:
+                                    st.success("🔥 Marked as hot!")
+                                    # Longer delay to let user see the success message
+                                    time.sleep(0.5)
+                                    st.rerun()
+                                else:
+                                    st.error(vote_error(identity))
                         else:
-                            st.error("Already voted or error occurred")
+                            # Show low opacity fire emoji for voted state
+                            st.markdown(f"""
+                            <div style="text-align: right; margin-right: -10px;">
+                                <span class="voted-fire" title="Thank you for showing interest">🔥</span>
+                            </div>
+                            """, unsafe_allow_html=True)
+                
+                if deferred is None:
+                    render_vote()
                 else:
-                    # Show low opacity fire emoji for voted state
-                    st.markdown(f"""
-                    <div style="text-align: right; margin-right: -10px;">
-                        <span class="voted-fire" title="Thank you for showing interest">🔥</span>
-                    </div>
+                    # Vote status needs the hotness counters, a dimmed fire holds the spot until then
+                    vote_slot.markdown("""
+                    <div style="text-align: right; margin-right: -10px; opacity: 0.2;">🔥</div>
                     """, unsafe_allow_html=True)
+                    deferred['votes'].append(render_vote)
                 
                 st.markdown('</div>', unsafe_allow_html=True)
             
             # Summary with styled text (only summary gets domain color)
-            current_summary = summary if st.session_state[f"{tile_key}_expanded"] else short_summary
-            if show_see_more and not st.session_state[f"{tile_key}_expanded"]:
+            current_summary = summary if expanded else short_summary
+            if show_see_more and not expanded:
                 current_summary += "..."
             
             # Apply domain color only to summary text
@@ -799,8 +1007,9 @@ def render_ai_tile(row, idx, dm, max_hotness, is_spotlight=False):
                 </div>
                 """, unsafe_allow_html=True)
                 
-                if source_url and str(source_url).strip():
-                    st.link_button("🔗 Visit Tool", source_url, use_container_width=True)
+                if source_url:
+                    st.link_button("⚠️ Link may be broken" if link_dead else "🔗 Visit Tool", source_url,
+                                   use_container_width=True)
             
             # Separator
             st.divider()
@@ -810,14 +1019,14 @@ def render_ai_tile(row, idx, dm, max_hotness, is_spotlight=False):
             
             with btn_col1:
                 if show_see_more:
-                    btn_text = "📖 Read Less" if st.session_state[f"{tile_key}_expanded"] else "📖 Read More"
+                    btn_text = "📖 Read Less" if expanded else "📖 Read More"
                     if st.button(btn_text, key=f"{tile_key}_summary", use_container_width=True, type="secondary"):
-                        st.session_state[f"{tile_key}_expanded"] = not st.session_state[f"{tile_key}_expanded"]
+                        tile_state.toggle_expanded(tool_id)
                         st.rerun()
             
             with btn_col2:
                 if st.button("How to Integrate?", key=f"{tile_key}_integrate", use_container_width=True, type="primary"):
-                    st.session_state[f"{tile_key}_flipped"] = True
+                    tile_state.set_flipped(tool_id)
                     st.rerun()
             
             with btn_col3:
@@ -841,20 +1050,38 @@ def render_ai_tile(row, idx, dm, max_hotness, is_spotlight=False):
             </h4>
             """, unsafe_allow_html=True)
             
-            if integration_steps and str(integration_steps).strip():
-                # Process integration steps with colors
-                steps = str(integration_steps).strip().split('\n')
-                for i, step in enumerate(steps):
-                    if step.strip():
-                        step_color = domain_color if i % 2 == 0 else '#6B7280'
-                        st.markdown(f"""
-                        <div style="color: {step_color}; margin-bottom: 0.5rem; 
-                                   padding-left: 1rem; font-weight: 500;">
-                            • {step.strip()}
-                        </div>
-                        """, unsafe_allow_html=True)
+            # Detail fields aren't part of the list fetch, load them on flip (cached by tool ID)
+            integration_steps = row.get('Integration_Steps', '')
+            if not (isinstance(integration_steps, str) and integration_steps.strip()):
+                cached, _ = get_detail_cache().get_many([tool_id])
+                integration_steps = cached.get(tool_id, {}).get('Integration_Steps', '')
+            steps_slot = st.empty()
+            
+            def render_steps(integration_steps=integration_steps):
+                if not (isinstance(integration_steps, str) and integration_steps.strip()):
+                    integration_steps = dm.get_tool_details({tool_id: sheet_row}).get(tool_id, {}).get('Integration_Steps', '')
+                
+                with steps_slot.container():
+                    if integration_steps and str(integration_steps).strip():
+                        # Process integration steps with colors
+                        steps = str(integration_steps).strip().split('\n')
+                        for i, step in enumerate(steps):
+                            if step.strip():
+                                step_color = domain_color if i % 2 == 0 else '#6B7280'
+                                st.markdown(f"""
+                                <div style="color: {step_color}; margin-bottom: 0.5rem; 
+                                           padding-left: 1rem; font-weight: 500;">
+                                    • {step.strip()}
+                                </div>
+                                """, unsafe_allow_html=True)
+                    else:
+                        st.info("Integration steps will be available soon.")
+            
+            if deferred is None or (isinstance(integration_steps, str) and integration_steps.strip()):
+                render_steps()
             else:
-                st.info("Integration steps will be available soon.")
+                steps_slot.caption("⏳ Loading integration steps...")
+                deferred['details'].append(render_steps)
             
             if source_url and str(source_url).strip():
                 st.markdown(f"""
@@ -872,7 +1099,7 @@ def render_ai_tile(row, idx, dm, max_hotness, is_spotlight=False):
             
             # Back button
             if st.button("← Back to Overview", key=f"{tile_key}_back", use_container_width=True, type="secondary"):
-                st.session_state[f"{tile_key}_flipped"] = False
+                tile_state.set_flipped(tool_id, False)
                 st.rerun()
 
 def render_email_signup(dm):
@@ -895,14 +1122,15 @@ def render_email_signup(dm):
         
         with col2:
             linkedin = st.text_input("LinkedIn (Optional)", placeholder="linkedin.com/in/yourprofile")
-            st.markdown("<br>", unsafe_allow_html=True)  # Spacing
+            topics = st.multiselect("Topics (Optional)", options=list(DOMAIN_COLORS),
+                                    placeholder="All topics", help="Your digest only covers these domains")
         
         submitted = st.form_submit_button("🚀 Subscribe to Regular Updates", use_container_width=True)
         
         if submitted:
             if email and "@" in email and "." in email:
                 try:
-                    success, message = dm.save_user_email_to_gsheet(name, email, linkedin)
+                    success, message = dm.save_user_email_to_gsheet(name, email, linkedin, topics)
                     if success:
                         st.success(message)
                         st.balloons()
@@ -929,12 +1157,63 @@ def render_footer():
     </div>
     """, unsafe_allow_html=True)
 
+def render_diagnostics(df, version, warm_up):
+    """Render cache and memory diagnostics (only with ?diagnostics=1 in the URL)"""
+    if st.query_params.get("diagnostics") != "1":
+        return
+    
+    with st.expander("🩺 Diagnostics", expanded=True):
+        st.markdown("**Warm-up**")
+        st.json(warm_up.status())
+        
+        st.markdown("**Google Sheets circuit**")
+        st.json(get_sheets_breaker().status())
+        
+        shared = get_shared_cache()
+        if shared is not None:
+            st.markdown("**Shared cache**")
+            st.json(shared.status())
+        
+        st.markdown("**Vote rate limits**")
+        st.json(get_vote_limiter().status())
+        
+        st.markdown("**Link health**")
+        st.json(get_link_health().status())
+        
+        report = memory_report(df)
+        st.markdown(f"**Catalog `{version}`** • {report['rows']} tools • "
+                    f"{report['total_bytes'] / 1024:.1f} KiB ({report['bytes_per_tool']} bytes/tool)")
+        st.dataframe(
+            pd.DataFrame.from_dict(report['columns'], orient='index'),
+            use_container_width=True
+        )
+        
+        session_report = session_memory_report()
+        tile_state = get_tile_state()
+        identity = get_session_identity()
+        st.markdown(f"**This session** • voter `{identity.voter}` ({identity.source}) • "
+                    f"{len(session_report['entries'])} state entries • "
+                    f"{session_report['total_bytes'] / 1024:.1f} KiB • "
+                    f"{len(tile_state.flipped)} flipped / {len(tile_state.expanded)} expanded tiles")
+        st.dataframe(
+            pd.Series(session_report['entries'], name='bytes'),
+            use_container_width=True
+        )
+        
+        st.markdown("**Render timeline** (ms into this rerun)")
+        st.json(get_render_timeline().marks)
+
 def main():
     """Main application function"""
+    timeline = get_render_timeline()
+    timeline.start()
+    
+    # Warm-up runs once per process; reusing its DataManager saves an auth round trip per session
+    warm_up = start_warm_up()
     
     # Initialize data manager
     if 'data_manager' not in st.session_state:
-        st.session_state.data_manager = DataManager()
+        st.session_state.data_manager = warm_up.wait_for_connection(timeout=30) or DataManager()
     
     dm = st.session_state.data_manager
     
@@ -943,18 +1222,29 @@ def main():
     
     # Header Section
     render_header()
+    timeline.mark('header')
+    
+    # Load the catalog once per rerun and share it between filters and feed
+    df, version = load_catalog(dm)
+    timeline.mark('catalog')
     
-    # Filters Section (removed time filter and refresh button)
-    selected_domain, selected_days = render_filters(dm)
+    # Filters Section
+    # Phone layout: one column, shorter pages, fewer widgets
+    mobile = is_mobile_layout()
+    
+    selected_domains, selected_authors, selected_days, search_query = render_filters(df, version, mobile=mobile)
     
     # News Feed Section
-    render_news_feed(dm, selected_domain, selected_days)
+    render_news_feed(dm, df, version, selected_domains, selected_authors, selected_days, search_query, mobile=mobile)
     
     # Email Signup Section
     render_email_signup(dm)
     
     # Footer
     render_footer()
+    
+    # Diagnostics (hidden unless requested)
+    render_diagnostics(df, version, warm_up)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
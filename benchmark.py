@@ -0,0 +1,954 @@
+"""
+Benchmark harness for aINeedToKnow - runs against a synthetic catalog, no Google Sheets needed
+
+Usage: python benchmark.py snapshot [--tools 100000] [--reruns 50]
+       python benchmark.py refresh [--tools 5000] [--latency 0.3]
+       python benchmark.py hotness [--tools 5000] [--votes-per-tool 20]
+       python benchmark.py votes [--tools 5000] [--votes-per-tool 20]
+       python benchmark.py outage [--tools 2000] [--timeout 2] [--reruns 10]
+       python benchmark.py render [--tools 2000] [--latency 0.3] [--flipped 2] [--reruns 5]
+       python benchmark.py api [--tools 5000] [--requests 2000] [--concurrency 8]
+       python benchmark.py export [--tools 5000]
+       python benchmark.py replicas [--replicas 1 2 4] [--seconds 8] [--tools 2000]
+       python benchmark.py ratelimit [--attempts 2000] [--checks 200000]
+       python benchmark.py import [--tools 2000] [--new 500] [--latency 0.3]
+       python benchmark.py digest [--subscribers 2000] [--concurrency 1 8 32] [--latency 0.002]
+       python benchmark.py links [--links 400] [--hosts 40] [--latency 0.05] [--concurrency 16]
+"""
+import argparse
+import asyncio
+import contextlib
+import http.client
+import logging
+import os
+import random
+import re
+import tempfile
+import threading
+import time
+import numpy as np
+import pandas as pd
+import gspread
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from gspread.utils import a1_to_rowcol
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DOMAINS = [
+    'Data Preparation & Automation', 'Spreadsheets & Documents', 'Code Generation & Debugging',
+    'Dashboards & Reports', 'Natural Language Queries', 'AutoML & Predictive Analytics', 'Meetings',
+]
+WORDS = (
+    "ai analytics dashboard sql python excel forecast report query chart model data pipeline "
+    "automation insight metric kpi notebook cleaning summary meeting notes prediction visual"
+).split()
+
+
+def isolate_cache_paths(directory):
+    """Point every cache file at directory, so benchmark runs never touch the app's own cache/
+
+    Must run before the app modules are imported (they copy the paths with `from config import *`).
+    """
+    import config
+
+    config.NEWS_CACHE_PATH = os.path.join(directory, "news_cache.csv")
+    config.USERS_CSV_PATH = os.path.join(directory, "users.csv")
+    config.LINK_HEALTH_PATH = os.path.join(directory, "link_health.json")
+    config.VOTER_SECRET_PATH = os.path.join(directory, "voter_secret")
+
+
+def skip_link_checks():
+    """Keep refreshes from checking links, the synthetic tools link to made-up hosts"""
+    import data_manager
+
+    data_manager.start_link_check = lambda: None
+
+
+def synthetic_catalog(tools, seed=42):
+    """Cleaned, compact catalog frame shaped like the real one"""
+    from data_manager import assign_tool_ids, compact_catalog
+
+    rng = random.Random(seed)
+
+    def text(words):
+        return ' '.join(rng.choices(WORDS, k=words))
+
+    df = pd.DataFrame({
+        'Title': [f"{text(2).title()} {i}" for i in range(tools)],
+        'Summary': [text(30) for _ in range(tools)],
+        'Source_URL': [f"https://tool{i}.example.com" for i in range(tools)],
+        'Author/Company': [f"Company {rng.randrange(max(tools // 20, 1))}" for _ in range(tools)],
+        'Domain': [rng.choice(DOMAINS) for _ in range(tools)],
+        'Integration_Steps': ['\n'.join(text(8) for _ in range(5)) for _ in range(tools)],
+        'Date_Added': pd.Timestamp('2025-01-01') + pd.to_timedelta(np.arange(tools) % 365, unit='D'),
+        'sheet_row': np.arange(2, tools + 2),
+        'hotness_count': np.random.default_rng(seed).poisson(2, tools),
+    })
+    return compact_catalog(assign_tool_ids(df))
+
+
+class StandInWorksheet:
+    """Local stand-in for a gspread Worksheet with a fixed round-trip latency per API call"""
+
+    def __init__(self, rows, latency=0.0, title="Sheet1", spreadsheet=None):
+        self.rows = [list(row) for row in rows]
+        self.latency = latency
+        self.title = title
+        self.spreadsheet = spreadsheet
+        self.api_calls = 0
+        self.outage = False  # When set, every call waits out the latency and then fails
+
+    def _round_trip(self):
+        self.api_calls += 1
+        time.sleep(self.latency)
+        if self.outage:
+            raise requests.exceptions.ConnectionError(f"{self.title}: stand-in outage")
+
+    def row_values(self, row, **kwargs):
+        self._round_trip()
+        return list(self.rows[row - 1]) if row <= len(self.rows) else []
+
+    def get_all_values(self, **kwargs):
+        self._round_trip()
+        return [list(row) for row in self.rows]
+
+    def get_all_records(self, **kwargs):
+        self._round_trip()
+        header = self.rows[0]
+        return [dict(zip(header, row)) for row in self.rows[1:]]
+
+    def batch_get(self, ranges, major_dimension=None, **kwargs):
+        self._round_trip()
+        results = []
+        for a1_range in ranges:
+            start_col, start_row, end_col, end_row = re.match(r"([A-Z]+)(\d+)(?::([A-Z]+)(\d*))?$", a1_range).groups()
+            col = a1_to_rowcol(f"{start_col}1")[1] - 1
+            last_row = int(end_row) if end_row else (len(self.rows) if end_col else int(start_row))
+            values = [row[col] if col < len(row) else '' for row in self.rows[int(start_row) - 1:last_row]]
+            while values and values[-1] == '':
+                values.pop()
+            if major_dimension == 'COLUMNS':
+                results.append([values] if values else [])
+            else:
+                results.append([[value] for value in values])
+        return results
+
+    def append_row(self, row, **kwargs):
+        self._round_trip()
+        self.rows.append(list(row))
+
+    def append_rows(self, rows, **kwargs):
+        self._round_trip()
+        self.rows.extend(list(row) for row in rows)
+
+    def update(self, values=None, range_name='A1', **kwargs):
+        self._round_trip()
+        start = a1_to_rowcol(range_name)[0] - 1
+        for offset, row in enumerate(values):
+            while len(self.rows) <= start + offset:
+                self.rows.append([])
+            self.rows[start + offset] = [str(value) for value in row]
+
+    def delete_rows(self, start_index, end_index=None):
+        self._round_trip()
+        del self.rows[start_index - 1:(end_index or start_index)]
+
+    def resize(self, rows=None, cols=None):
+        self._round_trip()
+        if rows is not None:
+            del self.rows[rows:]
+        if cols is not None:
+            self.rows = [row[:cols] for row in self.rows]
+
+    def duplicate(self, new_sheet_name=None, **kwargs):
+        self._round_trip()
+        copy = self.spreadsheet.add_worksheet(new_sheet_name)
+        copy.rows = [list(row) for row in self.rows]
+        return copy
+
+    def payload_bytes(self):
+        """Approximate download size of get_all_values (cell text only)"""
+        return sum(len(str(cell)) for row in self.rows for cell in row)
+
+
+class StandInSpreadsheet:
+    """Local stand-in for a gspread Spreadsheet holding StandInWorksheets"""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.worksheets = {}
+
+    def worksheet(self, title):
+        if title not in self.worksheets:
+            raise gspread.WorksheetNotFound(title)
+        return self.worksheets[title]
+
+    def add_worksheet(self, title, rows=None, cols=None, **kwargs):
+        self.worksheets[title] = StandInWorksheet([], self.latency, title=title, spreadsheet=self)
+        return self.worksheets[title]
+
+
+class StandInSMTPServer:
+    """Local stand-in for an SMTP relay on 127.0.0.1, answering every command after a fixed delay
+
+    temp_failure_rate answers that share of RCPT commands with a temporary 451 failure.
+    """
+
+    def __init__(self, latency=0.0, temp_failure_rate=0.0):
+        self.latency = latency
+        self.temp_failure_rate = temp_failure_rate
+        self.messages = 0
+        self.connections = 0
+        self.temp_failures = 0
+        self.port = None
+        self._loop = asyncio.new_event_loop()
+
+    def start(self):
+        ready = threading.Event()
+
+        async def serve():
+            server = await asyncio.start_server(self._session, '127.0.0.1', 0)
+            self.port = server.sockets[0].getsockname()[1]
+            ready.set()
+            async with server:
+                await server.serve_forever()
+
+        threading.Thread(target=self._loop.run_until_complete, args=(serve(),), name="smtp-standin", daemon=True).start()
+        ready.wait()
+        return self
+
+    async def _session(self, reader, writer):
+        self.connections += 1
+        writer.write(b"220 stand-in ESMTP\r\n")
+        while line := await reader.readline():
+            command = line[:4].upper()
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if command == b"EHLO":
+                writer.write(b"250-stand-in\r\n250 8BITMIME\r\n")
+            elif command == b"RCPT" and random.random() < self.temp_failure_rate:
+                self.temp_failures += 1
+                writer.write(b"451 4.3.0 Try again later\r\n")
+            elif command == b"DATA":
+                writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                while (await reader.readline()) != b".\r\n":
+                    pass
+                self.messages += 1
+                writer.write(b"250 2.0.0 Queued\r\n")
+            elif command == b"QUIT":
+                writer.write(b"221 2.0.0 Bye\r\n")
+                break
+            else:
+                writer.write(b"250 OK\r\n")  # HELO, MAIL, RCPT, RSET, NOOP
+            await writer.drain()
+        writer.close()
+
+
+class StandInLinkHost:
+    """Local stand-in for one tool's web server on 127.0.0.1, answering by path after `latency`
+
+    /ok/<n> 200, /missing/<n> 404, /nohead/<n> 405 to HEAD but 200 to GET, /slow/<n> 200 after
+    five times the latency, /hang/<n> only after `hang` seconds. Records how many requests
+    were in flight at once and the shortest gap between two request starts (hanging requests
+    don't count as in flight, the checker has given up on them long before they are answered).
+    """
+
+    def __init__(self, latency=0.0, hang=5.0):
+        self.latency = latency
+        self.hang = hang
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.min_gap = None
+        self._last_start = None
+        self._lock = threading.Lock()
+        host = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_HEAD(self):
+                host._answer(self, head=True)
+
+            def do_GET(self):
+                host._answer(self, head=False)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.server.daemon_threads = True
+        self.port = self.server.server_address[1]
+        threading.Thread(target=self.server.serve_forever, name="link-standin", daemon=True).start()
+
+    def _answer(self, handler, head):
+        kind = handler.path.strip('/').split('/')[0]
+        with self._lock:
+            now = time.monotonic()
+            if self._last_start is not None:
+                gap = now - self._last_start
+                self.min_gap = gap if self.min_gap is None else min(self.min_gap, gap)
+            self._last_start = now
+            self.requests += 1
+            if kind != 'hang':
+                self.in_flight += 1
+                self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.hang if kind == 'hang' else self.latency * (5 if kind == 'slow' else 1))
+            status = {'missing': 404, 'nohead': 405 if head else 200}.get(kind, 200)
+            handler.send_response(status)
+            handler.send_header('Content-Length', '0')
+            handler.end_headers()
+        except OSError:
+            pass  # The checker gave up on a hanging request
+        finally:
+            if kind != 'hang':
+                with self._lock:
+                    self.in_flight -= 1
+
+
+def standin_data_manager(tools, latency=0.0, votes_per_tool=3):
+    """DataManager wired to local stand-in worksheets instead of Google Sheets"""
+    from data_manager import DataManager
+
+    catalog = synthetic_catalog(tools)
+    header = ['Title', 'Summary', 'Source_URL', 'Author/Company', 'Domain', 'Integration_Steps', 'Date_Added']
+    tool_rows = [header] + [
+        [row.Title, row.Summary, row.Source_URL, row._4, row.Domain, row.Integration_Steps,
+         row.Date_Added.strftime('%Y-%m-%d')]
+        for row in catalog.itertuples()
+    ]
+    vote_rows = [["Tool_Title", "IP_Address", "Timestamp", "User_Agent", "Session_ID"]] + [
+        [title, f"10.0.{i % 250}.{k}", "01/02/2025 10:00:00", "Streamlit_App", f"session_{k}"]
+        for i, title in enumerate(catalog['Title']) for k in range(i % (votes_per_tool + 1))
+    ]
+
+    spreadsheet = StandInSpreadsheet(latency)
+    dm = DataManager.__new__(DataManager)
+    dm.gc = None
+    dm.sheet = spreadsheet.worksheets["Sheet1"] = StandInWorksheet(tool_rows, latency, spreadsheet=spreadsheet)
+    dm.hotness_sheet = spreadsheet.worksheets["Hotness"] = StandInWorksheet(
+        vote_rows, latency, title="Hotness", spreadsheet=spreadsheet
+    )
+    dm.hotness_counts_sheet = None
+    dm._column_numbers = None
+    dm._legacy_votes = None
+    return dm
+
+
+def timed(label, runs, func):
+    """Run func `runs` times and print the mean wall time (the app's progress logging is muted)"""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        started = time.perf_counter()
+        for _ in range(runs):
+            func()
+        elapsed = time.perf_counter() - started
+    mean_ms = elapsed / runs * 1000
+    print(f"  {label:<42} {mean_ms:10.3f} ms")
+    return mean_ms
+
+
+def bench_snapshot(args):
+    """Per-rerun cost of reading the catalog: st.cache_data copy vs shared snapshot"""
+    import streamlit as st
+    from snapshot import CatalogSnapshot
+
+    print(f"📸 Catalog read cost per rerun ({args.tools} tools, {args.reruns} reruns)")
+    df = synthetic_catalog(args.tools)
+
+    @st.cache_data(show_spinner=False)
+    def cached_catalog(tools):
+        return df
+
+    cached_catalog(args.tools)  # Prime the cache
+    snapshot = CatalogSnapshot(df, 'bench')
+
+    cache_ms = timed("st.cache_data hit (unpickles a copy)", args.reruns, lambda: cached_catalog(args.tools))
+    snapshot_ms = timed("snapshot.frame (shared, zero-copy)", args.reruns, lambda: snapshot.frame)
+    print(f"  ➜ {cache_ms / max(snapshot_ms, 1e-6):,.0f}x less time spent copying the catalog per rerun")
+
+
+def bench_refresh(args):
+    """Refresh wall time vs the slower single worksheet fetch (stand-in with fixed latency)"""
+    print(f"🔄 Refresh cycle ({args.tools} tools, {args.latency * 1000:.0f} ms per API call)")
+    dm = standin_data_manager(args.tools, latency=args.latency)
+
+    tools_ms = timed("tools worksheet alone", 1, dm._fetch_fresh_data)
+    hotness_ms = timed("Hotness worksheet alone", 1, dm.get_hotness_counts)
+    refresh_ms = timed("full refresh (both worksheets)", 1, dm._fetch_fresh_data_with_hotness)
+    print(f"  ➜ refresh / slower single fetch = {refresh_ms / max(tools_ms, hotness_ms):.2f} "
+          f"(sequential would be {(tools_ms + hotness_ms) / max(tools_ms, hotness_ms):.2f})")
+
+
+def bench_hotness(args):
+    """Hotness load cost before and after compacting the vote log"""
+    print(f"🗜️ Hotness load ({args.tools} tools, up to {args.votes_per_tool} votes each)")
+    dm = standin_data_manager(args.tools, votes_per_tool=args.votes_per_tool)
+
+    raw_rows = len(dm.hotness_sheet.rows) - 1
+    before, after = {}, {}
+    raw_ms = timed(f"raw log ({raw_rows} vote rows)", 3, lambda: before.update(dm.load_hotness_counters().totals()))
+
+    timed("compaction", 1, dm.compact_hotness_log)
+    counts_rows = len(dm.hotness_counts_sheet.rows) - 1
+    compact_ms = timed(f"counts sheet ({counts_rows} tool rows)", 3, lambda: after.update(dm.load_hotness_counters().totals()))
+
+    print(f"  ➜ {raw_ms / max(compact_ms, 1e-6):.1f}x faster, counts {'match' if before == after else 'DIFFER'}")
+
+
+def bench_votes(args):
+    """Hotness log size and load time, legacy rows vs the compact vote encoding"""
+    print(f"🗳️ Vote encoding ({args.tools} tools, up to {args.votes_per_tool} votes each)")
+    dm = standin_data_manager(args.tools, votes_per_tool=args.votes_per_tool)
+
+    before, after = {}, {}
+    legacy_bytes = dm.hotness_sheet.payload_bytes()
+    legacy_ms = timed(f"legacy rows ({legacy_bytes / 1024:.0f} KiB)", 3,
+                      lambda: before.update(dm.load_hotness_counters().totals()))
+
+    timed("migration", 1, dm.migrate_hotness_votes)
+    compact_bytes = dm.hotness_sheet.payload_bytes()
+    compact_ms = timed(f"compact rows ({compact_bytes / 1024:.0f} KiB)", 3,
+                       lambda: after.update(dm.load_hotness_counters().totals()))
+
+    print(f"  ➜ {legacy_bytes / compact_bytes:.1f}x smaller, {legacy_ms / max(compact_ms, 1e-6):.1f}x faster to load, "
+          f"counts {'match' if before == after else 'DIFFER'}")
+
+
+def bench_outage(args):
+    """Rerun cost while Sheets times out: every call path on its own vs the shared circuit breaker"""
+    from circuit_breaker import get_sheets_breaker
+
+    print(f"🔌 Sheets outage ({args.tools} tools, {args.timeout:.1f} s timeout per call, {args.reruns} reruns)")
+    dm = standin_data_manager(args.tools)
+    timed("warm-up (healthy)", 1, dm.refresh_snapshot)
+
+    breaker = get_sheets_breaker()
+    breaker.probe_interval = 0.2
+    breaker.set_probe(dm._probe_sheets)
+    for sheet in (dm.sheet, dm.hotness_sheet):
+        sheet.latency, sheet.outage = args.timeout, True
+
+    def rerun():
+        dm._fetch_fresh_data()
+        dm.load_hotness_counters()
+
+    rerun_ms = [timed(f"rerun {i + 1} ({breaker.status()['state']} circuit)", 1, rerun) for i in range(args.reruns)]
+
+    for sheet in (dm.sheet, dm.hotness_sheet):
+        sheet.latency, sheet.outage = 0.0, False
+    time.sleep(breaker.probe_interval * 3)
+    print(f"  ➜ {sum(rerun_ms) / 1000:.1f} s over {args.reruns} reruns "
+          f"(without the breaker: {args.reruns * 2 * args.timeout:.1f} s), circuit {breaker.status()['state']} after recovery")
+
+
+def bench_render(args):
+    """Perceived time-to-first-content: when each part of the feed reaches the page in one app run"""
+    from streamlit.testing.v1 import AppTest
+    from hotness import HotnessCounters, set_hotness_counters
+    from snapshot import get_snapshot_store, get_detail_cache
+    from ui_state import TileState
+
+    print(f"🖼️ Feed render ({args.tools} tools, {args.latency * 1000:.0f} ms per API call, "
+          f"{args.flipped} flipped tiles, {args.reruns} runs)")
+    dm = standin_data_manager(args.tools)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        snapshot = dm._fetch_fresh_data_with_hotness()
+        get_snapshot_store().publish(snapshot)
+    for sheet in (dm.sheet, dm.hotness_sheet):
+        sheet.latency = args.latency
+
+    # Same order as the feed, so the flipped tiles are on the first page
+    feed = snapshot.frame.sort_values(['hotness_trending', 'hotness_count', 'Date_Added'], ascending=False)
+    app_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+    def run_app(cold=True, mobile=False):
+        if cold:
+            # Vote status and details not loaded yet, as right after a refresh
+            set_hotness_counters(HotnessCounters())
+            get_detail_cache().reset_for(f"bench-{time.perf_counter()}")
+        tile_state = TileState()
+        for tool_id in feed['tool_id'].iloc[:args.flipped]:
+            tile_state.set_flipped(int(tool_id))
+
+        at = AppTest.from_file(app_path, default_timeout=120)
+        at.session_state['data_manager'] = dm
+        at.session_state['tile_state'] = tile_state
+        at.query_params['mobile'] = "1" if mobile else "0"
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            clicked = time.perf_counter()
+            at.run()
+        if at.exception:
+            raise RuntimeError(at.exception[0].value)
+
+        # First time each part reached the page, across the follow-up rerun that streams data in
+        timeline = at.session_state['render_timeline']
+        marks = {}
+        for started, run_marks in timeline.history + [(timeline.started, timeline.marks)]:
+            if started < clicked:
+                continue
+            for label, ms in run_marks.items():
+                marks.setdefault(label, (started - clicked) * 1000 + ms)
+        marks['complete'] = (timeline.started - clicked) * 1000 + timeline.marks['details']
+        elements = list(_walk_elements(at.main))
+        payload = sum(element.proto.ByteSize() for element in elements if hasattr(element, 'proto'))
+        return marks, len(elements), payload
+
+    import config
+    modes = [("Streamlit widgets per tile", False, False), ("tile grid component", True, False),
+             ("tile grid component, mobile", True, True)]
+    for name, grid, mobile in modes:
+        config.TILE_GRID_COMPONENT = grid  # The app script star-imports config on every run
+        run_app(cold=False, mobile=mobile)  # Imports and caches, not part of a user's page load
+        runs = [run_app(mobile=mobile) for _ in range(args.reruns)]
+        marks = {label: sum(run[label] for run, _, _ in runs) / len(runs) for label in runs[0][0]}
+
+        print(f"  {name} ({runs[0][1]} page elements, {runs[0][2] / 1024:.0f} KiB)")
+        for label, ms in marks.items():
+            print(f"    {label:<40} {ms:10.1f} ms")
+        print(f"    ➜ first tiles on screen after {marks['first_tiles']:.0f} ms, "
+              f"{marks['complete'] / max(marks['first_tiles'], 1e-6):.1f}x sooner than waiting for the whole feed "
+              f"({marks['complete']:.0f} ms)")
+
+
+def bench_api(args):
+    """Feed API throughput against the stand-in backend, vs one Streamlit page run per scrape"""
+    from streamlit.testing.v1 import AppTest
+    from api import serve_api
+    from hotness import get_hotness_counters
+    from snapshot import get_snapshot_store
+
+    print(f"🛰️ Feed API ({args.tools} tools, {args.requests} requests per scenario, {args.concurrency} clients)")
+    dm = standin_data_manager(args.tools)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        get_snapshot_store().publish(dm._fetch_fresh_data_with_hotness())
+        server = serve_api(0, data_manager=dm, host="127.0.0.1")
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    frame = get_snapshot_store().current().frame
+    rng = random.Random(7)
+    mixed = (
+        [f"/api/feed?page={page}" for page in range(1, 6)]
+        + [f"/api/domains/{requests.utils.quote(domain)}" for domain in DOMAINS]
+        + [f"/api/search?q={word}" for word in WORDS[:8]]
+        + [f"/api/tools/{tool_id}" for tool_id in rng.sample(frame['tool_id'].tolist(), 20)]
+    )
+
+    def load(paths, headers):
+        """(requests/s, mean response bytes, statuses) with keep-alive clients"""
+        def client(count):
+            connection = http.client.HTTPConnection("127.0.0.1", port)
+            sizes, statuses = [], set()
+            for i in range(count):
+                connection.request("GET", paths[i % len(paths)], headers=headers)
+                response = connection.getresponse()
+                sizes.append(len(response.read()))
+                statuses.add(response.status)
+            connection.close()
+            return sizes, statuses
+
+        per_client = args.requests // args.concurrency
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+                results = list(pool.map(client, [per_client] * args.concurrency))
+            elapsed = time.perf_counter() - started
+        sizes = [size for client_sizes, _ in results for size in client_sizes]
+        return len(sizes) / elapsed, sum(sizes) / len(sizes), set().union(*(statuses for _, statuses in results))
+
+    connection = http.client.HTTPConnection("127.0.0.1", port)
+    connection.request("GET", "/api/feed")
+    response = connection.getresponse()
+    response.read()
+    etag = response.getheader('ETag')
+
+    scenarios = [
+        ("feed page 1, identity", ["/api/feed"], {}),
+        ("feed page 1, gzip", ["/api/feed"], {'Accept-Encoding': 'gzip'}),
+        ("feed page 1, If-None-Match (304)", ["/api/feed"], {'If-None-Match': etag}),
+        ("mixed feed/domain/search/detail, gzip", mixed, {'Accept-Encoding': 'gzip'}),
+    ]
+    for label, paths, headers in scenarios:
+        rate, size, statuses = load(paths, headers)
+        print(f"  {label:<42} {rate:10,.0f} req/s  {size / 1024:6.1f} KiB  {sorted(statuses)}")
+
+    # A vote publishes a new snapshot: the first requests after it rebuild the views
+    get_snapshot_store().update(lambda snapshot: snapshot.with_hotness(get_hotness_counters()))
+    rate, _, _ = load(mixed, {'Accept-Encoding': 'gzip'})
+    print(f"  {'mixed, right after a hotness update':<42} {rate:10,.0f} req/s")
+
+    app_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+    def scrape():
+        at = AppTest.from_file(app_path, default_timeout=120)
+        at.session_state['data_manager'] = dm
+        at.run()
+
+    timed("warm-up scrape (imports and caches)", 1, scrape)
+    scrape_ms = timed("Streamlit page run (today's scrape)", 3, scrape)
+    print(f"  ➜ {rate * scrape_ms / 1000:,.0f}x the throughput of scraping the page, even on a fresh snapshot")
+    server.shutdown()
+
+
+def bench_export(args):
+    """Static export: full render vs the incremental re-export after a vote and after an edit"""
+    from hotness import get_hotness_counters
+    from identity import voter_digest
+    from snapshot import get_snapshot_store
+    from static_export import StaticExporter
+
+    print(f"🗂️ Static export ({args.tools} tools)")
+    dm = standin_data_manager(args.tools)
+    store = get_snapshot_store()
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        store.publish(dm._fetch_fresh_data_with_hotness())
+        dm.load_all_details(store.current().frame)
+
+    with tempfile.TemporaryDirectory() as out_dir:
+        exporter = StaticExporter(out_dir, data_manager=dm)
+
+        def export(label):
+            stats = {}
+            timed(label, 1, lambda: stats.update(exporter.export(store.current())))
+            print(f"    {stats['written']} written, {stats['unchanged']} unchanged, {stats['removed']} removed")
+
+        export("full export")
+        export("re-export, nothing changed")
+
+        # One new vote, published the way DataManager.record_hotness_vote does
+        counters = get_hotness_counters()
+        frame = store.current().frame
+        counters.add(int(frame['tool_id'].iloc[len(frame) // 2]), voter=voter_digest("203.0.113.7"))
+        store.update(lambda snapshot: snapshot.with_hotness(counters))
+        export("re-export after one vote")
+
+        pages = sum(len(files) for _, _, files in os.walk(out_dir))
+        size = sum(os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(out_dir) for name in files)
+        print(f"  ➜ {pages} files, {size / 1024 / 1024:.1f} MiB on disk")
+
+
+def bench_replicas(args):
+    """Sheets calls and vote propagation with several replicas: per-process caches vs the shared cache"""
+    import multiprocessing
+
+    print(f"🤝 Replicas ({args.tools} tools, {args.seconds:.0f} s each, catalog refresh every {args.catalog_ttl:.0f} s, "
+          f"hotness every {args.hotness_ttl:.0f} s, {args.latency * 1000:.0f} ms per API call)")
+    print(f"  {'cache':<22} {'replicas':>8} {'Sheets calls':>13} {'per replica':>12} {'reruns':>8} {'vote seen after':>16}")
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        for label in ("per-process", "shared (SQLite)"):
+            for replicas in args.replicas:
+                shared_path = os.path.join(tmp, f"shared-{replicas}.sqlite") if label != "per-process" else None
+                results = context.Queue()
+                barrier = context.Barrier(replicas)
+                processes = [context.Process(target=_replica, args=(index, args, shared_path, barrier, results))
+                             for index in range(replicas)]
+                for process in processes:
+                    process.start()
+                reports = [results.get() for _ in processes]
+                for process in processes:
+                    process.join()
+
+                calls = sum(report['calls'] for report in reports)
+                voted_at = next(report['voted_at'] for report in reports if report['index'] == 0)
+                seen = [report['seen_at'] for report in reports if report['index'] != 0]
+                if not seen:
+                    propagation = "-"
+                elif None in seen:
+                    propagation = "never"
+                else:
+                    propagation = f"{max(seen) - voted_at:.2f} s"
+                print(f"  {label:<22} {replicas:>8} {calls:>13} {calls / replicas:>12.1f} "
+                      f"{sum(report['reruns'] for report in reports):>8} {propagation:>16}")
+
+
+def _replica(index, args, shared_path, barrier, results):
+    """One app replica in its own process, rerunning against its own stand-in Sheets backend
+
+    Replica 0 casts a vote halfway through, the others report when they first count it.
+    """
+    if shared_path:
+        os.environ["SHARED_CACHE_PATH"] = shared_path
+    isolate_cache_paths(args.cache_dir)  # A fresh process, config is imported anew
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        import data_manager
+        from hotness import get_hotness_counters
+        from identity import voter_digest
+        from shared_cache import get_shared_cache
+        from snapshot import get_snapshot_store
+
+        skip_link_checks()
+        # Refresh intervals scaled down so a few seconds cover several refresh cycles
+        data_manager.CACHE_DURATION = args.catalog_ttl / 3600
+        data_manager.HOTNESS_CACHE_DURATION = args.hotness_ttl / 60
+        dm = standin_data_manager(args.tools, latency=args.latency)
+        tool_id = int(synthetic_catalog(args.tools)['tool_id'].iloc[0])
+        voter = voter_digest("203.0.113.7")
+        barrier.wait()
+
+        started = time.monotonic()
+        reruns, voted_at, seen_at = 0, None, None
+        while time.monotonic() - started < args.seconds:
+            dm.get_catalog_snapshot()
+            reruns += 1
+            counters = get_hotness_counters()
+            if index == 0 and voted_at is None and time.monotonic() - started > args.seconds / 2:
+                # Published the way DataManager.record_hotness_vote does
+                voted_at = time.time()
+                counters.add(tool_id, voted_at, voter=voter)
+                get_snapshot_store().update(lambda snapshot: snapshot.with_hotness(counters, hotness_at=snapshot.hotness_at))
+                if get_shared_cache() is not None:
+                    get_shared_cache().publish_vote(tool_id, voter, voted_at)
+            elif index != 0 and seen_at is None and counters.has_voted(tool_id, format(voter, 'x')):
+                seen_at = time.time()
+            time.sleep(0.02)
+
+        calls = dm.sheet.api_calls + dm.hotness_sheet.api_calls
+    results.put({'index': index, 'calls': calls, 'reruns': reruns, 'voted_at': voted_at, 'seen_at': seen_at})
+
+
+def bench_ratelimit(args):
+    """Sheets writes from a scripted clicker rotating addresses in one /24, and the limiter's own cost"""
+    import rate_limit
+    from hotness import HotnessCounters, set_hotness_counters
+    from identity import SessionIdentity
+
+    # record_hotness_vote reads the session ID, which has no script run context here
+    for name in ("streamlit.runtime.scriptrunner_utils.script_run_context", "streamlit.runtime.state.session_state_proxy"):
+        logging.getLogger(name).setLevel(logging.ERROR)
+    print(f"🐢 Vote rate limiting ({args.attempts} scripted vote attempts, {args.checks} limiter checks)")
+    dm = standin_data_manager(100)
+    dm.hotness_sheet.rows = [["Tool_ID", "Voter", "Voted_At"]]
+    tool_ids = synthetic_catalog(100)['tool_id'].tolist()
+
+    # A script rotating through every address of 198.51.100.0/24, each one a fresh voter key
+    attempts = [(tool_ids[i % len(tool_ids)], SessionIdentity(f"198.51.100.{i % 250}", 'x-forwarded-for'))
+                for i in range(args.attempts)]
+
+    def click(label, limiter):
+        rate_limit._limiter = limiter
+        dm.hotness_sheet.rows = dm.hotness_sheet.rows[:1]
+        set_hotness_counters(HotnessCounters())
+        before = dm.hotness_sheet.api_calls
+        recorded = []
+        timed(label, 1, lambda: recorded.extend(dm.record_hotness_vote(tool, identity) for tool, identity in attempts))
+        writes = dm.hotness_sheet.api_calls - before
+        print(f"    {sum(recorded)} votes recorded, {writes} Sheets write calls")
+        return writes
+
+    unlimited = click("no limiter", rate_limit.VoteRateLimiter(per_voter=10 ** 9, per_prefix=10 ** 9))
+    limited = click("sliding-window limiter", rate_limit.VoteRateLimiter())
+
+    limiter = rate_limit.VoteRateLimiter()
+    identities = [SessionIdentity(f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}", 'connection') for i in range(args.checks)]
+    now = time.time()
+    check_ms = timed(f"{args.checks} checks, {args.checks} distinct voters", 1,
+                     lambda: [limiter.allow(identity, now) for identity in identities])
+    status = limiter.status()
+    print(f"    {check_ms * 1000 / args.checks:.2f} µs per check, {status['voter_keys']} voter / "
+          f"{status['prefix_keys']} prefix keys held, {status['evicted']} evicted")
+    print(f"  ➜ {unlimited} → {limited} Sheets writes from one /24")
+
+
+def bench_import(args):
+    """Bulk tool import: Sheets calls and wall time vs adding the tools one row at a time"""
+    print(f"📥 Bulk import ({args.new} new tools into {args.tools}, {args.latency * 1000:.0f} ms per API call)")
+    dm = standin_data_manager(args.tools, latency=args.latency)
+    existing = synthetic_catalog(args.tools)
+
+    new = synthetic_catalog(args.new, seed=7)
+    new['Title'] = [f"Imported {title}" for title in new['Title']]
+    new = new[['Title', 'Summary', 'Source_URL', 'Author/Company', 'Domain', 'Integration_Steps', 'Date_Added']].astype(str)
+    # Realistic noise: tools already in the sheet, repeats within the file and incomplete rows
+    dupes = existing[new.columns].head(args.new // 10).astype(str)
+    broken = new.head(args.new // 20).assign(Summary='', Title=lambda df: df['Title'] + " (draft)")
+    df = pd.concat([new, dupes, new.head(args.new // 20), broken], ignore_index=True)
+
+    before = dm.sheet.api_calls
+    report = {}
+    import_ms = timed(f"import of {len(df)} rows", 1, lambda: report.update(dm.import_tools(df)))
+    calls = dm.sheet.api_calls - before
+    reasons = pd.Series([re.sub(r'\s*\d+$', '', reason) for _, _, reason in report['rejected']]).value_counts()
+    print(f"    {len(report['added'])} added, rejected: {', '.join(f'{count} {reason}' for reason, count in reasons.items())}")
+    print(f"  ➜ {calls} Sheets calls in {import_ms / 1000:.1f} s, one append_row per tool would be "
+          f"{len(report['added'])} calls (~{len(report['added']) * args.latency:.0f} s)")
+
+
+def bench_digest(args):
+    """Digest pipeline: rendering per segment vs per subscriber, and send rate by SMTP concurrency"""
+    from digest import DigestBuilder, DigestSender
+
+    print(f"📧 Digest ({args.subscribers} subscribers, {args.latency * 1000:.0f} ms per SMTP command, "
+          f"{args.temp_failures:.0%} temporary RCPT failures)")
+    dm = standin_data_manager(2000)
+    rng = random.Random(1)
+    dm.sheet.spreadsheet.worksheets["Signups"] = StandInWorksheet(
+        [["Name", "Email", "LinkedIn", "Signup_Date", "Topics"]] + [
+            [f"Subscriber {i}", f"subscriber{i}@example.com", "", "01/02/2025 10:00:00",
+             "; ".join(rng.sample(DOMAINS, rng.choice([0, 0, 1, 1, 2])))]
+            for i in range(args.subscribers)
+        ], title="Signups", spreadsheet=dm.sheet.spreadsheet,
+    )
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        snapshot = dm._fetch_fresh_data_with_hotness()
+
+    subscribers = list(dm.iter_subscribers())
+    builder = DigestBuilder(snapshot)
+    messages = []
+    segment_ms = timed("render once per segment", 1, lambda: messages.extend(builder.message(s) for s in subscribers))
+    sample = subscribers[:200]
+    per_user_ms = timed("render per subscriber (200 sampled)", 1,
+                        lambda: [builder._render(builder.segment(topics)) for _, _, topics in sample])
+    print(f"    {builder.segments} segments, ~{per_user_ms * len(subscribers) / len(sample) / max(segment_ms, 1e-6):.0f}x "
+          f"less rendering than once per subscriber")
+
+    for concurrency in args.concurrency:
+        server = StandInSMTPServer(latency=args.latency, temp_failure_rate=args.temp_failures).start()
+        sender = DigestSender('127.0.0.1', server.port, concurrency=concurrency, backoff=0.01)
+        stats = {}
+        timed(f"send with {concurrency} connection(s)", 1, lambda: stats.update(sender.send_all(messages)))
+        print(f"    {stats['per_second']:,.0f} msgs/s, {server.messages} delivered, {len(stats['failed'])} failed, "
+              f"{stats['retried']} retries over {server.connections} connections")
+
+
+def bench_links(args):
+    """Link checking: sequential vs bounded async against stand-in hosts, then the cached join"""
+    from link_health import LINK_DEAD, LINK_OK, LINK_UNKNOWN, LinkChecker, LinkHealthCache
+    from snapshot import CatalogSnapshot
+
+    print(f"🔗 Links ({args.links} links on {args.hosts} hosts, {args.latency * 1000:.0f} ms per request, "
+          f"{args.concurrency} in flight, {args.per_host} per host {args.host_delay * 1000:.0f} ms apart)")
+    rng = random.Random(3)
+    expected_status = {'ok': LINK_OK, 'slow': LINK_OK, 'nohead': LINK_OK, 'missing': LINK_DEAD, 'hang': LINK_UNKNOWN}
+    kinds = rng.choices(list(expected_status), weights=[80, 4, 7, 8, 1], k=args.links)
+
+    def run(label, checker):
+        hosts = [StandInLinkHost(args.latency, hang=args.timeout * 2) for _ in range(args.hosts)]
+        urls = {f"http://127.0.0.1:{hosts[i % len(hosts)].port}/{kind}/{i}": kind for i, kind in enumerate(kinds)}
+        results = {}
+        timed(label, 1, lambda: results.update(checker.check(urls)))
+        correct = sum(results[url][0] == expected_status[kind] for url, kind in urls.items())
+        gaps = [host.min_gap for host in hosts if host.min_gap is not None]
+        print(f"    {correct}/{len(urls)} classified as expected, {sum(host.requests for host in hosts)} requests, "
+              f"at most {max(host.max_in_flight for host in hosts)} in flight per host, "
+              f"shortest gap on a host {min(gaps) * 1000:.0f} ms")
+        for host in hosts:
+            host.server.shutdown()
+        return results
+
+    run("sequential (1 in flight, no delay)", LinkChecker(concurrency=1, per_host=1, host_delay=0, timeout=args.timeout))
+    results = run("bounded async", LinkChecker(concurrency=args.concurrency, per_host=args.per_host,
+                                              host_delay=args.host_delay, timeout=args.timeout))
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = LinkHealthCache(os.path.join(directory, "link_health.json"))
+        cache.put_many(results)
+        print(f"    links due for a re-check right after: {len(LinkHealthCache(cache.path).stale(list(results)))}")
+        frame = synthetic_catalog(len(results))
+        frame['Source_URL'] = list(results)
+        snapshot = CatalogSnapshot(frame, "bench")
+        statuses = cache.statuses()
+        timed("join link_status into the snapshot", 20, lambda: snapshot.with_link_status(statuses))
+
+
+def _walk_elements(node):
+    """Every element and block below an AppTest node"""
+    children = getattr(node, 'children', None) or {}
+    for child in (children.values() if isinstance(children, dict) else children):
+        yield child
+        yield from _walk_elements(child)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="aINeedToKnow benchmarks")
+    subparsers = parser.add_subparsers(dest="benchmark", required=True)
+
+    snapshot_parser = subparsers.add_parser("snapshot", help="Catalog read cost per rerun")
+    snapshot_parser.add_argument("--tools", type=int, default=100000)
+    snapshot_parser.add_argument("--reruns", type=int, default=50)
+    snapshot_parser.set_defaults(run=bench_snapshot)
+
+    refresh_parser = subparsers.add_parser("refresh", help="Refresh wall time against a slow stand-in backend")
+    refresh_parser.add_argument("--tools", type=int, default=5000)
+    refresh_parser.add_argument("--latency", type=float, default=0.3)
+    refresh_parser.set_defaults(run=bench_refresh)
+
+    hotness_parser = subparsers.add_parser("hotness", help="Hotness load cost before/after log compaction")
+    hotness_parser.add_argument("--tools", type=int, default=5000)
+    hotness_parser.add_argument("--votes-per-tool", type=int, default=20)
+    hotness_parser.set_defaults(run=bench_hotness)
+
+    votes_parser = subparsers.add_parser("votes", help="Legacy vs compact vote encoding")
+    votes_parser.add_argument("--tools", type=int, default=5000)
+    votes_parser.add_argument("--votes-per-tool", type=int, default=20)
+    votes_parser.set_defaults(run=bench_votes)
+
+    outage_parser = subparsers.add_parser("outage", help="Rerun cost during a Sheets outage")
+    outage_parser.add_argument("--tools", type=int, default=2000)
+    outage_parser.add_argument("--timeout", type=float, default=2.0)
+    outage_parser.add_argument("--reruns", type=int, default=10)
+    outage_parser.set_defaults(run=bench_outage)
+
+    render_parser = subparsers.add_parser("render", help="Time-to-first-content of the feed")
+    render_parser.add_argument("--tools", type=int, default=2000)
+    render_parser.add_argument("--latency", type=float, default=0.3)
+    render_parser.add_argument("--flipped", type=int, default=2)
+    render_parser.add_argument("--reruns", type=int, default=5)
+    render_parser.set_defaults(run=bench_render)
+
+    api_parser = subparsers.add_parser("api", help="Feed API throughput")
+    api_parser.add_argument("--tools", type=int, default=5000)
+    api_parser.add_argument("--requests", type=int, default=2000)
+    api_parser.add_argument("--concurrency", type=int, default=8)
+    api_parser.set_defaults(run=bench_api)
+
+    export_parser = subparsers.add_parser("export", help="Static export, full vs incremental")
+    export_parser.add_argument("--tools", type=int, default=5000)
+    export_parser.set_defaults(run=bench_export)
+
+    replicas_parser = subparsers.add_parser("replicas", help="Sheets load and vote propagation across replicas")
+    replicas_parser.add_argument("--replicas", type=int, nargs='+', default=[1, 2, 4])
+    replicas_parser.add_argument("--seconds", type=float, default=8.0)
+    replicas_parser.add_argument("--tools", type=int, default=2000)
+    replicas_parser.add_argument("--latency", type=float, default=0.2)
+    replicas_parser.add_argument("--catalog-ttl", type=float, default=4.0)
+    replicas_parser.add_argument("--hotness-ttl", type=float, default=2.0)
+    replicas_parser.set_defaults(run=bench_replicas)
+
+    ratelimit_parser = subparsers.add_parser("ratelimit", help="Vote rate limiting vs a scripted clicker")
+    ratelimit_parser.add_argument("--attempts", type=int, default=2000)
+    ratelimit_parser.add_argument("--checks", type=int, default=200000)
+    ratelimit_parser.set_defaults(run=bench_ratelimit)
+
+    import_parser = subparsers.add_parser("import", help="Bulk tool import, batched vs per row")
+    import_parser.add_argument("--tools", type=int, default=2000)
+    import_parser.add_argument("--new", type=int, default=500)
+    import_parser.add_argument("--latency", type=float, default=0.3)
+    import_parser.set_defaults(run=bench_import)
+
+    digest_parser = subparsers.add_parser("digest", help="Digest rendering and SMTP send rate")
+    digest_parser.add_argument("--subscribers", type=int, default=2000)
+    digest_parser.add_argument("--concurrency", type=int, nargs='+', default=[1, 8, 32])
+    digest_parser.add_argument("--latency", type=float, default=0.002)
+    digest_parser.add_argument("--temp-failures", type=float, default=0.01)
+    digest_parser.set_defaults(run=bench_digest)
+
+    links_parser = subparsers.add_parser("links", help="Link checking against stand-in hosts")
+    links_parser.add_argument("--links", type=int, default=400)
+    links_parser.add_argument("--hosts", type=int, default=40)
+    links_parser.add_argument("--latency", type=float, default=0.05)
+    links_parser.add_argument("--concurrency", type=int, default=16)
+    links_parser.add_argument("--per-host", type=int, default=2)
+    links_parser.add_argument("--host-delay", type=float, default=0.05)
+    links_parser.add_argument("--timeout", type=float, default=1.0)
+    links_parser.set_defaults(run=bench_links)
+
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        isolate_cache_paths(cache_dir)
+        skip_link_checks()
+        args.cache_dir = cache_dir
+        args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""
+Circuit breaker for aINeedToKnow's Google Sheets backend - after repeated failures every
+call fails fast, writes are queued, and a background probe closes the circuit again
+"""
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from config import *
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the backend while the circuit is open"""
+
+
+class CircuitBreaker:
+    """Process-wide health gate around one backend
+
+    failure_types: exceptions that count as the backend failing (anything else is
+    treated as a bug in the caller and passes through without tripping the circuit)
+    retryable: tells which of those failures may succeed later (e.g. not a 400 Bad Request);
+    queued writes failing any other way are dead-lettered instead of retried
+    """
+
+    def __init__(self, name, failure_threshold=SHEETS_FAILURE_THRESHOLD,
+                 probe_interval=SHEETS_PROBE_INTERVAL, failure_types=(Exception,),
+                 retryable=lambda error: True, max_pending=SHEETS_MAX_PENDING_WRITES):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.failure_types = failure_types
+        self.retryable = retryable
+        self.max_pending = max_pending
+        self.failures = 0
+        self.opened_at = None
+        self.last_error = None
+        self.dropped = 0  # Writes turned away because the queue was full
+        self.dead_letters = deque(maxlen=50)  # (description, error) of writes given up on
+        self._probe = None
+        self._probe_thread = None
+        self._pending = deque()
+        self._lock = threading.Lock()
+        self._flushing = threading.Lock()
+
+    def is_open(self):
+        return self.opened_at is not None
+
+    def call(self, func, *args, **kwargs):
+        """func(*args, **kwargs) unless the circuit is open (then CircuitOpenError right away)"""
+        if self.is_open():
+            raise CircuitOpenError(f"{self.name} unavailable since {datetime.fromtimestamp(self.opened_at):%H:%M:%S}")
+        try:
+            result = func(*args, **kwargs)
+        except self.failure_types as e:
+            self.record_failure(e)
+            raise
+        self.record_success()
+        return result
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+        # Writes queued after a failure that didn't open the circuit go out now
+        if self._pending and not self._flushing.locked():
+            threading.Thread(target=self.flush, name=f"{self.name}-flush", daemon=True).start()
+
+    def is_retryable(self, error):
+        """True if a call failing with error may succeed later, so the write is worth queueing"""
+        if isinstance(error, CircuitOpenError):
+            return True
+        return isinstance(error, self.failure_types) and self.retryable(error)
+
+    def record_failure(self, error):
+        with self._lock:
+            self.failures += 1
+            self.last_error = str(error)
+            if self.failures < self.failure_threshold or self.is_open():
+                return
+            self.opened_at = time.time()
+        print(f"🔌 {self.name} circuit open after {self.failures} failures: {error}")
+        self._start_probe()
+
+    def set_probe(self, probe):
+        """Cheap backend call used to detect recovery while the circuit is open"""
+        self._probe = probe
+
+    def _start_probe(self):
+        with self._lock:
+            if self._probe_thread is not None and self._probe_thread.is_alive():
+                return
+            self._probe_thread = threading.Thread(
+                target=self._probe_until_closed, name=f"{self.name}-probe", daemon=True
+            )
+            self._probe_thread.start()
+
+    def _probe_until_closed(self):
+        while self.is_open():
+            time.sleep(self.probe_interval)
+            try:
+                if self._probe is not None:
+                    self._probe()
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"🔌 {self.name} still unavailable: {e}")
+                continue
+            self.close()
+
+    def close(self):
+        """Back to normal: reset the failure count and replay the queued writes"""
+        with self._lock:
+            self.opened_at = None
+            self.failures = 0
+        print(f"🔌 {self.name} circuit closed")
+        self.flush()
+
+    def enqueue(self, description, func, *args, **kwargs):
+        """Queue a write to replay once the backend is reachable again
+
+        Returns False (and counts the write as dropped) when max_pending writes are queued.
+        """
+        with self._lock:
+            if len(self._pending) >= self.max_pending:
+                self.dropped += 1
+                full = True
+            else:
+                self._pending.append((description, func, args, kwargs))
+                full = False
+        if full:
+            print(f"❌ Dropped {description}: {self.max_pending} writes already pending ({self.dropped} dropped)")
+            return False
+        print(f"📮 Queued {description} ({len(self._pending)} pending)")
+        return True
+
+    def flush(self):
+        """Replay queued writes in order
+
+        A retryable failure stops the replay and keeps the rest for later; a write failing
+        for good (or with a bug) is dead-lettered so it can't block the writes behind it.
+        """
+        if not self._flushing.acquire(blocking=False):
+            return  # Another thread is replaying the queue
+        try:
+            while self._pending and not self.is_open():
+                with self._lock:
+                    if not self._pending:
+                        break
+                    description, func, args, kwargs = self._pending.popleft()
+                try:
+                    self.call(func, *args, **kwargs)
+                    print(f"📮 Replayed {description}")
+                except Exception as e:
+                    if not self.is_retryable(e):
+                        self.dead_letters.append((description, str(e)))
+                        print(f"❌ Gave up on {description}: {e}")
+                        continue
+                    with self._lock:
+                        self._pending.appendleft((description, func, args, kwargs))
+                    print(f"❌ Could not replay {description}: {e}")
+                    break
+        finally:
+            self._flushing.release()
+
+    def status(self):
+        """Circuit state for diagnostics"""
+        return {
+            'state': 'open' if self.is_open() else 'closed',
+            'failures': self.failures,
+            'opened_at': datetime.fromtimestamp(self.opened_at) if self.opened_at else None,
+            'pending_writes': len(self._pending),
+            'dropped_writes': self.dropped,
+            'dead_letters': [f"{description}: {error}" for description, error in self.dead_letters],
+            'last_error': self.last_error,
+        }
+
+
+_sheets = None
+_sheets_lock = threading.Lock()
+
+
+def get_sheets_breaker():
+    """The Google Sheets circuit breaker shared by every session in this process"""
+    global _sheets
+    with _sheets_lock:
+        if _sheets is None:
+            import gspread
+            import requests
+            from google.auth.exceptions import TransportError
+
+            _sheets = CircuitBreaker(
+                "Google Sheets",
+                failure_types=(gspread.exceptions.GSpreadException, requests.exceptions.RequestException,
+                               TransportError, OSError),
+                retryable=_retryable_sheets_error,
+            )
+        return _sheets
+
+
+def _retryable_sheets_error(error):
+    """Network errors, timeouts, quota (429) and server errors are; other 4xx API errors are not"""
+    import gspread
+
+    if not isinstance(error, gspread.exceptions.APIError):
+        return True
+    code = getattr(getattr(error, 'response', None), 'status_code', None)
+    return not (isinstance(code, int) and 400 <= code < 500 and code not in (408, 429))
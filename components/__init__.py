@@ -0,0 +1,3 @@
+"""
+Custom Streamlit components for aINeedToKnow
+"""
@@ -0,0 +1,33 @@
+"""
+Tile grid component for aINeedToKnow - renders a whole page of tool tiles in the browser
+from one JSON payload. Flip and "Read More" stay client-side, only votes and domain filter
+clicks come back to the script.
+"""
+import os
+import streamlit as st
+import streamlit.components.v1 as st_components
+from config import MOBILE_BREAKPOINT
+
+_FRONTEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "frontend")
+_tile_grid = st_components.declare_component("tile_grid", path=_FRONTEND_DIR)
+
+
+def tile_grid(tiles, columns=2, mobile=False, report_viewport=True, key="tile_grid"):
+    """Render tiles (JSON-safe dicts, see app.tile_payload) and return the newest event, if any
+
+    Events are {'id': ..., 'type': 'vote', 'tool_id': ...} or {'id': ..., 'type': 'filter', 'domain': ...},
+    plus {'type': 'viewport', 'width': ...} when the page width crosses MOBILE_BREAKPOINT (with
+    report_viewport, one grid per page is enough) and {'type': 'details', 'tool_id': ...} when a
+    tile whose steps were left out or still loading is flipped.
+    A component keeps returning its last value on later reruns, so each event is returned only once.
+    The frontend gets the ID of the last event handled, so clicks the script has answered show
+    the tiles' own vote status again.
+    """
+    handled_key = f"{key}_handled"
+    event = _tile_grid(tiles=tiles, columns=columns, mobile=mobile,
+                       breakpoint=MOBILE_BREAKPOINT if report_viewport else None,
+                       handled=st.session_state.get(handled_key), key=key, default=None)
+    if not event or st.session_state.get(handled_key) == event.get('id'):
+        return None
+    st.session_state[handled_key] = event.get('id')
+    return event
@@ -20,6 +20,42 @@ GOOGLE_SCOPES = [
 # Cache Configuration (in hours)
 CACHE_DURATION = 1
 
+# Google Sheets circuit breaker: open after this many consecutive failures, then
+# probe for recovery every SHEETS_PROBE_INTERVAL seconds
+SHEETS_FAILURE_THRESHOLD = 3
+SHEETS_PROBE_INTERVAL = 30
+SHEETS_TIMEOUT = 10  # seconds per API request
+SHEETS_MAX_PENDING_WRITES = 1000  # votes and signups queued while Sheets is down; more are turned away
+
+# Hotness overlay refresh interval (in minutes)
+HOTNESS_CACHE_DURATION = 5
+
+# Trending: a vote loses half its weight every HOTNESS_HALF_LIFE_HOURS
+HOTNESS_HALF_LIFE_HOURS = 72
+HOTNESS_RETENTION_DAYS = 30
+
+# Hotness log compaction: raw votes older than this are rolled into the counts sheet
+HOTNESS_COMPACT_AFTER_HOURS = 24
+HOTNESS_COUNTS_SHEET = "Hotness_Counts"
+HOTNESS_ARCHIVE_SHEET = "Hotness_Archive"
+# Backup of the Hotness log taken before migrating it to the compact vote encoding
+HOTNESS_LEGACY_SHEET = "Hotness_Legacy"
+
+# Vote rate limits (rate_limit.py): votes per sliding window per voter key and per IP prefix
+# (/24 or /48), checked before a vote is written to Google Sheets
+VOTE_LIMIT_PER_VOTER = 10
+VOTE_LIMIT_PER_PREFIX = 60
+VOTE_LIMIT_WINDOW = 60  # seconds
+VOTE_LIMIT_MAX_KEYS = 10000  # keys tracked per limit, the least recently seen are evicted first
+
+# Spotlight needs this many votes in the last 7 days
+SPOTLIGHT_MIN_VOTES = 5
+
+# Catalog columns: the list view only fetches LIST_COLUMNS, the long
+# DETAIL_COLUMNS are loaded per tool when a tile is flipped
+LIST_COLUMNS = ['Title', 'Summary', 'Source_URL', 'Author/Company', 'Domain', 'Date_Added']
+DETAIL_COLUMNS = ['Integration_Steps']
+
 # Domain Categories
 DOMAINS = [
     "All",
@@ -30,6 +66,17 @@ DOMAINS = [
     "General AI (Coming Soon)"
 ]
 
+# Color scheme for different domains (tiles, static export)
+DOMAIN_COLORS = {
+    'Data Preparation & Automation': '#667eea',
+    'Spreadsheets & Documents': '#38ef7d', 
+    'Code Generation & Debugging': '#ff6b6b',
+    'Dashboards & Reports': '#4ecdc4',
+    'Natural Language Queries': '#45b7d1',
+    'AutoML & Predictive Analytics': '#6c5ce7',
+    'Meetings': '#fd79a8'
+}
+
 # File Paths
 USERS_CSV_PATH = "cache/users.csv"
 NEWS_CACHE_PATH = "cache/news_cache.csv"
@@ -37,6 +84,53 @@ NEWS_CACHE_PATH = "cache/news_cache.csv"
 # UI Configuration
 CARDS_PER_PAGE = 10
 MOBILE_BREAKPOINT = 768
+# Flipped/expanded tiles remembered per session beyond the current page
+MAX_TILE_STATE = 50
+# Render each page as one client-side tile grid component (False: Streamlit widgets per tile)
+TILE_GRID_COMPONENT = True
+
+# Voter keys are an HMAC of the client address with this secret, so the Hotness sheet can't be
+# reversed into IP addresses. Every replica needs the same one; when unset a random secret is
+# generated once and kept in VOTER_SECRET_PATH.
+VOTER_KEY_SECRET = os.getenv("VOTER_KEY_SECRET", "")
+VOTER_SECRET_PATH = "cache/voter_secret"
+# Reverse proxies (load balancer, CDN) in front of the app that append to X-Forwarded-For.
+# 0 (clients connect directly) ignores forwarding headers, which any client can forge. Behind
+# proxies set it to how many of them there are, e.g. TRUSTED_PROXY_COUNT=1 behind one load
+# balancer; otherwise every voter behind them shares the proxy's address.
+TRUSTED_PROXY_COUNT = int(os.getenv("TRUSTED_PROXY_COUNT", "0"))
+
+# Read-only JSON feed API (api.py), started next to the app by run_server.py
+# Loopback by default; set FEED_API_HOST=0.0.0.0 to expose it (e.g. behind a reverse proxy)
+FEED_API_HOST = os.getenv("FEED_API_HOST", "127.0.0.1")
+FEED_API_PORT = int(os.getenv("FEED_API_PORT", "8502"))
+
+# Shared cache for several replicas behind a load balancer (shared_cache.py): a SQLite file
+# on a volume every replica mounts. Empty keeps every cache per process.
+SHARED_CACHE_PATH = os.getenv("SHARED_CACHE_PATH", "")
+SHARED_CACHE_POLL_INTERVAL = 2  # seconds between checks for other replicas' snapshots and votes
+
+# Link health (link_health.py): Source_URLs are checked in the background after each catalog refresh
+LINK_HEALTH_PATH = "cache/link_health.json"
+LINK_CHECK_TTL = 24  # hours a working link is trusted before it is checked again
+LINK_CHECK_RETRY = 1  # hours before a dead or unreachable link is checked again
+LINK_CHECK_CONCURRENCY = 16  # requests in flight across all hosts
+LINK_CHECK_PER_HOST = 2  # requests in flight per host
+LINK_CHECK_HOST_DELAY = 1.0  # seconds between two requests to the same host
+LINK_CHECK_TIMEOUT = 10  # seconds per request
+LINK_HIDE_DEAD = False  # hide the "Visit Tool" button of dead links instead of flagging it
+
+# Email Configuration
+ADMIN_EMAIL = os.getenv("ADMIN_EMAIL", "admin@aineedtoknow.com")
 
-# Email Configuration (for future use)
-ADMIN_EMAIL = os.getenv("ADMIN_EMAIL", "admin@aineedtoknow.com")
\ No newline at end of file
+# Digest emails (digest.py, sent with python maintenance.py send-digest)
+SMTP_HOST = os.getenv("SMTP_HOST", "localhost")
+SMTP_PORT = int(os.getenv("SMTP_PORT", "25"))
+SMTP_USERNAME = os.getenv("SMTP_USERNAME", "")
+SMTP_PASSWORD = os.getenv("SMTP_PASSWORD", "")
+SMTP_STARTTLS = os.getenv("SMTP_STARTTLS", "") == "1"
+SMTP_TIMEOUT = 30  # seconds per SMTP command
+DIGEST_FROM = os.getenv("DIGEST_FROM", ADMIN_EMAIL)
+DIGEST_TOOLS = 10  # top tools per digest
+DIGEST_CONCURRENCY = 8  # SMTP connections sending in parallel
+DIGEST_RETRIES = 3  # retries after a temporary failure (4xx reply, dropped connection)
\ No newline at end of file
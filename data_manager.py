@@ -2,19 +2,126 @@
 Data management for aINeedToKnow - handles Google Sheets integration, caching, and hotness tracking
 """
 import pandas as pd
+import numpy as np
 import gspread
+from gspread.utils import rowcol_to_a1
 from google.oauth2.service_account import Credentials
 import streamlit as st
 from datetime import datetime, timedelta
 import os
 import json
+import hashlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from config import *
+from snapshot import CatalogSnapshot, get_snapshot_store, get_detail_cache
+from hotness import (HotnessCounters, COUNTS_HEADERS, VOTE_HEADERS, LEGACY_VOTE_HEADERS, LEGACY_TIME_FORMAT,
+                     decode_votes, get_hotness_counters, set_hotness_counters)
+from identity import tool_key
+from circuit_breaker import CircuitOpenError, get_sheets_breaker
+from shared_cache import get_shared_cache
+from rate_limit import get_vote_limiter
+from link_health import start_link_check, with_link_status
+
+try:
+    import pyarrow  # noqa: F401 - only needed for Arrow-backed string columns
+    TEXT_DTYPE = pd.StringDtype("pyarrow")
+except ImportError:
+    TEXT_DTYPE = object
+
+# Columns every tool row has: they define a dataset version (hotness is left out, it changes
+# with every vote), missing ones are added empty by _clean_data and import_tools requires them
+CONTENT_COLUMNS = ['Title', 'Summary', 'Source_URL', 'Author/Company', 'Domain', 'Integration_Steps', 'Date_Added']
+
+def dataset_version(df):
+    """Short content hash identifying a cleaned catalog, used to key derived indexes"""
+    if df.empty:
+        return "empty"
+    
+    columns = [col for col in CONTENT_COLUMNS if col in df.columns]
+    hashes = pd.util.hash_pandas_object(df[columns], index=True)
+    return hashlib.sha1(hashes.values.tobytes()).hexdigest()[:12]
+
+# Digest topics a subscriber picked (domains), stored in one cell of the Signups sheet / users.csv
+TOPICS_SEPARATOR = "; "
+
+# Compact schema for the cached catalog
+TEXT_COLUMNS = ['Title', 'Summary', 'Source_URL', 'Integration_Steps']
+CATEGORY_COLUMNS = ['Domain', 'Author/Company']
+
+def compact_catalog(df):
+    """Convert a cleaned catalog to the compact schema: categorical Domain/Author,
+    int64 tool_id, int32 sheet rows and counts, Arrow-backed strings where pyarrow is available"""
+    if df.empty:
+        return df
+    
+    df = df.copy()
+    for col in TEXT_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].fillna('').astype(str).astype(TEXT_DTYPE)
+    
+    for col in CATEGORY_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].fillna('').astype(str).astype('category')
+    
+    if 'tool_id' in df.columns:
+        df['tool_id'] = pd.to_numeric(df['tool_id'], errors='coerce').fillna(0).astype(np.int64)
+    
+    for col in ['sheet_row', 'hotness_count', 'hotness_today', 'hotness_week']:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors='coerce').fillna(0).astype(np.int32)
+    
+    if 'hotness_trending' in df.columns:
+        df['hotness_trending'] = pd.to_numeric(df['hotness_trending'], errors='coerce').fillna(0).astype(np.float32)
+    
+    return df
+
+def assign_tool_ids(df):
+    """Stable tool_id (hash of the title) plus the sheet_row the tool was read from
+    
+    Catalogs cached before tool IDs existed used the sheet row as tool_id.
+    """
+    if 'sheet_row' not in df.columns:
+        df['sheet_row'] = df['tool_id'] if 'tool_id' in df.columns else np.arange(2, len(df) + 2)
+    df['tool_id'] = np.fromiter((tool_key(title) for title in df['Title']), dtype=np.int64, count=len(df))
+    return df
+
+def read_catalog_csv(source):
+    """Catalog frame in the compact schema from a CSV written by DataManager._save_to_cache"""
+    df = pd.read_csv(source)
+    df['Date_Added'] = pd.to_datetime(df['Date_Added'], errors='coerce')
+    for col in ['hotness_count', 'hotness_today', 'hotness_week', 'hotness_trending']:
+        if col not in df.columns:
+            df[col] = 0
+    return compact_catalog(assign_tool_ids(df))
+
+# Background page prefetch: a small shared pool, and the fetch already loading each tool ID
+_page_prefetch = ThreadPoolExecutor(max_workers=2, thread_name_prefix="page-prefetch")
+_prefetching = {}
+_prefetching_lock = threading.Lock()
+
+def memory_report(df):
+    """Per-column memory footprint of a catalog frame for one dataset version"""
+    usage = df.memory_usage(deep=True, index=True)
+    return {
+        'version': dataset_version(df),
+        'rows': len(df),
+        'total_bytes': int(usage.sum()),
+        'bytes_per_tool': int(usage.sum() / len(df)) if len(df) else 0,
+        'columns': {col: {'dtype': str(df[col].dtype) if col in df.columns else 'index', 'bytes': int(size)}
+                    for col, size in usage.items()},
+    }
 
 class DataManager:
     def __init__(self):
         self.gc = None
         self.sheet = None
         self.hotness_sheet = None
+        self.hotness_counts_sheet = None
+        self._column_numbers = None
+        self._legacy_votes = None
+        self.last_fetch_from_cache = False
         self.setup_google_sheets()
         
     def setup_google_sheets(self):
@@ -105,6 +212,8 @@ class DataManager:
             # Authorize and connect to Google Sheets
             print("🔐 Authorizing Google Sheets client...")
             self.gc = gspread.authorize(credentials)
+            if hasattr(self.gc, 'set_timeout'):
+                self.gc.set_timeout(SHEETS_TIMEOUT)  # Fail (and count towards the breaker) instead of hanging
             
             if sheet_url:
                 print(f"📊 Connecting to sheet: {sheet_url}")
@@ -114,6 +223,9 @@ class DataManager:
                 # Setup hotness tracking sheet
                 self.setup_hotness_sheet(spreadsheet)
                 
+                # The breaker probes this connection while Sheets is down
+                get_sheets_breaker().set_probe(self._probe_sheets)
+                
                 print("✅ Successfully connected to Google Sheets!")
             else:
                 st.error("❌ Google Sheet URL not configured.")
@@ -162,42 +274,77 @@ class DataManager:
             except gspread.WorksheetNotFound:
                 print("📝 Creating new Hotness sheet...")
                 # Create new sheet with headers
-                self.hotness_sheet = spreadsheet.add_worksheet(title="Hotness", rows="1000", cols="5")
+                self.hotness_sheet = spreadsheet.add_worksheet(title="Hotness", rows="1000", cols=str(len(VOTE_HEADERS)))
                 
                 # Add headers
-                headers = ["Tool_Title", "IP_Address", "Timestamp", "User_Agent", "Session_ID"]
-                self.hotness_sheet.append_row(headers)
+                self.hotness_sheet.append_row(VOTE_HEADERS)
                 print("✅ Created Hotness sheet with headers")
+            
+            # Aggregated counts only exist once the log has been compacted
+            try:
+                self.hotness_counts_sheet = spreadsheet.worksheet(HOTNESS_COUNTS_SHEET)
+            except gspread.WorksheetNotFound:
+                self.hotness_counts_sheet = None
                 
         except Exception as e:
             print(f"⚠️ Could not setup hotness sheet: {e}")
             self.hotness_sheet = None
     
-    def record_hotness_vote(self, tool_title, ip_address):
-        """Record a hotness vote for a tool"""
+    def _probe_sheets(self):
+        """Cheapest call that proves Google Sheets answers again"""
+        self.sheet.row_values(1)
+    
+    def _get_or_create_worksheet(self, title, headers):
+        """Worksheet next to the Hotness log, created with headers if missing"""
+        spreadsheet = self.hotness_sheet.spreadsheet
+        try:
+            return spreadsheet.worksheet(title)
+        except gspread.WorksheetNotFound:
+            print(f"📝 Creating new {title} sheet...")
+            worksheet = spreadsheet.add_worksheet(title=title, rows="1000", cols=str(len(headers)))
+            worksheet.append_row(headers)
+            return worksheet
+    
+    def record_hotness_vote(self, tool_id, identity, tool_title=''):
+        """Record a hotness vote for a tool from a SessionIdentity"""
         try:
             if not self.hotness_sheet:
                 print("❌ No hotness sheet available")
                 return False
             
-            # Check if this IP already voted for this tool (use cache to reduce API calls)
-            if self.check_if_ip_voted_cached(tool_title, ip_address):
-                print(f"⚠️ IP {ip_address} already voted for {tool_title}")
+            # Check if this voter already voted for this tool (in-memory, no API call)
+            if self.check_if_ip_voted(tool_id, identity.voter):
+                print(f"⚠️ Voter {identity.voter} already voted for {tool_title or tool_id}")
                 return False
             
-            # Record the vote
-            timestamp = datetime.now().strftime('%m/%d/%Y %H:%M:%S')
-            user_agent = "Streamlit_App"
-            session_id = st.session_state.get('session_id', 'unknown')
+            # Scripted clicking must not burn the shared Sheets write quota
+            if not get_vote_limiter().allow(identity):
+                print(f"🐢 Rate limited vote from {identity.voter} for {tool_title or tool_id}")
+                return False
             
-            row = [tool_title, ip_address, timestamp, user_agent, session_id]
-            self.hotness_sheet.append_row(row)
+            # Record the vote; while Sheets is down it is queued and replayed on recovery
+            voted_at = time.time()
+            session_id = st.session_state.get('session_id', 'unknown')
+            breaker = get_sheets_breaker()
+            try:
+                breaker.call(self._append_vote, tool_id, identity, tool_title, voted_at, session_id)
+                print(f"✅ Recorded hotness vote: {tool_title or tool_id} from {identity.voter}")
+            except (CircuitOpenError,) + breaker.failure_types as e:
+                if not breaker.is_retryable(e):
+                    raise
+                if not breaker.enqueue(f"vote for {tool_title or tool_id}", self._append_vote,
+                                       tool_id, identity, tool_title, voted_at, session_id):
+                    return False
             
-            print(f"✅ Recorded hotness vote: {tool_title} from {ip_address}")
+            # Count the vote right away and republish the overlay instead of re-reading the sheet
+            counters = get_hotness_counters()
+            counters.add(tool_id, voted_at, voter=int(identity.voter, 16))
+            get_snapshot_store().update(lambda snapshot: snapshot.with_hotness(counters, hotness_at=snapshot.hotness_at))
             
-            # Clear specific caches to force refresh
-            self._get_cached_hotness_counts.clear()
-            self._fetch_cached_data_with_hotness.clear()
+            # Other replicas count it on their next poll
+            shared = get_shared_cache()
+            if shared is not None:
+                shared.publish_vote(tool_id, int(identity.voter, 16), voted_at)
             
             return True
             
@@ -205,177 +352,572 @@ class DataManager:
             print(f"❌ Error recording hotness vote: {e}")
             return False
     
-    @st.cache_data(ttl=60, show_spinner=False)  # Cache vote status for 1 minute
-    def check_if_ip_voted_cached(_self, tool_title, ip_address):
-        """Cached version of IP vote check"""
-        return _self.check_if_ip_voted(tool_title, ip_address)
+    def _append_vote(self, tool_id, identity, tool_title, voted_at, session_id):
+        """Append one vote row (legacy layout until the sheet has been migrated)"""
+        if self._uses_legacy_votes():
+            timestamp = datetime.fromtimestamp(voted_at).strftime(LEGACY_TIME_FORMAT)
+            row = [tool_title, identity.client_ip, timestamp, "Streamlit_App", session_id]
+        else:
+            row = [int(tool_id), identity.voter, int(voted_at)]
+        self.hotness_sheet.append_row(row)
     
-    def check_if_ip_voted(self, tool_title, ip_address):
-        """Check if an IP address has already voted for a specific tool"""
+    def _uses_legacy_votes(self):
+        """True while the Hotness sheet still has the legacy header (read once per DataManager)"""
+        if self._legacy_votes is None:
+            self._legacy_votes = self.hotness_sheet.row_values(1)[:1] == LEGACY_VOTE_HEADERS[:1]
+        return self._legacy_votes
+    
+    def check_if_ip_voted(self, tool_id, voter):
+        """Check if a voter (hashed voter key, see SessionIdentity) has already voted for a specific tool
+
+        Checked against the in-memory voter digests, no Sheets read per check.
+        """
         try:
-            if not self.hotness_sheet:
-                return False
+            counters = get_hotness_counters()
+            if counters.loaded_at is None and self.hotness_sheet:
+                counters = set_hotness_counters(self.load_hotness_counters())
             
-            # Get all hotness records
-            records = self.hotness_sheet.get_all_records()
-            
-            # Check if this IP already voted for this tool
-            for record in records:
-                if (record.get('Tool_Title', '') == tool_title and 
-                    record.get('IP_Address', '') == ip_address):
-                    return True
-            
-            return False
+            return counters.has_voted(tool_id, voter)
             
         except Exception as e:
             print(f"❌ Error checking IP vote status: {e}")
             return False
     
     def get_hotness_counts(self):
-        """Get hotness counts for all tools"""
+        """Get all-time hotness counts for all tools, keyed by tool ID"""
+        return self.load_hotness_counters().totals()
+    
+    def load_hotness_counters(self):
+        """Build time-bucketed hotness counters from the compacted counts plus the raw vote tail"""
         try:
             if not self.hotness_sheet:
-                return {}
+                return HotnessCounters()
+            
+            # Shared vote deltas up to here were appended to the sheet before this read
+            shared = get_shared_cache()
+            vote_mark = shared.vote_mark() if shared is not None else None
             
-            # Get all hotness records
-            records = self.hotness_sheet.get_all_records()
+            # O(tools) aggregated rows left behind by compact_hotness_log, plus the votes
+            # cast since the last compaction that are still raw rows (either encoding)
+            counts, values = get_sheets_breaker().call(self._read_hotness_sheets)
+            counters = HotnessCounters().load_counts(counts)
+            counters.vote_mark = vote_mark
+            self._legacy_votes = values[0][:1] == LEGACY_VOTE_HEADERS[:1] if values else False
             
-            # Count votes per tool
-            hotness_counts = {}
-            for record in records:
-                tool_title = record.get('Tool_Title', '')
-                if tool_title:
-                    hotness_counts[tool_title] = hotness_counts.get(tool_title, 0) + 1
+            # Bucket every vote by the hour it was cast in, skipping votes a compaction already
+            # folded into the counts but hadn't deleted from the log yet when it was read
+            counters.load(vote for vote in decode_votes(values) if vote[1] > counters.compacted_through)
             
-            print(f"📊 Hotness counts: {hotness_counts}")
-            return hotness_counts
+            counters.loaded_at = time.time()
+            print(f"📊 Hotness: {len(counts)} compacted tools + {max(len(values) - 1, 0)} recent votes for {len(counters)} tools")
+            return counters
             
         except Exception as e:
             print(f"❌ Error getting hotness counts: {e}")
-            return {}
+            # Keep serving what this process already counted
+            return get_hotness_counters()
+    
+    def _read_hotness_sheets(self):
+        # Log first: compaction updates the counts before deleting log rows, so a log read
+        # missing compacted rows is always followed by a counts read that includes them
+        values = self.hotness_sheet.get_all_values()
+        return self._get_hotness_count_records(), values
+    
+    def _get_hotness_count_records(self):
+        """Rows of the aggregated counts worksheet as dicts (raw strings, no numeric guessing)"""
+        if not self.hotness_counts_sheet:
+            return []
+        
+        values = self.hotness_counts_sheet.get_all_values()
+        if not values:
+            return []
+        header = values[0]
+        return [dict(zip(header, row)) for row in values[1:]]
+    
+    def compact_hotness_log(self, older_than_hours=HOTNESS_COMPACT_AFTER_HOURS):
+        """Roll raw votes older than older_than_hours into the counts worksheet and archive them
+        
+        The Hotness log is append-only, so the old votes are a block of rows at the top.
+        They are copied to the archive first, then folded into the per-tool counts and
+        voter digests, and only then deleted from the log. The counts record the newest vote
+        they include as a watermark, so readers between the two writes skip the rows still in
+        the log instead of counting them twice. Returns the number of votes compacted.
+        """
+        if not self.hotness_sheet:
+            print("❌ No hotness sheet available")
+            return 0
+        
+        values = self.hotness_sheet.get_all_values()
+        if len(values) < 2:
+            return 0
+        header, rows = values[0], values[1:]
+        
+        # Leading rows older than the cutoff (stop at the first recent vote)
+        cutoff = time.time() - older_than_hours * 3600
+        # Blank rows (no vote) carry no time: they never hold the block back
+        times = [vote[1] if vote is not None else None
+                 for vote in (next(decode_votes([header, row]), None) for row in rows)]
+        compacted = 0
+        while compacted < len(times) and (times[compacted] is None or times[compacted] < cutoff):
+            compacted += 1
+        
+        # Votes are appended roughly in time order; shrink the block until every vote left in
+        # the log is newer than the watermark, or readers would skip it
+        newer = [float('inf')] * (len(times) + 1)
+        for i in range(len(times) - 1, -1, -1):
+            newer[i] = newer[i + 1] if times[i] is None else min(times[i], newer[i + 1])
+        watermark = [0.0]
+        for t in times:
+            watermark.append(watermark[-1] if t is None else max(t, watermark[-1]))
+        while compacted and watermark[compacted] >= newer[compacted]:
+            compacted -= 1
+        
+        if compacted == 0:
+            print("📊 Nothing to compact in the Hotness log")
+            return 0
+        
+        old_rows = rows[:compacted]
+        counters = HotnessCounters().load_counts(self._get_hotness_count_records())
+        # Rows at or below the old watermark are left over from a compaction that stopped
+        # before deleting them, they are counted already
+        counters.load(vote for vote in decode_votes([header] + old_rows) if vote[1] > counters.compacted_through)
+        counters.compacted_through = max(counters.compacted_through, watermark[compacted])
+        
+        archive_sheet = self._get_or_create_worksheet(HOTNESS_ARCHIVE_SHEET, header)
+        archive_sheet.append_rows(old_rows)
+        
+        if not self.hotness_counts_sheet:
+            self.hotness_counts_sheet = self._get_or_create_worksheet(HOTNESS_COUNTS_SHEET, COUNTS_HEADERS)
+        values = [COUNTS_HEADERS] + counters.counts_rows()
+        # Worksheets are created with 1000 rows: grow for more tools, trim rows left from before
+        self.hotness_counts_sheet.resize(rows=len(values), cols=len(COUNTS_HEADERS))
+        self.hotness_counts_sheet.update(values=values, range_name='A1')
+        counts_rows = values[1:]
+        
+        # Rows are only ever appended, so votes cast meanwhile sit below this block
+        self.hotness_sheet.delete_rows(2, compacted + 1)
+        
+        print(f"🗜️ Compacted {compacted} votes into {len(counts_rows)} tool rows, {len(rows) - compacted} recent votes left")
+        return compacted
+    
+    def migrate_hotness_votes(self):
+        """Rewrite the Hotness log in the compact vote encoding, keeping a backup of the legacy sheet
+        
+        Safe to run again: legacy rows appended by processes that hadn't picked up the
+        compact header yet are converted on the next run. Returns the number of votes migrated.
+        """
+        if not self.hotness_sheet:
+            print("❌ No hotness sheet available")
+            return 0
+        
+        values = self.hotness_sheet.get_all_values()
+        legacy_header = bool(values) and values[0][:1] == LEGACY_VOTE_HEADERS[:1]
+        legacy_rows = sum(1 for row in values[1:] if legacy_header or (len(row) > 3 and row[3]))
+        if not legacy_rows:
+            print("✅ Hotness log already uses the compact vote encoding")
+            return 0
+        
+        if legacy_header:
+            self.hotness_sheet.duplicate(new_sheet_name=HOTNESS_LEGACY_SHEET)
+            print(f"💾 Backed up the legacy Hotness log to {HOTNESS_LEGACY_SHEET}")
+        
+        migrated = [VOTE_HEADERS] + [
+            [tool_id, f"{voter:08x}", int(voted_at)] for tool_id, voted_at, voter in decode_votes(values)
+        ]
+        
+        # Drop User_Agent/Session_ID first so no reader sees compact cells next to them;
+        # votes appended meanwhile sit below the rewritten block and are kept
+        self.hotness_sheet.resize(cols=len(VOTE_HEADERS))
+        self.hotness_sheet.update(values=migrated, range_name='A1')
+        if len(values) > len(migrated):
+            self.hotness_sheet.delete_rows(len(migrated) + 1, len(values))
+        self._legacy_votes = False
+        
+        print(f"✅ Migrated {legacy_rows} legacy votes to the compact encoding")
+        return legacy_rows
+    
+    def import_tools(self, df, dry_run=False):
+        """Append new tools to the tools sheet in one append_rows call
+        
+        df has one tool per row, columns named like the sheet header. Rows are checked the way
+        _clean_data would read them back (Title and Summary set, a parseable Date_Added, empty
+        means today) plus an http(s) Source_URL; titles already in the sheet or repeated in df
+        are dropped by tool ID. Returns {'added': [titles], 'rejected': [(row, title, reason)]}
+        with rows numbered from 1 as in the import file.
+        """
+        report = {'added': [], 'rejected': []}
+        if not self.sheet:
+            print("❌ No sheet connection")
+            return report
+        
+        columns = self._get_column_numbers(refresh=True)
+        missing = [col for col in CONTENT_COLUMNS if col not in columns]
+        if missing:
+            raise ValueError(f"Tools sheet header has no column for {', '.join(missing)}")
+        ignored = [col for col in df.columns if col not in columns]
+        if ignored:
+            print(f"⚠️ Ignoring columns the tools sheet doesn't have: {', '.join(map(str, ignored))}")
+        
+        # One column read to dedupe against every title already in the sheet
+        titles = get_sheets_breaker().call(self._fetch_columns, ['Title']).get('Title', [])
+        existing = {tool_key(title) for title in titles if str(title).strip()}
+        seen = {}
+        
+        df = df.fillna('').astype(str)
+        today = datetime.now().strftime('%Y-%m-%d')
+        rows = []
+        for number, record in enumerate(df.to_dict('records'), start=1):
+            record = {col: value.strip() for col, value in record.items() if col in columns}
+            title = record.get('Title', '')
+            key = tool_key(title)
+            date_added = pd.to_datetime(record.get('Date_Added') or today, errors='coerce')
+            
+            if not title or title == 'nan':
+                reason = "missing Title"
+            elif not record.get('Summary') or record['Summary'] == 'nan':
+                reason = "missing Summary"
+            elif pd.isna(date_added):
+                reason = f"invalid Date_Added '{record['Date_Added']}'"
+            elif record.get('Source_URL') and not record['Source_URL'].startswith(('http://', 'https://')):
+                reason = "Source_URL is not an http(s) link"
+            elif key in existing:
+                reason = "already in the catalog"
+            elif key in seen:
+                reason = f"same title as row {seen[key]}"
+            else:
+                reason = None
+            
+            if reason:
+                report['rejected'].append((number, title, reason))
+                continue
+            
+            seen[key] = number
+            record['Date_Added'] = date_added.strftime('%Y-%m-%d')
+            row = [''] * max(columns.values())
+            for col, value in record.items():
+                row[columns[col] - 1] = value
+            rows.append(row)
+            report['added'].append(title)
+        
+        if rows and not dry_run:
+            get_sheets_breaker().call(self.sheet.append_rows, rows, value_input_option='USER_ENTERED')
+        
+        print(f"{'🧪 Dry run: would add' if dry_run else '✅ Added'} {len(rows)} tools, "
+              f"rejected {len(report['rejected'])} of {len(df)} rows")
+        return report
     
     def fetch_news_data_with_hotness(self, force_refresh=False):
-        """Fetch news data from Google Sheets with hotness counts"""
+        """Fetch news data with hotness counts from the shared catalog snapshot"""
         # Use session state to track force refresh
         if hasattr(st.session_state, 'force_refresh') and st.session_state.force_refresh:
             force_refresh = True
             st.session_state.force_refresh = False  # Reset the flag
         
-        if force_refresh:
-            # Skip cache and fetch fresh data
-            return self._fetch_fresh_data_with_hotness()
-        else:
-            # Use cached version
-            return self._fetch_cached_data_with_hotness()
+        snapshot = self.get_catalog_snapshot(force_refresh=force_refresh)
+        return snapshot.frame if snapshot is not None else pd.DataFrame()
     
-    @st.cache_data(ttl=CACHE_DURATION*3600, show_spinner=False)  # Cache for specified hours
-    def _fetch_cached_data_with_hotness(_self):
-        """Cached version of data fetching with hotness"""
-        return _self._fetch_fresh_data_with_hotness()
+    def get_catalog_snapshot(self, force_refresh=False):
+        """Current shared snapshot; stale data is served while a background refresh runs"""
+        store = get_snapshot_store()
+        shared = get_shared_cache()
+        if shared is not None:
+            shared.sync()  # Catalogs, hotness and votes other replicas published since the last poll
+        snapshot = store.current()
+        
+        if force_refresh or snapshot is None:
+            # Nothing to serve yet (or a refresh was asked for), so wait for the fetch
+            store.begin_refresh()
+            try:
+                if not force_refresh and shared is not None:
+                    shared.adopt_fresh_catalog(CACHE_DURATION * 3600)
+                if not force_refresh and store.current() is not None:
+                    return store.current()  # Another session (or replica) just finished refreshing
+                return self.refresh_snapshot()
+            finally:
+                store.end_refresh()
+        
+        if get_sheets_breaker().is_open():
+            pass  # Sheets is down: keep serving, the breaker's probe detects recovery
+        elif snapshot.source != "sheets" or snapshot.age() > CACHE_DURATION * 3600:
+            self._refresh_in_background(self.refresh_snapshot, lease=("catalog", CACHE_DURATION * 3600))
+        elif snapshot.hotness_age() > HOTNESS_CACHE_DURATION * 60:
+            self._refresh_in_background(self.refresh_hotness, lease=("hotness", HOTNESS_CACHE_DURATION * 60))
+        
+        return snapshot
     
-    @st.cache_data(ttl=300, show_spinner=False)  # Cache hotness for 5 minutes
-    def _get_cached_hotness_counts(_self):
-        """Cached version of hotness counts to reduce API calls"""
-        return _self.get_hotness_counts()
+    def _refresh_in_background(self, refresh, lease=None):
+        """Run refresh on a background thread unless another refresh is already running
+        
+        lease is (name, seconds): with a shared cache only the replica holding it refreshes
+        """
+        store = get_snapshot_store()
+        if not store.try_begin_refresh():
+            return
+        
+        shared = get_shared_cache()
+        if lease and shared is not None and not shared.try_lease(*lease):
+            store.end_refresh()  # Another replica refreshes, its result arrives with a later sync
+            return
+        
+        def run():
+            try:
+                refresh()
+            finally:
+                store.end_refresh()
+        
+        threading.Thread(target=run, name="catalog-refresh", daemon=True).start()
+    
+    def refresh_snapshot(self):
+        """Fetch tools + hotness from Google Sheets and publish them as the shared snapshot"""
+        store = get_snapshot_store()
+        snapshot = self._fetch_fresh_data_with_hotness()
+        
+        # Don't replace a catalog we can still serve with an empty one or the cache file
+        if (snapshot.empty or snapshot.source != "sheets") and store.current() is not None:
+            return store.current()
+        
+        # Link statuses come from the link health cache, new and expired links are checked below
+        store.publish(with_link_status(snapshot))
+        
+        shared = get_shared_cache()
+        if shared is not None and snapshot.source == "sheets" and not snapshot.empty:
+            shared.publish_catalog(snapshot)
+            shared.publish_hotness(get_hotness_counters(), snapshot.hotness_at)
+        
+        # Detail fields load per tile as they are shown or flipped (search indexes them as they arrive)
+        get_detail_cache().reset_for(snapshot.content_version)
+        start_link_check()
+        
+        return store.current()
+    
+    def refresh_hotness(self):
+        """Re-read the Hotness log and publish its overlay on top of the current catalog"""
+        previous = get_hotness_counters()
+        counters = set_hotness_counters(self.load_hotness_counters())
+        shared = get_shared_cache()
+        if shared is not None and counters is not previous:
+            shared.publish_hotness(counters)
+        return get_snapshot_store().update(lambda snapshot: snapshot.with_hotness(counters))
     
     def _fetch_fresh_data_with_hotness(self):
-        """Fetch fresh data from Google Sheets with hotness counts"""
+        """Fetch fresh data from Google Sheets with hotness counts as a new snapshot"""
+        df = None
         try:
-            # Get base news data
-            df = self._fetch_fresh_data()
+            # Tools and Hotness worksheets are independent, fetch them in parallel
+            started = time.monotonic()
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix="sheets-fetch") as pool:
+                tools_future = pool.submit(self._fetch_fresh_data)
+                hotness_future = pool.submit(self.load_hotness_counters)
+                df = tools_future.result()
+                counters = set_hotness_counters(hotness_future.result())
+            print(f"⏱️ Fetched tools and hotness in {time.monotonic() - started:.2f}s")
             
+            source = "disk" if self.last_fetch_from_cache else "sheets"
             if df.empty:
-                return df
+                return CatalogSnapshot(df, dataset_version(df), source=source)
             
-            # Get cached hotness counts to reduce API calls
-            hotness_counts = self._get_cached_hotness_counts()
+            # Add hotness counts on top of the catalog
+            snapshot = CatalogSnapshot(df, dataset_version(df), source=source, copy=False).with_hotness(counters)
             
-            # Add hotness counts to dataframe
-            df['hotness_count'] = df['Title'].map(lambda title: hotness_counts.get(title, 0))
+            # Keep the on-disk snapshot complete so a cold start can serve it with hotness
+            if source == "sheets":
+                self._save_to_cache(snapshot.frame)
             
-            print(f"✅ Added hotness data to {len(df)} tools")
-            return df
+            report = memory_report(snapshot.frame)
+            print(f"✅ Added hotness data to {len(snapshot)} tools")
+            print(f"🧠 Catalog {report['version']}: {report['total_bytes'] / 1024:.1f} KiB "
+                  f"({report['bytes_per_tool']} bytes/tool)")
+            return snapshot
             
         except Exception as e:
             print(f"❌ Error fetching data with hotness: {e}")
             # Fallback to data without hotness
-            base_df = self._fetch_fresh_data()
-            if not base_df.empty:
-                base_df['hotness_count'] = 0
-            return base_df
+            base_df = df if df is not None else self._fetch_fresh_data()
+            source = "disk" if self.last_fetch_from_cache else "sheets"
+            return CatalogSnapshot(base_df, dataset_version(base_df), source=source, copy=False).with_hotness(HotnessCounters())
     
     def fetch_news_data(self, force_refresh=False):
-        """Fetch news data from Google Sheets with caching"""
-        # Use session state to track force refresh
-        if hasattr(st.session_state, 'force_refresh') and st.session_state.force_refresh:
-            force_refresh = True
-            st.session_state.force_refresh = False  # Reset the flag
-        
-        if force_refresh:
-            # Skip cache and fetch fresh data
-            return self._fetch_fresh_data()
-        else:
-            # Use cached version
-            return self._fetch_cached_data()
-    
-    @st.cache_data(ttl=CACHE_DURATION*3600)  # Cache for specified hours
-    def _fetch_cached_data(_self):
-        """Cached version of data fetching"""
-        return _self._fetch_fresh_data()
+        """Fetch news data from the shared catalog snapshot"""
+        return self.fetch_news_data_with_hotness(force_refresh=force_refresh)
     
     def _fetch_fresh_data(self):
         """Fetch fresh data from Google Sheets without caching"""
+        self.last_fetch_from_cache = False
         try:
             if not self.sheet:
                 print("❌ No sheet connection")
                 return pd.DataFrame()
                 
-            # Get all records from the sheet
-            print("📥 Fetching records from Google Sheets...")
-            records = self.sheet.get_all_records()
-            print(f"📊 Retrieved {len(records)} records from Google Sheets")
+            # Get only the list-view columns; detail columns load on demand
+            print("📥 Fetching list columns from Google Sheets...")
+            df = get_sheets_breaker().call(self._fetch_list_columns)
+            print(f"📊 Retrieved {len(df)} records from Google Sheets")
             
-            if not records:
+            if df.empty:
                 print("⚠️ No records found in sheet")
                 return pd.DataFrame()
-                
-            df = pd.DataFrame(records)
+            
             print(f"📈 Created DataFrame with {len(df)} rows and {len(df.columns)} columns")
             print(f"🔤 Columns: {list(df.columns)}")
             
-            # Clean and validate data
+            # Clean and validate data (the caller saves the snapshot with hotness to the local cache)
             df = self._clean_data(df)
             
-            # Save to local cache
-            self._save_to_cache(df)
-            
             print(f"✅ Returning {len(df)} cleaned records")
             return df
+        
+        except CircuitOpenError as e:
+            # Fail fast while Sheets is down, no error toast on every rerun
+            print(f"🔌 {e}, serving the local cache")
+            self.last_fetch_from_cache = True
+            return self._load_from_cache()
             
         except Exception as e:
             print(f"❌ Error in _fetch_fresh_data: {str(e)}")
             st.error(f"Error fetching data from Google Sheets: {str(e)}")
             # Try to load from local cache as fallback
+            self.last_fetch_from_cache = True
             return self._load_from_cache()
     
+    def _get_column_numbers(self, refresh=False):
+        """Header name -> column number of the tools sheet"""
+        if self._column_numbers is None or refresh:
+            header = self.sheet.row_values(1)
+            self._column_numbers = {name: i + 1 for i, name in enumerate(header) if name}
+        return self._column_numbers
+    
+    def _column_letter(self, column):
+        """A1 column letter of a named column, e.g. 'Integration_Steps' -> 'F'"""
+        return rowcol_to_a1(1, self._get_column_numbers()[column])[:-1]
+    
+    def _fetch_columns(self, columns):
+        """Fetch whole columns (below the header) in a single batch_get call"""
+        columns = [col for col in columns if col in self._get_column_numbers()]
+        if not columns:
+            return {}
+        
+        ranges = [f"{self._column_letter(col)}2:{self._column_letter(col)}" for col in columns]
+        value_ranges = self.sheet.batch_get(ranges, major_dimension='COLUMNS')
+        return {col: list(value_range[0]) if value_range else [] for col, value_range in zip(columns, value_ranges)}
+    
+    def _fetch_list_columns(self):
+        """Columnar fetch of the list-view columns only, without one dict per row"""
+        self._get_column_numbers(refresh=True)
+        values = self._fetch_columns(LIST_COLUMNS)
+        
+        # Trailing empty cells are trimmed per column, pad them back
+        row_count = max((len(column) for column in values.values()), default=0)
+        df = pd.DataFrame({col: column + [''] * (row_count - len(column)) for col, column in values.items()})
+        
+        # The row the tool lives in on the tools sheet (row 1 is the header), for detail fetches
+        df['sheet_row'] = np.arange(2, row_count + 2, dtype=np.int32)
+        return df
+    
+    def get_tool_details(self, sheet_rows):
+        """Detail fields (Integration_Steps) for {tool_id: sheet_row}, fetched on demand and cached by tool ID"""
+        cache = get_detail_cache()
+        found, missing = cache.get_many(list(sheet_rows))
+        
+        if missing and self.sheet:
+            try:
+                fetched = get_sheets_breaker().call(self._fetch_details, {tool_id: sheet_rows[tool_id] for tool_id in missing})
+                cache.put_many(fetched)
+                found.update(fetched)
+                print(f"📥 Loaded details for {len(fetched)} tools")
+                
+            except Exception as e:
+                print(f"❌ Error loading tool details: {e}")
+        
+        return found
+    
+    def _fetch_details(self, sheet_rows):
+        """Detail fields for {tool_id: sheet_row} in one batch_get of single cells
+        
+        Each row's Title comes along: rows move when tools are inserted or the sheet is sorted, so a
+        row that no longer holds the tool is skipped rather than cached under the wrong tool.
+        """
+        columns = ['Title'] + [col for col in DETAIL_COLUMNS if col in self._get_column_numbers()]
+        ranges = [f"{self._column_letter(col)}{row}" for row in sheet_rows.values() for col in columns]
+        value_ranges = iter(self.sheet.batch_get(ranges))
+        
+        fetched = {}
+        for tool_id in sheet_rows:
+            details = {}
+            for col in columns:
+                value_range = next(value_ranges)
+                details[col] = value_range[0][0] if value_range and value_range[0] else ''
+            if tool_key(details.pop('Title')) == tool_id:
+                fetched[tool_id] = details
+        moved = len(sheet_rows) - len(fetched)
+        if moved:
+            print(f"⚠️ Skipped details of {moved} tools whose sheet rows moved since the last refresh")
+        return fetched
+    
+    def prefetch_tool_details(self, sheet_rows):
+        """Start loading detail fields for {tool_id: sheet_row} in the background (returns at once)"""
+        cache = get_detail_cache()
+        if not self.sheet or get_sheets_breaker().is_open():
+            return
+        
+        _, missing = cache.get_many(list(sheet_rows))
+        
+        def run():
+            try:
+                self.get_tool_details({tool_id: sheet_rows[tool_id] for tool_id in missing})
+            finally:
+                with _prefetching_lock:
+                    for tool_id in missing:
+                        _prefetching.pop(tool_id, None)
+        
+        with _prefetching_lock:
+            missing = [tool_id for tool_id in missing if tool_id not in _prefetching]
+            if not missing:
+                return
+            future = _page_prefetch.submit(run)
+            _prefetching.update(dict.fromkeys(missing, future))
+    
+    def wait_for_tool_details(self, sheet_rows, timeout=SHEETS_TIMEOUT):
+        """get_tool_details, but first waiting for a prefetch already loading any of these tools
+        instead of fetching them a second time"""
+        with _prefetching_lock:
+            pending = {_prefetching[tool_id] for tool_id in sheet_rows if tool_id in _prefetching}
+        if pending:
+            wait(pending, timeout=timeout)
+        return self.get_tool_details(sheet_rows)
+    
+    def load_all_details(self, df):
+        """Detail columns for the whole catalog df in one batch_get call, for jobs that need every
+        tool's details (static export); the app only loads the tiles it shows"""
+        if not self.sheet:
+            return {}
+        
+        values = get_sheets_breaker().call(self._fetch_columns, ['Title'] + DETAIL_COLUMNS)
+        titles = values.pop('Title', [])
+        details = {
+            tool_id: {col: column[row - 2] if row - 2 < len(column) else '' for col, column in values.items()}
+            for tool_id, row in zip(df['tool_id'].tolist(), df['sheet_row'].tolist())
+            # Skip rows that no longer hold the tool (see _fetch_details)
+            if row - 2 < len(titles) and tool_key(titles[row - 2]) == tool_id
+        }
+        get_detail_cache().put_many(details)
+        print(f"📥 Loaded details for {len(details)} tools")
+        return details
+    
     def _clean_data(self, df):
         """Clean and validate the data"""
         print(f"🧹 Cleaning data: {len(df)} rows before cleaning")
         
         # Ensure required columns exist
-        required_columns = ['Title', 'Summary', 'Source_URL', 'Author/Company', 'Domain', 'Integration_Steps', 'Date_Added']
-        
-        for col in required_columns:
+        for col in CONTENT_COLUMNS:
             if col not in df.columns:
+                if col in DETAIL_COLUMNS:
+                    continue  # Loaded lazily, see get_tool_details
                 df[col] = ''
                 print(f"⚠️ Missing column '{col}' - added empty column")
         
-        # Debug: print before filtering
-        print("📊 Data before filtering:")
-        for i, row in df.iterrows():
-            title = str(row.get('Title', '')).strip()
-            summary = str(row.get('Summary', '')).strip()
-            print(f"  Row {i+1}: Title='{title}' ({len(title)} chars), Summary='{summary}' ({len(summary)} chars)")
+        # The row the tool lives in on the tools sheet (row 1 is the header)
+        if 'sheet_row' not in df.columns:
+            df['sheet_row'] = np.arange(2, len(df) + 2, dtype=np.int32)
         
         # Filter out rows with empty titles or summaries (but be more lenient)
         df_filtered = df[
@@ -387,6 +929,13 @@ class DataManager:
         
         print(f"🔍 After filtering empty titles/summaries: {len(df_filtered)} rows")
         
+        # Stable integer tool ID from the title; a repeated title is the same tool, keep its first row
+        df_filtered = assign_tool_ids(df_filtered)
+        duplicates = df_filtered['tool_id'].duplicated()
+        if duplicates.any():
+            print(f"⚠️ Dropping {int(duplicates.sum())} rows with a duplicate title")
+            df_filtered = df_filtered[~duplicates]
+        
         # Convert date format and handle errors gracefully
         print("📅 Processing dates...")
         df_filtered['Date_Added'] = pd.to_datetime(df_filtered['Date_Added'], errors='coerce')
@@ -400,13 +949,16 @@ class DataManager:
         # Sort by date (newest first)
         df_filtered = df_filtered.sort_values('Date_Added', ascending=False)
         
+        # Compact typed schema keeps the cached copy small
+        df_filtered = compact_catalog(df_filtered)
+        
         print(f"✅ Final cleaned data: {len(df_filtered)} rows")
         return df_filtered
     
     def _save_to_cache(self, df):
         """Save data to local cache"""
         try:
-            os.makedirs('cache', exist_ok=True)
+            os.makedirs(os.path.dirname(NEWS_CACHE_PATH) or '.', exist_ok=True)
             df.to_csv(NEWS_CACHE_PATH, index=False)
         except Exception as e:
             st.warning(f"Could not save to cache: {str(e)}")
@@ -415,9 +967,7 @@ class DataManager:
         """Load data from local cache as fallback"""
         try:
             if os.path.exists(NEWS_CACHE_PATH):
-                df = pd.read_csv(NEWS_CACHE_PATH)
-                df['Date_Added'] = pd.to_datetime(df['Date_Added'], errors='coerce')
-                return df
+                return read_catalog_csv(NEWS_CACHE_PATH)
             else:
                 return pd.DataFrame()
         except Exception as e:
@@ -454,10 +1004,11 @@ class DataManager:
         
         return df
     
-    def get_unique_domains(self):
-        """Get unique domains from the data"""
+    def get_unique_domains(self, df=None):
+        """Get unique domains from the data (pass an already loaded frame to skip the fetch)"""
         try:
-            df = self._fetch_fresh_data()
+            if df is None:
+                df = self._fetch_fresh_data()
             if df.empty:
                 return ["All", "Analytics"]
             
@@ -481,17 +1032,18 @@ class DataManager:
             print(f"Error getting unique domains: {e}")
             return ["All", "Analytics"]
     
-    def save_user_email(self, name, email, linkedin=""):
+    def save_user_email(self, name, email, linkedin="", topics=()):
         """Save user email to CSV file"""
         try:
-            os.makedirs('cache', exist_ok=True)
+            os.makedirs(os.path.dirname(USERS_CSV_PATH) or '.', exist_ok=True)
             
             # Create user data
             user_data = {
                 'Name': name,
                 'Email': email,
                 'LinkedIn': linkedin,
-                'Signup_Date': datetime.now().strftime('%m/%d/%Y %H:%M:%S')
+                'Signup_Date': datetime.now().strftime('%m/%d/%Y %H:%M:%S'),
+                'Topics': TOPICS_SEPARATOR.join(topics)
             }
             
             # Check if file exists
@@ -513,29 +1065,80 @@ class DataManager:
         except Exception as e:
             return False, f"Error saving user data: {str(e)}"
     
-    def save_user_email_to_gsheet(self,name, email, linkedin=""):
+    def save_user_email_to_gsheet(self,name, email, linkedin="", topics=()):
+        # Prepare row
+        signup_time = datetime.now().strftime('%m/%d/%Y %H:%M:%S')
+        topics = TOPICS_SEPARATOR.join(topics)
+        breaker = get_sheets_breaker()
         try:
-            # Setup credentials from Streamlit secrets
-            scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-            creds = Credentials.from_service_account_info(st.secrets["google_credentials"], scopes=scope)
-            client = gspread.authorize(creds)
+            return breaker.call(self._append_signup, name, email, linkedin, signup_time, topics)
+        
+        except (CircuitOpenError,) + breaker.failure_types as e:
+            if not breaker.is_retryable(e):
+                return False, f"Error saving to Google Sheet: {str(e)}"
+            # Sheets is down: keep the signup and write it once the sheet is reachable again
+            if not breaker.enqueue(f"signup for {email}", self._append_signup, name, email, linkedin, signup_time, topics):
+                return False, "Google Sheets is unavailable right now, please try again later."
+            return True, "Thanks! Your signup is saved and will sync shortly."
 
-            # Open the sheet by URL or name
-            sheet = client.open_by_url(st.secrets["GOOGLE_SHEET_URL"])
-            worksheet = sheet.worksheet("Signups")  # Make sure this tab exists
+        except Exception as e:
+            return False, f"Error saving to Google Sheet: {str(e)}"
+    
+    def _append_signup(self, name, email, linkedin, signup_time, topics=""):
+        """Append a signup row to the Signups sheet unless the email is already there"""
+        # Setup credentials from Streamlit secrets
+        scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
+        creds = Credentials.from_service_account_info(st.secrets["google_credentials"], scopes=scope)
+        client = gspread.authorize(creds)
 
-            # Get all existing emails to prevent duplicate signup
-            emails = worksheet.col_values(2)  # Assuming Email is column B
-            if email in emails:
-                return False, "Email already registered!"
+        # Open the sheet by URL or name
+        sheet = client.open_by_url(st.secrets["GOOGLE_SHEET_URL"])
+        worksheet = sheet.worksheet("Signups")  # Make sure this tab exists
 
-            # Prepare row
-            signup_time = datetime.now().strftime('%m/%d/%Y %H:%M:%S')
-            row = [name, email, linkedin, signup_time]
+        # Get all existing emails to prevent duplicate signup
+        emails = worksheet.col_values(2)  # Assuming Email is column B
+        if email in emails:
+            return False, "Email already registered!"
 
-            # Append to the bottom of the sheet
-            worksheet.append_row(row)
-            return True, "Successfully registered for updates!"
+        row = [name, email, linkedin, signup_time, topics]
 
-        except Exception as e:
-            return False, f"Error saving to Google Sheet: {str(e)}"
\ No newline at end of file
+        # Append to the bottom of the sheet
+        worksheet.append_row(row)
+        return True, "Successfully registered for updates!"
+    
+    def iter_subscribers(self, chunk_size=1000):
+        """(name, email, topics) for every signup, Signups worksheet first and then users.csv
+        
+        The worksheet is read in one call and users.csv streamed in chunks; every email is
+        yielded once, rows without a usable address are skipped.
+        """
+        seen = set()
+        
+        def subscriber(name, email, topics):
+            email = str(email).strip()
+            if '@' not in email or email.lower() in seen or any(c in email for c in '\r\n<>,; '):
+                return None
+            seen.add(email.lower())
+            return str(name).strip(), email, tuple(t.strip() for t in str(topics).split(TOPICS_SEPARATOR.strip()) if t.strip())
+        
+        if self.sheet:
+            try:
+                values = get_sheets_breaker().call(self._read_signups)
+            except Exception as e:
+                print(f"⚠️ Could not read the Signups sheet: {e}")
+                values = []
+            # Name, Email, LinkedIn, Signup_Date[, Topics]; a header row has no address and is skipped
+            for row in values:
+                found = subscriber(row[0] if row else '', row[1] if len(row) > 1 else '', row[4] if len(row) > 4 else '')
+                if found:
+                    yield found
+        
+        if os.path.exists(USERS_CSV_PATH):
+            for chunk in pd.read_csv(USERS_CSV_PATH, dtype=str, keep_default_na=False, chunksize=chunk_size):
+                for record in chunk.to_dict('records'):
+                    found = subscriber(record.get('Name', ''), record.get('Email', ''), record.get('Topics', ''))
+                    if found:
+                        yield found
+    
+    def _read_signups(self):
+        return self.sheet.spreadsheet.worksheet("Signups").get_all_values()
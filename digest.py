@@ -0,0 +1,207 @@
+"""
+Digest emails for aINeedToKnow - the top tools of the ranked snapshot, rendered once per
+topic segment and sent to every subscriber over a pool of SMTP connections
+
+Usage: python maintenance.py send-digest [--dry-run] [--concurrency 8]
+"""
+import asyncio
+import html
+import random
+import smtplib
+import time
+from concurrent.futures import ThreadPoolExecutor
+from email import policy
+from email.message import EmailMessage
+from email.utils import formatdate
+from config import *
+from api import CatalogViews, tool_record
+
+ALL_TOPICS = ("All",)
+
+
+class DigestBuilder:
+    """Digest messages for one snapshot, rendered once per segment (the set of topics a
+    subscriber picked) and reused for every subscriber in it"""
+
+    def __init__(self, snapshot, tools=DIGEST_TOOLS, sender=DIGEST_FROM):
+        self.views = CatalogViews(snapshot)
+        self.tools = tools
+        self.sender = sender
+        self._segments = {}
+
+    def segment(self, topics):
+        """Segment key for a subscriber's topics (unknown topics dropped, none means all)"""
+        known = sorted(set(topics) & self.views.facets.domains.keys())
+        return tuple(known) or ALL_TOPICS
+
+    def message(self, subscriber):
+        """(recipient, message bytes) for a (name, email, topics) subscriber"""
+        _, email, topics = subscriber
+        if not email.isascii():
+            return None  # Would need SMTPUTF8, which the digest doesn't negotiate
+        segment = self.segment(topics)
+        payload = self._segments.get(segment)
+        if payload is None:
+            payload = self._segments[segment] = self._render(segment)
+        # Only the To header differs between the subscribers of a segment
+        return email, f"To: {email}\r\n".encode('ascii') + payload
+
+    @property
+    def segments(self):
+        return len(self._segments)
+
+    def _render(self, segment):
+        positions = self.views.ranked
+        if segment != ALL_TOPICS:
+            mask = self.views.facets.domain_bitmap(list(segment))
+            positions = positions[mask[positions]]
+        records = [tool_record(row) for row in self.views.frame.iloc[positions[:self.tools]].to_dict('records')]
+        topics = "all topics" if segment == ALL_TOPICS else ", ".join(segment)
+
+        message = EmailMessage(policy=policy.SMTP)
+        message['From'] = f"{APP_TITLE} <{self.sender}>"
+        message['Subject'] = f"{APP_TITLE}: {len(records)} AI tools worth knowing this week ({topics})"
+        message['Date'] = formatdate(localtime=True)
+        message['List-Unsubscribe'] = f"<mailto:{ADMIN_EMAIL}?subject=unsubscribe>"
+        message.set_content(self._text(records, topics))
+        message.add_alternative(self._html(records, topics), subtype='html')
+        return message.as_bytes()
+
+    def _text(self, records, topics):
+        lines = [f"{APP_TITLE} - {APP_TAGLINE}", f"The hottest AI tools for {topics}:", ""]
+        for number, record in enumerate(records, start=1):
+            lines.append(f"{number}. {record['title']} ({record['domain']}, 🔥 {record['hotness']['week']} this week)")
+            lines.append(f"   {record['summary']}")
+            if record['source_url']:
+                lines.append(f"   {record['source_url']}")
+            lines.append("")
+        lines.append(f"To unsubscribe, reply to {ADMIN_EMAIL} with \"unsubscribe\".")
+        return "\n".join(lines)
+
+    def _html(self, records, topics):
+        tiles = []
+        for record in records:
+            visit = (f' • <a href="{html.escape(record["source_url"])}">🔗 Visit Tool</a>'
+                     if record['source_url'] else '')
+            tiles.append(f"""<div style="border: 1px solid #e2e8f0; border-radius: 8px; padding: 12px; margin-bottom: 12px">
+    <div style="font-size: 18px; font-weight: 700">🤖 {html.escape(record['title'])}</div>
+    <div style="color: {DOMAIN_COLORS.get(record['domain'], '#667eea')}; margin: 6px 0">{html.escape(record['summary'])}</div>
+    <div style="color: #718096; font-size: 13px">{html.escape(record['domain'])} • {html.escape(record['author'])} •
+        🔥 {record['hotness']['week']} this week{visit}</div>
+</div>""")
+        return f"""<!DOCTYPE html>
+<html><body style="font-family: sans-serif; max-width: 640px; margin: 0 auto">
+<h1>{html.escape(APP_TITLE)}</h1>
+<p style="color: #718096">{html.escape(APP_TAGLINE)}</p>
+<h2>🔥 The hottest AI tools for {html.escape(topics)}</h2>
+{''.join(tiles)}
+<p style="color: #a0aec0; font-size: 12px">To unsubscribe, reply to
+<a href="mailto:{ADMIN_EMAIL}?subject=unsubscribe">{ADMIN_EMAIL}</a> with "unsubscribe".</p>
+</body></html>
+"""
+
+
+class DigestSender:
+    """Sends (recipient, message bytes) pairs over `concurrency` reused SMTP connections
+
+    smtplib blocks, so the connections' commands run on a thread pool (one thread per
+    connection) driven from an asyncio loop, which streams messages in and bounds how
+    many are in flight. Temporary failures (4xx replies, dropped connections) are retried
+    with jittered exponential backoff, permanent ones (5xx) are reported and skipped.
+    """
+
+    def __init__(self, host=SMTP_HOST, port=SMTP_PORT, concurrency=DIGEST_CONCURRENCY, retries=DIGEST_RETRIES,
+                 sender=DIGEST_FROM, username=SMTP_USERNAME, password=SMTP_PASSWORD, starttls=SMTP_STARTTLS,
+                 timeout=SMTP_TIMEOUT, backoff=1.0):
+        self.host = host
+        self.port = port
+        self.concurrency = concurrency
+        self.retries = retries
+        self.sender = sender
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.timeout = timeout
+        self.backoff = backoff
+        self.stats = {}
+
+    def send_all(self, messages):
+        """Send every message from the iterable, return sent/failed/retried counts and messages per second"""
+        self.stats = {'sent': 0, 'failed': [], 'retried': 0}
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="smtp") as pool:
+            asyncio.run(self._send_all(messages, pool))
+        self.stats['seconds'] = round(time.monotonic() - started, 2)
+        self.stats['per_second'] = round(self.stats['sent'] / max(time.monotonic() - started, 1e-6), 1)
+        print(f"📧 Sent {self.stats['sent']} digests in {self.stats['seconds']}s ({self.stats['per_second']} msgs/s), "
+              f"{len(self.stats['failed'])} failed, {self.stats['retried']} retries")
+        return self.stats
+
+    async def _send_all(self, messages, pool):
+        queue = asyncio.Queue(maxsize=self.concurrency * 4)
+        workers = [asyncio.create_task(self._worker(queue, pool)) for _ in range(self.concurrency)]
+        for message in messages:
+            if message is not None:
+                await queue.put(message)
+        for _ in workers:
+            await queue.put(None)
+        await asyncio.gather(*workers)
+
+    async def _worker(self, queue, pool):
+        loop = asyncio.get_running_loop()
+        connection = None
+        try:
+            while (message := await queue.get()) is not None:
+                recipient, payload = message
+                for attempt in range(self.retries + 1):
+                    try:
+                        if connection is None:
+                            connection = await loop.run_in_executor(pool, self._connect)
+                        await loop.run_in_executor(pool, connection.sendmail, self.sender, [recipient], payload)
+                        self.stats['sent'] += 1
+                        break
+                    except smtplib.SMTPRecipientsRefused as e:
+                        code, error = next(iter(e.recipients.values()))
+                    except smtplib.SMTPResponseException as e:
+                        code, error = e.smtp_code, e.smtp_error
+                    except (smtplib.SMTPException, OSError) as e:
+                        code, error = None, e
+                        connection = self._close(connection)  # Reconnect on the next attempt
+
+                    if (code is not None and code >= 500) or attempt == self.retries:
+                        self.stats['failed'].append((recipient, f"{code or ''} {error!r}".strip()))
+                        break
+                    self.stats['retried'] += 1
+                    await asyncio.sleep(self.backoff * 2 ** attempt * random.uniform(0.5, 1.0))
+        finally:
+            self._close(connection)
+
+    def _connect(self):
+        connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.starttls:
+            connection.starttls()
+        if self.username:
+            connection.login(self.username, self.password)
+        return connection
+
+    def _close(self, connection):
+        if connection is not None:
+            try:
+                connection.quit()
+            except (smtplib.SMTPException, OSError):
+                connection.close()
+        return None
+
+
+def send_digest(data_manager, snapshot, dry_run=False, **sender_options):
+    """Render the digest per segment and send it to every subscriber (dry_run only counts them)"""
+    builder = DigestBuilder(snapshot)
+    messages = (builder.message(subscriber) for subscriber in data_manager.iter_subscribers())
+    if dry_run:
+        count = sum(1 for message in messages if message is not None)
+        print(f"🧪 Dry run: {count} subscribers in {builder.segments} segments, nothing sent")
+        return {'sent': 0, 'subscribers': count, 'segments': builder.segments}
+
+    stats = DigestSender(**sender_options).send_all(messages)
+    stats['segments'] = builder.segments
+    return stats
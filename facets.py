@@ -0,0 +1,90 @@
+"""
+Faceted filtering for aINeedToKnow - integer codes for Domain and Author/Company plus a
+sorted date index, so combined filters are bitwise ANDs of bitmaps instead of pandas scans
+"""
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+
+# Date windows offered in the UI (days back from today, None = any time)
+DATE_WINDOWS = {
+    "Any time": None,
+    "Last 7 days": 7,
+    "Last 30 days": 30,
+    "Last 90 days": 90,
+    "Last year": 365,
+}
+
+
+class FacetIndex:
+    """Bitmap index over the cleaned catalog, built once per dataset version"""
+
+    def __init__(self, df):
+        self.size = len(df)
+        # value -> code, plus the code of every row
+        self.domains, self._domain_codes = self._build_codes(df, 'Domain')
+        self.authors, self._author_codes = self._build_codes(df, 'Author/Company')
+
+        # Sorted date index: row positions ordered by Date_Added, searched with binary search
+        if 'Date_Added' in df.columns:
+            dates = pd.to_datetime(df['Date_Added'], errors='coerce').to_numpy(dtype='datetime64[ns]')
+        else:
+            dates = np.full(self.size, np.datetime64('NaT'), dtype='datetime64[ns]')
+        self._date_order = np.argsort(dates, kind='stable')
+        self._sorted_dates = dates[self._date_order]
+        # NaT sorts last, keep it out of every window
+        self._dated_count = int(np.count_nonzero(~np.isnat(self._sorted_dates)))
+
+    def _build_codes(self, df, column):
+        """({distinct value: code}, code per row) for column (-1 rows where it is missing)"""
+        if column not in df.columns:
+            return {}, np.full(self.size, -1, dtype=np.int64)
+
+        codes, uniques = pd.factorize(df[column].astype(str).str.strip())
+        values = {value: code for code, value in enumerate(uniques) if value and value != 'nan'}
+        return values, codes
+
+    def _bitmap(self, values, codes, selected):
+        """Rows whose value is exactly one of selected"""
+        selected_codes = [values[value] for value in selected if value in values]
+        if not selected_codes:
+            return np.zeros(self.size, dtype=bool)
+        return np.isin(codes, selected_codes)
+
+    def all_rows(self):
+        return np.ones(self.size, dtype=bool)
+
+    def domain_values(self):
+        return sorted(self.domains)
+
+    def author_values(self):
+        return sorted(self.authors)
+
+    def domain_bitmap(self, selected_domains):
+        """Rows in any of the selected domains (exact values, as offered by the multiselect)"""
+        return self._bitmap(self.domains, self._domain_codes, selected_domains)
+
+    def author_bitmap(self, selected_authors):
+        """Rows by any of the selected authors/companies"""
+        return self._bitmap(self.authors, self._author_codes, selected_authors)
+
+    def date_bitmap(self, start=None, end=None):
+        """Rows with start <= Date_Added <= end, located by binary search on the sorted dates"""
+        dated = self._sorted_dates[:self._dated_count]
+        low = 0 if start is None else int(np.searchsorted(dated, np.datetime64(start, 'ns'), side='left'))
+        high = self._dated_count if end is None else int(np.searchsorted(dated, np.datetime64(end, 'ns'), side='right'))
+
+        bitmap = np.zeros(self.size, dtype=bool)
+        bitmap[self._date_order[low:high]] = True
+        return bitmap
+
+    def filter(self, domains=None, authors=None, days=None):
+        """Combined bitmap for the selected facets (empty selection = no restriction)"""
+        bitmap = self.all_rows()
+        if domains:
+            bitmap &= self.domain_bitmap(domains)
+        if authors:
+            bitmap &= self.author_bitmap(authors)
+        if days:
+            bitmap &= self.date_bitmap(start=datetime.now() - timedelta(days=days))
+        return bitmap
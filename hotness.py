@@ -0,0 +1,310 @@
+"""
+Hotness engine for aINeedToKnow - per-tool hourly vote buckets for "today" / "last 7 days"
+counts and an exponentially decayed trending score, updated incrementally as votes arrive
+"""
+import base64
+import math
+import threading
+import time
+from datetime import datetime
+import numpy as np
+from config import *
+from identity import tool_key, voter_digest
+
+SECONDS_PER_HOUR = 3600
+
+# Compact vote rows: integer tool ID, hashed voter key, epoch seconds
+VOTE_HEADERS = ["Tool_ID", "Voter", "Voted_At"]
+# Vote rows as written before the compact encoding (still read during cutover)
+LEGACY_VOTE_HEADERS = ["Tool_Title", "IP_Address", "Timestamp", "User_Agent", "Session_ID"]
+LEGACY_TIME_FORMAT = '%m/%d/%Y %H:%M:%S'
+
+# One row per tool in the aggregated counts worksheet, followed by continuation rows holding
+# only more Voters when they don't fit one cell. Compacted_Through (first row only) is the
+# compaction watermark: log votes cast at or before it are already in the counts.
+COUNTS_HEADERS = ["Tool_ID", "Total_Votes", "Hourly_Votes", "Trending", "Trending_At", "Compacted_Through", "Voters"]
+# Google Sheets cells hold 50,000 characters; 9,000 voters pack into 48,000
+VOTERS_PER_CELL = 9000
+
+
+def parse_legacy_time(timestamp):
+    """Epoch seconds of a legacy Hotness timestamp (unparseable ones only count all-time)"""
+    try:
+        return datetime.strptime(str(timestamp), LEGACY_TIME_FORMAT).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def decode_votes(values):
+    """(tool ID, epoch seconds, voter digest) for every vote in a Hotness sheet's values
+
+    Accepts both encodings. During cutover a process that hasn't picked up the compact
+    header may still append legacy rows, recognised by their non-empty User_Agent cell.
+    """
+    if not values:
+        return
+    legacy = values[0][:1] == LEGACY_VOTE_HEADERS[:1]
+
+    for row in values[1:]:
+        if row and row[0]:
+            yield _decode_vote(row, legacy or (len(row) > 3 and bool(row[3])))
+
+
+def _decode_vote(row, legacy):
+    if not legacy:
+        try:
+            return int(row[0]), float(row[2] or 0), int(row[1], 16)
+        except (ValueError, IndexError):
+            pass  # A legacy row cut down to three cells while the sheet was migrated
+
+    return (tool_key(row[0]), parse_legacy_time(row[2] if len(row) > 2 else ''),
+            voter_digest(row[1] if len(row) > 1 else ''))
+
+
+def encode_voters(voters):
+    """Sorted voter digests packed as base64 (about 5.3 characters per voter)"""
+    return base64.b64encode(np.array(sorted(voters), dtype='>u4').tobytes()).decode('ascii')
+
+
+def decode_voters(encoded):
+    if not encoded:
+        return set()
+    return set(np.frombuffer(base64.b64decode(encoded), dtype='>u4').tolist())
+
+
+def encode_buckets(buckets):
+    """Hourly buckets as "hour:votes" pairs"""
+    return ' '.join(f"{hour}:{votes}" for hour, votes in sorted(buckets.items()))
+
+
+def decode_buckets(encoded):
+    buckets = {}
+    for pair in str(encoded or '').split():
+        hour, votes = pair.split(':')
+        buckets[int(hour)] = int(votes)
+    return buckets
+
+
+class ToolCounter:
+    """Vote counters for one tool"""
+
+    __slots__ = ('total', 'buckets', 'decayed', 'decayed_at', 'voters')
+
+    def __init__(self):
+        self.total = 0
+        self.buckets = {}  # hour number (epoch // 3600) -> votes in that hour
+        self.decayed = 0.0  # trending score as of decayed_at
+        self.decayed_at = 0.0
+        self.voters = set()  # voter_digest of everyone who voted for the tool
+
+
+class HotnessCounters:
+    """Time-bucketed hotness counters for every tool that has votes"""
+
+    def __init__(self, half_life_hours=HOTNESS_HALF_LIFE_HOURS, retention_days=HOTNESS_RETENTION_DAYS):
+        self.half_life = half_life_hours * SECONDS_PER_HOUR
+        self.retention_hours = retention_days * 24
+        self._tools = {}
+        self._lock = threading.Lock()
+        self.loaded_at = None  # Set once the counters were built from the Hotness worksheets
+        self.vote_mark = None  # Newest shared vote delta already in that read (see shared_cache.py)
+        self.compacted_through = 0.0  # Compaction watermark of the counts loaded (epoch seconds)
+
+    def __len__(self):
+        return len(self._tools)
+
+    def add(self, tool, timestamp=None, voter=None):
+        """Count one vote - O(1) amortized, buckets past the retention window are pruned in bulk
+
+        voter is the voter_digest of whoever voted, if known (kept for vote dedup)
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        hour = int(timestamp // SECONDS_PER_HOUR)
+
+        with self._lock:
+            counter = self._tools.get(tool)
+            if counter is None:
+                counter = self._tools[tool] = ToolCounter()
+
+            counter.total += 1
+            if voter is not None:
+                counter.voters.add(voter)
+            counter.buckets[hour] = counter.buckets.get(hour, 0) + 1
+
+            # Decay the running score to the later of the two times, then add the vote
+            if timestamp >= counter.decayed_at:
+                counter.decayed = self._decay(counter.decayed, timestamp - counter.decayed_at) + 1.0
+                counter.decayed_at = timestamp
+            else:
+                counter.decayed += self._decay(1.0, counter.decayed_at - timestamp)
+
+            if len(counter.buckets) > self.retention_hours:
+                oldest = hour - self.retention_hours
+                counter.buckets = {h: n for h, n in counter.buckets.items() if h > oldest}
+
+    def add_once(self, tool, timestamp, voter):
+        """add() unless this voter's vote for the tool is already counted (replayed vote deltas)"""
+        counter = self._tools.get(tool)
+        if counter is not None and voter in counter.voters:
+            return False
+        self.add(tool, timestamp, voter)
+        return True
+
+    def load(self, votes):
+        """Count many (tool, epoch seconds[, voter digest]) votes, e.g. from decode_votes"""
+        for vote in votes:
+            self.add(*vote)
+        return self
+
+    def has_voted(self, tool, voter):
+        """True if the voter (a voter_key) already voted for the tool"""
+        counter = self._tools.get(tool)
+        return counter is not None and int(voter, 16) in counter.voters
+
+    def load_counts(self, records):
+        """Restore per-tool aggregates from rows of the counts worksheet (see COUNTS_HEADERS)"""
+        with self._lock:
+            for record in records:
+                self.compacted_through = max(self.compacted_through, float(record.get('Compacted_Through') or 0))
+                if record.get('Tool_ID'):
+                    tool = int(record['Tool_ID'])
+                elif record.get('Tool_Title'):
+                    tool = tool_key(record['Tool_Title'])  # Written before tool IDs
+                else:
+                    continue
+                counter = self._tools.get(tool)
+                if counter is None:
+                    counter = self._tools[tool] = ToolCounter()
+
+                counter.total += int(record.get('Total_Votes') or 0)
+                for hour, votes in decode_buckets(record.get('Hourly_Votes')).items():
+                    counter.buckets[hour] = counter.buckets.get(hour, 0) + votes
+                counter.voters |= decode_voters(record.get('Voters'))
+
+                decayed_at = float(record.get('Trending_At') or 0)
+                decayed = float(record.get('Trending') or 0)
+                if decayed_at >= counter.decayed_at:
+                    counter.decayed = self._decay(counter.decayed, decayed_at - counter.decayed_at) + decayed
+                    counter.decayed_at = decayed_at
+                else:
+                    counter.decayed += self._decay(decayed, counter.decayed_at - decayed_at)
+        return self
+
+    def counts_rows(self, now=None):
+        """Rows for the counts worksheet, buckets past the retention window dropped"""
+        now = time.time() if now is None else now
+        oldest = int(now // SECONDS_PER_HOUR) - self.retention_hours
+
+        rows = []
+        with self._lock:
+            for tool, counter in sorted(self._tools.items()):
+                voters = sorted(counter.voters)
+                chunks = [voters[i:i + VOTERS_PER_CELL] for i in range(0, len(voters), VOTERS_PER_CELL)] or [[]]
+                rows.append([
+                    tool,
+                    counter.total,
+                    encode_buckets({h: n for h, n in counter.buckets.items() if h > oldest}),
+                    round(counter.decayed, 6),
+                    round(counter.decayed_at, 3),
+                    '',
+                    encode_voters(chunks[0]),
+                ])
+                rows.extend([tool, '', '', '', '', '', encode_voters(chunk)] for chunk in chunks[1:])
+        if rows:
+            rows[0][5] = self.compacted_through  # Unrounded, readers compare vote times against it
+        return rows
+
+    def _decay(self, score, elapsed):
+        return score * math.pow(0.5, elapsed / self.half_life)
+
+    def _window(self, counter, since):
+        """Votes since the epoch timestamp `since` - O(buckets)"""
+        since_hour = int(since // SECONDS_PER_HOUR)
+        return sum(n for hour, n in counter.buckets.items() if hour >= since_hour)
+
+    def total(self, tool):
+        counter = self._tools.get(tool)
+        return counter.total if counter else 0
+
+    def today(self, tool, now=None):
+        """Votes since local midnight, to the hour (see _day_start)"""
+        counter = self._tools.get(tool)
+        return self._window(counter, self._day_start(now)) if counter else 0
+
+    def last_days(self, tool, days, now=None):
+        """Votes in the last `days` days (rolling window)"""
+        counter = self._tools.get(tool)
+        now = time.time() if now is None else now
+        return self._window(counter, now - days * 24 * SECONDS_PER_HOUR) if counter else 0
+
+    def trending(self, tool, now=None):
+        """Exponentially decayed vote score (one vote loses half its weight every half-life)"""
+        counter = self._tools.get(tool)
+        now = time.time() if now is None else now
+        return self._decay(counter.decayed, max(now - counter.decayed_at, 0)) if counter else 0.0
+
+    def totals(self):
+        """All-time votes per tool"""
+        with self._lock:
+            return {tool: counter.total for tool, counter in self._tools.items()}
+
+    def overlay(self, now=None):
+        """Columnar hotness overlay keyed by tool_id (tools without votes are omitted)"""
+        now = time.time() if now is None else now
+        today_hour = int(self._day_start(now) // SECONDS_PER_HOUR)
+        week_start = now - 7 * 24 * SECONDS_PER_HOUR
+        week_hour = int(week_start // SECONDS_PER_HOUR)
+
+        def windows(counter):
+            # decayed_at is the latest vote, so a tool not voted on this week needs no bucket scan
+            if counter.decayed_at < week_hour * SECONDS_PER_HOUR:
+                return 0, 0
+            today = week = 0
+            for hour, n in counter.buckets.items():
+                if hour >= week_hour:
+                    week += n
+                    if hour >= today_hour:
+                        today += n
+            return today, week
+
+        with self._lock:
+            rows = [
+                (tool, counter.total, *windows(counter), counter.decayed, counter.decayed_at)
+                for tool, counter in self._tools.items()
+            ]
+
+        columns = list(zip(*rows)) or [()] * 6
+        decayed = np.array(columns[4], dtype=np.float64)
+        elapsed = np.maximum(now - np.array(columns[5], dtype=np.float64), 0)
+        return {
+            'tool_id': np.array(columns[0], dtype=np.int64),
+            'hotness_count': np.array(columns[1], dtype=np.int32),
+            'hotness_today': np.array(columns[2], dtype=np.int32),
+            'hotness_week': np.array(columns[3], dtype=np.int32),
+            'hotness_trending': (decayed * np.power(0.5, elapsed / self.half_life)).astype(np.float32),
+        }
+
+    def _day_start(self, now=None):
+        """Start of the hour bucket holding local midnight, where "today" counts from
+
+        Buckets are whole UTC hours, so in a timezone offset by a fraction of an hour (e.g. India,
+        UTC+5:30) "today" also counts the votes cast in that bucket just before midnight.
+        """
+        now = time.time() if now is None else now
+        midnight = datetime.fromtimestamp(now).replace(hour=0, minute=0, second=0, microsecond=0).timestamp()
+        return midnight // SECONDS_PER_HOUR * SECONDS_PER_HOUR
+
+
+_counters = HotnessCounters()
+
+
+def get_hotness_counters():
+    """The hotness counters shared by every session in this process"""
+    return _counters
+
+
+def set_hotness_counters(counters):
+    """Swap in counters rebuilt from the Hotness log"""
+    global _counters
+    _counters = counters
+    return counters
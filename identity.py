@@ -0,0 +1,127 @@
+"""
+Stable keys for aINeedToKnow - short integer tool IDs and fixed-width hashed voter keys,
+so votes and joins don't carry free-text titles or raw IP addresses around
+"""
+import hashlib
+import hmac
+import os
+import secrets
+import uuid
+import streamlit as st
+from config import *
+
+_voter_secret = None
+
+
+def tool_key(title):
+    """Stable 48-bit tool ID from the tool's title (exact in a Sheets number cell)"""
+    return int.from_bytes(hashlib.sha1(str(title).strip().encode('utf-8')).digest()[:6], 'big')
+
+
+def voter_secret():
+    """Server secret keying voter digests: VOTER_KEY_SECRET, else one generated and kept on disk"""
+    global _voter_secret
+    if _voter_secret is None:
+        _voter_secret = (VOTER_KEY_SECRET or _load_voter_secret()).encode('utf-8')
+    return _voter_secret
+
+
+def _load_voter_secret():
+    try:
+        with open(VOTER_SECRET_PATH, encoding='utf-8') as f:
+            return f.read().strip()
+    except FileNotFoundError:
+        pass
+
+    print(f"⚠️ VOTER_KEY_SECRET is not set, generating one in {VOTER_SECRET_PATH}")
+    os.makedirs(os.path.dirname(VOTER_SECRET_PATH) or '.', exist_ok=True)
+    temp_path = f"{VOTER_SECRET_PATH}.{os.getpid()}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        f.write(secrets.token_hex(32))
+    try:
+        # link fails if another process got there first, then everyone uses its secret
+        os.link(temp_path, VOTER_SECRET_PATH)
+    except FileExistsError:
+        pass
+    finally:
+        os.remove(temp_path)
+    with open(VOTER_SECRET_PATH, encoding='utf-8') as f:
+        return f.read().strip()
+
+
+def voter_digest(voter):
+    """32-bit keyed digest of a voter (IP or fingerprint), enough to dedupe votes per tool
+
+    An HMAC with the server secret: without it the 2^32 IPv4 addresses are easy to hash
+    through and match against the Hotness sheet.
+    """
+    digest = hmac.new(voter_secret(), str(voter).encode('utf-8'), hashlib.sha256).digest()
+    return int.from_bytes(digest[:4], 'big')
+
+
+def voter_key(voter):
+    """Fixed-width hex form of voter_digest, as stored in the Hotness sheet"""
+    return f"{voter_digest(voter):08x}"
+
+
+class SessionIdentity:
+    """Who this session is, resolved once: client IP and the hashed voter key used for votes"""
+
+    __slots__ = ('client_ip', 'voter', 'source')
+
+    def __init__(self, client_ip, source):
+        self.client_ip = client_ip
+        self.voter = voter_key(client_ip)
+        self.source = source
+
+
+def request_headers():
+    """Headers of the request that opened this session"""
+    context = getattr(st, 'context', None)
+    if context is not None:
+        return context.headers
+
+    # Streamlit < 1.37 only has the websocket headers helper
+    import streamlit.web.server.websocket_headers as wsh
+    get_headers = getattr(wsh, '_get_websocket_headers', None) or wsh.get_websocket_headers
+    return get_headers() or {}
+
+
+def client_address(headers, connection_ip, trusted_proxies=TRUSTED_PROXY_COUNT):
+    """(client IP, source) from the request headers and the connection's peer address
+
+    Each proxy appends the address it was reached from to X-Forwarded-For, so only the
+    entries added by our own proxies can be trusted: with N of them the client is the N-th
+    entry from the right. Anything further left was sent by the client and may be forged.
+    Without trusted proxies the headers are ignored.
+    """
+    if trusted_proxies > 0:
+        hops = [hop.strip() for hop in headers.get('X-Forwarded-For', '').split(',') if hop.strip()]
+        if hops:
+            return hops[-min(trusted_proxies, len(hops))], 'x-forwarded-for'
+        if headers.get('X-Real-Ip'):
+            return headers['X-Real-Ip'].strip(), 'x-real-ip'
+    if isinstance(connection_ip, str) and connection_ip:
+        return connection_ip, 'connection'
+    return None, None
+
+
+def _resolve_identity():
+    try:
+        client_ip, source = client_address(
+            request_headers(), getattr(getattr(st, 'context', None), 'ip_address', None)
+        )
+        if client_ip:
+            return SessionIdentity(client_ip, source)
+    except Exception as e:
+        print(f"Error getting client IP: {e}")
+
+    # Local/dev sessions without a client address: one random ID for the whole session
+    return SessionIdentity(f"session_{uuid.uuid4().hex[:16]}", 'session')
+
+
+def get_session_identity():
+    """This session's identity, resolved on the first call and reused by every tile"""
+    if 'identity' not in st.session_state:
+        st.session_state.identity = _resolve_identity()
+    return st.session_state.identity
@@ -0,0 +1,316 @@
+"""
+Link health for aINeedToKnow - checks every tool's Source_URL in the background and joins
+the results into the catalog snapshot as a link_status column, so the app can flag or hide
+dead links without a single network call while rendering
+
+Checks are async HEAD requests (GET when a server refuses HEAD) with bounded concurrency,
+a per-host cap and delay, and a timeout. Results are cached with a TTL in LINK_HEALTH_PATH,
+so only new and expired links are checked after a catalog refresh or a restart.
+"""
+import asyncio
+import json
+import os
+import socket
+import ssl
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.client import HTTPException
+from urllib.parse import urlsplit
+from config import *
+from shared_cache import get_shared_cache
+from snapshot import get_snapshot_store
+
+LINK_OK = "ok"
+LINK_DEAD = "dead"
+# Timeouts, 5xx and bot walls (401/403/429) say nothing certain about the link
+LINK_UNKNOWN = "unknown"
+
+USER_AGENT = f"Mozilla/5.0 (compatible; {APP_TITLE} link checker; +mailto:{ADMIN_EMAIL})"
+
+
+def classify(code):
+    """Link status for an HTTP status code (redirects are already followed)"""
+    if code < 400:
+        return LINK_OK
+    if code in (401, 403, 429) or code >= 500:
+        return LINK_UNKNOWN
+    return LINK_DEAD
+
+
+def safe_url(url):
+    """url stripped if it is an http(s) link, else "" - javascript:, data: and the like must
+    never end up in an href"""
+    if not isinstance(url, str):
+        return ''
+    url = url.strip()
+    return url if urlsplit(url).scheme.lower() in ('http', 'https') else ''
+
+
+def catalog_urls(frame):
+    """Distinct non-empty Source_URLs of a catalog frame"""
+    if frame.empty or 'Source_URL' not in frame.columns:
+        return []
+    urls = frame['Source_URL'].astype(str).str.strip()
+    return [url for url in urls.unique().tolist() if url and url != 'nan']
+
+
+def _settle(future, value):
+    if not future.done():
+        future.set_result(value)
+
+
+class _Host:
+    """Politeness state for one host: at most per_host requests in flight, started `delay` apart
+
+    Each turn is a future holding the time its request really went out, set from the pool
+    thread. The next turn waits for it on the event loop, so the gap is kept even when a pool
+    thread picks a request up late, and waiting holds no pool thread.
+    """
+
+    def __init__(self, per_host):
+        self.slots = asyncio.Semaphore(per_host)
+        self._last = None
+
+    async def turn(self, delay):
+        """Wait until `delay` after the host's previous request went out, return this request's turn"""
+        previous, self._last = self._last, asyncio.get_running_loop().create_future()
+        turn = self._last
+        if previous is not None:
+            await asyncio.sleep(await previous + delay - time.monotonic())
+        return turn
+
+    @staticmethod
+    def started(turn):
+        """Record that the request of `turn` went out now (called on the pool thread)"""
+        turn.get_loop().call_soon_threadsafe(_settle, turn, time.monotonic())
+
+
+class LinkChecker:
+    """Checks a batch of URLs, returns {url: (status, detail, checked_at)}
+
+    urllib blocks, so the requests run on a thread pool driven from an asyncio loop that
+    enforces the global and per-host limits; waiting for a host's turn holds no pool thread.
+    detail is the final HTTP status code, or the kind of network error.
+    """
+
+    def __init__(self, concurrency=LINK_CHECK_CONCURRENCY, per_host=LINK_CHECK_PER_HOST,
+                 host_delay=LINK_CHECK_HOST_DELAY, timeout=LINK_CHECK_TIMEOUT):
+        self.concurrency = concurrency
+        self.per_host = per_host
+        self.host_delay = host_delay
+        self.timeout = timeout
+        self.stats = {}
+
+    def check(self, urls):
+        urls = list(dict.fromkeys(urls))
+        started = time.monotonic()
+        with ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix="link-check") as pool:
+            results = asyncio.run(self._check_all(urls, pool))
+        self.stats = {status: 0 for status in (LINK_OK, LINK_DEAD, LINK_UNKNOWN)}
+        for status, _, _ in results.values():
+            self.stats[status] += 1
+        self.stats['seconds'] = round(time.monotonic() - started, 2)
+        print(f"🔗 Checked {len(urls)} links in {self.stats['seconds']}s: {self.stats[LINK_OK]} ok, "
+              f"{self.stats[LINK_DEAD]} dead, {self.stats[LINK_UNKNOWN]} unknown")
+        return results
+
+    async def _check_all(self, urls, pool):
+        loop = asyncio.get_running_loop()
+        slots = asyncio.Semaphore(self.concurrency)
+        hosts = {}
+
+        async def check(url):
+            host = hosts.setdefault(urlsplit(url).netloc.lower(), _Host(self.per_host))
+            async with host.slots:
+                for method in ('HEAD', 'GET'):
+                    async with slots:
+                        # Wait for the host's turn holding a slot, so the request starts right on it
+                        turn = await host.turn(self.host_delay)
+                        try:
+                            status, detail = await loop.run_in_executor(pool, self._probe, url, method, turn)
+                        finally:
+                            _settle(turn, float('-inf'))  # The request never went out, the next one needn't wait
+                    # Plenty of servers answer HEAD with 403/405/501, GET tells for sure
+                    if status == LINK_OK or detail in (404, 410) or not isinstance(detail, int):
+                        break
+            return url, (status, detail, time.time())
+
+        return dict(await asyncio.gather(*(check(url) for url in urls)))
+
+    def _probe(self, url, method, turn=None):
+        """(status, detail) for one request, recording when it went out in its host's turn"""
+        if urlsplit(url).scheme not in ('http', 'https'):
+            return LINK_DEAD, "invalid"
+        if turn is not None:
+            _Host.started(turn)
+        try:
+            code = self._request(url, method)
+            return classify(code), code
+        except urllib.error.URLError as e:
+            reason = e.reason
+            if isinstance(reason, socket.gaierror):
+                # No such name is dead, a resolver hiccup is not
+                return (LINK_DEAD if reason.errno == socket.EAI_NONAME else LINK_UNKNOWN), "dns"
+            if isinstance(reason, ConnectionRefusedError):
+                return LINK_DEAD, "refused"
+            if isinstance(reason, ssl.SSLCertVerificationError):
+                return LINK_DEAD, "certificate"
+            if isinstance(reason, TimeoutError):
+                return LINK_UNKNOWN, "timeout"
+            return LINK_UNKNOWN, "error"
+        except TimeoutError:
+            return LINK_UNKNOWN, "timeout"
+        except (HTTPException, OSError, ValueError):
+            return LINK_UNKNOWN, "error"
+
+    def _request(self, url, method):
+        headers = {'User-Agent': USER_AGENT, 'Accept': '*/*'}
+        if method == 'GET':
+            headers['Range'] = 'bytes=0-0'  # Only the status matters
+        try:
+            with urllib.request.urlopen(urllib.request.Request(url, method=method, headers=headers),
+                                        timeout=self.timeout) as response:
+                return response.status
+        except urllib.error.HTTPError as e:
+            e.close()
+            return e.code
+
+
+class LinkHealthCache:
+    """Process-wide check results per URL, saved to disk so a restart doesn't re-check them"""
+
+    def __init__(self, path=LINK_HEALTH_PATH):
+        self.path = path
+        self.revision = 0  # Bumped when a link's status changes
+        self._entries = None  # url -> [status, detail, checked_at], read from disk on first use
+        self._lock = threading.Lock()
+        self._checking = threading.Lock()
+
+    def _load(self):
+        """Entries, reading the cache file on first use (caller holds the lock)"""
+        if self._entries is None:
+            try:
+                with open(self.path, encoding='utf-8') as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+        return self._entries
+
+    def statuses(self):
+        """{url: status} for joining into a snapshot"""
+        with self._lock:
+            return {url: entry[0] for url, entry in self._load().items()}
+
+    def entries(self):
+        with self._lock:
+            return {url: list(entry) for url, entry in self._load().items()}
+
+    def stale(self, urls, now=None):
+        """URLs never checked, or whose result expired (dead and unknown ones expire sooner)"""
+        now = time.time() if now is None else now
+        with self._lock:
+            entries = self._load()
+            return [
+                url for url in urls
+                if url not in entries
+                or now - entries[url][2] > (LINK_CHECK_TTL if entries[url][0] == LINK_OK else LINK_CHECK_RETRY) * 3600
+            ]
+
+    def put_many(self, results):
+        """Store check results, True if any link's status changed"""
+        with self._lock:
+            entries = self._load()
+            changed = any(entries.get(url, [None])[0] != result[0] for url, result in results.items())
+            entries.update({url: list(result) for url, result in results.items()})
+            if changed:
+                self.revision += 1
+            self._save(entries)
+        return changed
+
+    def prune(self, urls):
+        """Forget links no longer in the catalog"""
+        keep = set(urls)
+        with self._lock:
+            entries = self._load()
+            gone = [url for url in entries if url not in keep]
+            for url in gone:
+                del entries[url]
+            if gone:
+                self._save(entries)
+
+    def _save(self, entries):
+        try:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, separators=(',', ':'))
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"❌ Could not save link health cache: {e}")
+
+    def status(self):
+        """Counts per status for diagnostics"""
+        with self._lock:
+            entries = self._load()
+            counts = {status: 0 for status in (LINK_OK, LINK_DEAD, LINK_UNKNOWN)}
+            for status, _, _ in entries.values():
+                counts[status] = counts.get(status, 0) + 1
+            return {
+                **counts,
+                'revision': self.revision,
+                'checking': self._checking.locked(),
+                'checked_at': max((entry[2] for entry in entries.values()), default=None),
+            }
+
+
+_links = LinkHealthCache()
+
+
+def get_link_health():
+    """The link health cache shared by every session in this process"""
+    return _links
+
+
+def with_link_status(snapshot):
+    """Snapshot with the cached link statuses joined in (no network calls)"""
+    if snapshot is None or snapshot.empty:
+        return snapshot
+    return snapshot.with_link_status(get_link_health().statuses())
+
+
+def check_catalog_links(force=False, wait=False, checker=None):
+    """Check the current snapshot's new and expired links and publish the updated status column
+
+    Returns the cache status, None if there is no catalog yet or (unless wait) a check is
+    already running.
+    """
+    cache = get_link_health()
+    if not cache._checking.acquire(blocking=wait):
+        return None
+    try:
+        snapshot = get_snapshot_store().current()
+        if snapshot is None or snapshot.empty:
+            return None
+        urls = catalog_urls(snapshot.frame)
+        cache.prune(urls)
+        due = urls if force else cache.stale(urls)
+        if due:
+            print(f"🔗 Checking {len(due)} of {len(urls)} tool links...")
+            if cache.put_many((checker or LinkChecker()).check(due)):
+                shared = get_shared_cache()
+                if shared is not None:
+                    shared.publish_links(cache.entries())
+                get_snapshot_store().update(with_link_status)
+        return cache.status()
+    finally:
+        cache._checking.release()
+
+
+def start_link_check():
+    """Check links on a background thread (a no-op while a check is already running)"""
+    if not get_link_health()._checking.locked():
+        threading.Thread(target=check_catalog_links, name="link-check", daemon=True).start()
@@ -0,0 +1,161 @@
+"""
+Maintenance jobs for aINeedToKnow - run against the live Google Sheet, e.g. from cron
+
+Usage: python maintenance.py compact-hotness [--older-than-hours 24]
+       python maintenance.py migrate-votes
+       python maintenance.py export-static [--out static] [--refresh]
+       python maintenance.py import-tools tools.csv|tools.json [--dry-run] [--rejects rejected.csv]
+       python maintenance.py send-digest [--dry-run] [--concurrency 8] [--smtp-host localhost] [--smtp-port 25]
+       python maintenance.py check-links [--force]
+"""
+import argparse
+import csv
+import json
+import sys
+import pandas as pd
+from config import *
+
+
+def connect():
+    """DataManager connected to Google Sheets (exits if the connection failed)"""
+    from data_manager import DataManager
+
+    dm = DataManager()
+    if not dm.sheet:
+        sys.exit("❌ No Google Sheets connection")
+    return dm
+
+
+def compact_hotness(args):
+    """Roll old raw votes into the counts worksheet and archive them"""
+    dm = connect()
+    dm.compact_hotness_log(older_than_hours=args.older_than_hours)
+
+
+def migrate_votes(args):
+    """Convert the Hotness log to the compact vote encoding"""
+    dm = connect()
+    dm.migrate_hotness_votes()
+
+
+def export_static(args):
+    """Pre-render the ranked catalog to static HTML/JSON (only changed pages are rewritten)"""
+    from static_export import StaticExporter
+    from warmup import load_disk_snapshot
+
+    if args.refresh:
+        dm = connect()
+        snapshot = dm.refresh_snapshot()
+    else:
+        snapshot = load_disk_snapshot()
+        if snapshot is None:
+            sys.exit(f"❌ No on-disk snapshot at {NEWS_CACHE_PATH}, run with --refresh")
+        # The snapshot leaves the detail columns out, tool pages still need their integration steps
+        from data_manager import DataManager
+
+        dm = DataManager()
+        if not dm.sheet:
+            print("⚠️ No Google Sheets connection, tool pages keep the integration steps of the last export")
+            dm = None
+    StaticExporter(args.out, data_manager=dm).export(snapshot)
+
+
+def read_tools_file(path):
+    """New tools from a CSV file or a JSON list of objects (or {"tools": [...]}), every cell as a string"""
+    if path.lower().endswith('.json'):
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        return pd.DataFrame(data['tools'] if isinstance(data, dict) else data, dtype=str)
+    return pd.read_csv(path, dtype=str, keep_default_na=False)
+
+
+def import_tools(args):
+    """Validate, dedupe and append new tools to the tools sheet in one batched write"""
+    try:
+        df = read_tools_file(args.path)
+    except (OSError, ValueError, KeyError) as e:
+        sys.exit(f"❌ Could not read {args.path}: {e}")
+
+    dm = connect()
+    try:
+        report = dm.import_tools(df, dry_run=args.dry_run)
+    except ValueError as e:
+        sys.exit(f"❌ {e}")
+
+    for row, title, reason in report['rejected']:
+        print(f"  ✗ row {row}: {title or '(no title)'} - {reason}")
+    if args.rejects and report['rejected']:
+        with open(args.rejects, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(['Row', 'Title', 'Reason'])
+            writer.writerows(report['rejected'])
+        print(f"📝 Wrote {len(report['rejected'])} rejected rows to {args.rejects}")
+
+
+def send_digest(args):
+    """Email the digest of the freshly ranked catalog to every subscriber"""
+    import digest
+
+    dm = connect()
+    snapshot = dm.refresh_snapshot()
+    stats = digest.send_digest(dm, snapshot, dry_run=args.dry_run, host=args.smtp_host, port=args.smtp_port,
+                        concurrency=args.concurrency)
+    for recipient, error in stats.get('failed', []):
+        print(f"  ✗ {recipient}: {error}")
+
+
+def check_links(args):
+    """Check the catalog's new and expired Source_URLs (all of them with --force) and list dead ones"""
+    from link_health import LINK_DEAD, check_catalog_links, get_link_health
+    from snapshot import get_snapshot_store
+
+    dm = connect()
+    dm.refresh_snapshot()
+    print(check_catalog_links(force=args.force, wait=True))
+
+    frame = get_snapshot_store().current().frame
+    entries = get_link_health().entries()
+    for title, url in frame.loc[frame['link_status'] == LINK_DEAD, ['Title', 'Source_URL']].itertuples(index=False):
+        print(f"💀 {title}: {url} ({entries[str(url).strip()][1]})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="aINeedToKnow maintenance jobs")
+    subparsers = parser.add_subparsers(dest="job", required=True)
+
+    compact_parser = subparsers.add_parser("compact-hotness", help="Compact the Hotness vote log")
+    compact_parser.add_argument("--older-than-hours", type=float, default=HOTNESS_COMPACT_AFTER_HOURS)
+    compact_parser.set_defaults(run=compact_hotness)
+
+    migrate_parser = subparsers.add_parser("migrate-votes", help="Convert Hotness vote rows to the compact encoding")
+    migrate_parser.set_defaults(run=migrate_votes)
+
+    export_parser = subparsers.add_parser("export-static", help="Pre-render the catalog to static HTML/JSON")
+    export_parser.add_argument("--out", default="static")
+    export_parser.add_argument("--refresh", action="store_true",
+                               help="Fetch tools and hotness from Google Sheets first (default: on-disk snapshot)")
+    export_parser.set_defaults(run=export_static)
+
+    import_parser = subparsers.add_parser("import-tools", help="Bulk-add tools from a CSV or JSON file")
+    import_parser.add_argument("path")
+    import_parser.add_argument("--dry-run", action="store_true", help="Validate and dedupe without writing")
+    import_parser.add_argument("--rejects", help="Also write the rejected rows with their reason to this CSV")
+    import_parser.set_defaults(run=import_tools)
+
+    digest_parser = subparsers.add_parser("send-digest", help="Email the digest to every subscriber")
+    digest_parser.add_argument("--dry-run", action="store_true", help="Render and count the segments without sending")
+    digest_parser.add_argument("--concurrency", type=int, default=DIGEST_CONCURRENCY)
+    digest_parser.add_argument("--smtp-host", default=SMTP_HOST)
+    digest_parser.add_argument("--smtp-port", type=int, default=SMTP_PORT)
+    digest_parser.set_defaults(run=send_digest)
+
+    links_parser = subparsers.add_parser("check-links", help="Check every tool's Source_URL and list dead links")
+    links_parser.add_argument("--force", action="store_true", help="Re-check links whose result hasn't expired")
+    links_parser.set_defaults(run=check_links)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
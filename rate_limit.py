@@ -0,0 +1,137 @@
+"""
+Vote rate limiting for aINeedToKnow - in-memory sliding windows per voter key and per IP
+prefix, checked before a vote reaches the Google Sheets write path
+"""
+import ipaddress
+import threading
+import time
+from collections import OrderedDict
+from config import *
+
+
+def ip_prefix(client_ip):
+    """The /24 (IPv4) or /48 (IPv6) network of a client IP, so rotating addresses in one block share a limit
+
+    Session-only identities (no client address) all share one bucket.
+    """
+    client_ip = str(client_ip).strip()
+    octets = client_ip.split('.')
+    if len(octets) == 4 and all(octet.isdigit() and int(octet) < 256 for octet in octets):
+        return f"{octets[0]}.{octets[1]}.{octets[2]}.0/24"  # The common case, without ipaddress' parsing cost
+
+    try:
+        address = ipaddress.ip_address(client_ip)
+    except ValueError:
+        return "no-address"
+    if address.version == 6 and address.ipv4_mapped:
+        return ip_prefix(str(address.ipv4_mapped))
+    prefix = 24 if address.version == 4 else 48
+    return str(ipaddress.ip_network(f"{address}/{prefix}", strict=False))
+
+
+class SlidingWindowLimiter:
+    """At most `limit` events per `window` seconds per key
+
+    Each key keeps the counts of the current and the previous fixed window; the sliding
+    count weights the previous one by how much of it still overlaps (O(1) per check, three
+    integers per key). Keys are held in LRU order and the least recently seen key is
+    evicted beyond max_keys, so memory stays bounded however many voters show up.
+    """
+
+    def __init__(self, limit, window, max_keys=VOTE_LIMIT_MAX_KEYS):
+        self.limit = limit
+        self.window = window
+        self.max_keys = max_keys
+        self.evicted = 0
+        self._keys = OrderedDict()  # key -> [window number, count in it, count in the window before]
+
+    def __len__(self):
+        return len(self._keys)
+
+    def count(self, key, now):
+        """Sliding-window event count for key at `now` (caller holds the lock)"""
+        entry = self._entry(key, now)
+        overlap = 1.0 - (now % self.window) / self.window
+        return entry[1] + entry[2] * overlap
+
+    def hit(self, key, now):
+        self._entry(key, now)[1] += 1
+
+    def retry_after(self, key, now):
+        """Seconds until key is below its limit again (0 if it already is)"""
+        entry = self._entry(key, now)
+        if entry[1] >= self.limit:
+            return self.window - now % self.window
+        if entry[1] + entry[2] * (1.0 - (now % self.window) / self.window) < self.limit:
+            return 0.0
+        # Time for the previous window's weight to shrink enough
+        return max(0.0, (1.0 - (self.limit - entry[1]) / entry[2]) * self.window - now % self.window)
+
+    def _entry(self, key, now):
+        number = int(now // self.window)
+        entry = self._keys.get(key)
+        if entry is None:
+            entry = self._keys[key] = [number, 0, 0]
+            if len(self._keys) > self.max_keys:
+                self._keys.popitem(last=False)
+                self.evicted += 1
+        else:
+            self._keys.move_to_end(key)
+            if entry[0] != number:
+                # Roll forward: the old current window is the new previous one (or nothing if idle longer)
+                entry[2] = entry[1] if entry[0] == number - 1 else 0
+                entry[0], entry[1] = number, 0
+        return entry
+
+
+class VoteRateLimiter:
+    """Per-voter and per-IP-prefix vote limits, one process-wide instance (see get_vote_limiter)"""
+
+    def __init__(self, per_voter=VOTE_LIMIT_PER_VOTER, per_prefix=VOTE_LIMIT_PER_PREFIX,
+                 window=VOTE_LIMIT_WINDOW, max_keys=VOTE_LIMIT_MAX_KEYS):
+        self.voters = SlidingWindowLimiter(per_voter, window, max_keys)
+        self.prefixes = SlidingWindowLimiter(per_prefix, window, max_keys)
+        self.stats = {'allowed': 0, 'limited_voter': 0, 'limited_prefix': 0}
+        self._lock = threading.Lock()
+
+    def allow(self, identity, now=None):
+        """Count a vote attempt from a SessionIdentity, False if either limit is reached"""
+        now = time.time() if now is None else now
+        prefix = ip_prefix(identity.client_ip)
+        with self._lock:
+            if self.voters.count(identity.voter, now) >= self.voters.limit:
+                self.stats['limited_voter'] += 1
+                return False
+            if self.prefixes.count(prefix, now) >= self.prefixes.limit:
+                self.stats['limited_prefix'] += 1
+                return False
+            self.voters.hit(identity.voter, now)
+            self.prefixes.hit(prefix, now)
+            self.stats['allowed'] += 1
+            return True
+
+    def retry_after(self, identity, now=None):
+        """Seconds until this identity may vote again (0 if it isn't limited)"""
+        now = time.time() if now is None else now
+        with self._lock:
+            return max(self.voters.retry_after(identity.voter, now),
+                       self.prefixes.retry_after(ip_prefix(identity.client_ip), now))
+
+    def status(self):
+        """Counters for monitoring"""
+        with self._lock:
+            return {
+                **self.stats,
+                'voter_keys': len(self.voters),
+                'prefix_keys': len(self.prefixes),
+                'evicted': self.voters.evicted + self.prefixes.evicted,
+                'limits': f"{self.voters.limit}/voter, {self.prefixes.limit}/prefix per {self.voters.window}s",
+            }
+
+
+_limiter = VoteRateLimiter()
+
+
+def get_vote_limiter():
+    """The vote rate limiter shared by every session in this process"""
+    return _limiter
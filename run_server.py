@@ -0,0 +1,17 @@
+"""
+Launcher for aINeedToKnow - starts the catalog warm-up when the server process boots,
+so the cache is hot before the first visitor arrives, and serves the read-only feed API
+(api.py) on FEED_API_PORT from the same process and snapshot
+
+Usage: python run_server.py [streamlit run options]
+"""
+import sys
+from streamlit.web import cli as stcli
+from warmup import start_warm_up
+from api import start_api_server
+
+if __name__ == "__main__":
+    start_warm_up()
+    start_api_server()
+    sys.argv = ["streamlit", "run", "app.py"] + sys.argv[1:]
+    sys.exit(stcli.main())
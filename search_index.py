@@ -0,0 +1,203 @@
+"""
+Full-text search for aINeedToKnow - tokenized inverted index with BM25 ranking blended with hotness
+"""
+import re
+import math
+import threading
+from bisect import bisect_left
+from collections import Counter
+import numpy as np
+
+# Field weights: a hit in the title counts more than one buried in the integration steps
+SEARCH_FIELDS = {
+    'Title': 3.0,
+    'Summary': 1.0,
+    'Integration_Steps': 0.5,
+}
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# How strongly hotness lifts a relevant tool: score * (1 + HOTNESS_WEIGHT * log1p(hotness))
+HOTNESS_WEIGHT = 0.2
+
+# Max vocabulary terms the last (still being typed) query word may expand to
+MAX_PREFIX_EXPANSIONS = 20
+
+STOPWORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in', 'into', 'is', 'it',
+    'of', 'on', 'or', 'the', 'this', 'to', 'with', 'your', 'you',
+}
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    """Lowercase alphanumeric tokens without stopwords"""
+    if not isinstance(text, str):
+        return []
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+class SearchIndex:
+    """Inverted index over the cleaned catalog, built once per dataset version
+
+    Fields the list frame leaves out (Integration_Steps) are indexed incrementally as their
+    details are loaded, see add_details.
+    """
+
+    def __init__(self, df, details=None):
+        """details: optional {tool_id: {field: text}} for fields the list frame leaves out"""
+        self.labels = df.index.to_numpy()
+        self.doc_count = len(df)
+        tool_ids = df['tool_id'].tolist() if 'tool_id' in df.columns else []
+        self._doc_ids = {tool_id: doc_id for doc_id, tool_id in enumerate(tool_ids)}
+        self._detail_fields = {field: weight for field, weight in SEARCH_FIELDS.items() if field not in df.columns}
+        self._detail_postings = {}  # term -> {doc_id: weighted tf}
+        self._detailed = set()
+        self._details_revision = None
+        self._lock = threading.Lock()
+
+        # Weighted term frequencies per document (BM25F-style field weighting)
+        postings = {}
+        doc_lengths = np.zeros(self.doc_count, dtype=np.float64)
+
+        fields = [field for field in SEARCH_FIELDS if field in df.columns]
+        columns = [df[field] for field in fields]
+        weights = [SEARCH_FIELDS[field] for field in fields]
+
+        for doc_id, values in enumerate(zip(*columns)):
+            term_freqs = Counter()
+            for value, weight in zip(values, weights):
+                for token in tokenize(value):
+                    term_freqs[token] += weight
+
+            doc_lengths[doc_id] = sum(term_freqs.values())
+            for term, tf in term_freqs.items():
+                postings.setdefault(term, []).append((doc_id, tf))
+
+        avg_length = doc_lengths.mean() if self.doc_count else 0.0
+        length_norm = BM25_K1 * (1 - BM25_B + BM25_B * doc_lengths / (avg_length or 1.0))
+
+        # Every (term, doc) weight only depends on static data, so score it once at build time
+        self._postings = {}
+        for term, entries in postings.items():
+            doc_ids = np.fromiter((doc_id for doc_id, _ in entries), dtype=np.int32, count=len(entries))
+            tfs = np.fromiter((tf for _, tf in entries), dtype=np.float64, count=len(entries))
+            idf = math.log(1 + (self.doc_count - len(entries) + 0.5) / (len(entries) + 0.5))
+            scores = idf * tfs * (BM25_K1 + 1) / (tfs + length_norm[doc_ids])
+            self._postings[term] = (doc_ids, scores.astype(np.float32))
+
+        self._doc_lengths = doc_lengths
+        self._vocabulary = sorted(self._postings)
+        if details:
+            self.add_details(details)
+
+    def __len__(self):
+        return self.doc_count
+
+    def add_details(self, details):
+        """Index the detail fields of {tool_id: {field: text}} for tools not indexed yet
+
+        Detail hits are scored at query time against the current document lengths, so loading
+        one tile's details doesn't rebuild the index. Returns how many tools were added.
+        """
+        added = 0
+        with self._lock:
+            vocabulary_changed = False
+            for tool_id, fields in details.items():
+                doc_id = self._doc_ids.get(tool_id)
+                if doc_id is None or doc_id in self._detailed:
+                    continue
+                self._detailed.add(doc_id)
+                added += 1
+
+                term_freqs = Counter()
+                for field, weight in self._detail_fields.items():
+                    for token in tokenize(fields.get(field, '')):
+                        term_freqs[token] += weight
+                self._doc_lengths[doc_id] += sum(term_freqs.values())
+                for term, tf in term_freqs.items():
+                    vocabulary_changed |= term not in self._detail_postings and term not in self._postings
+                    self._detail_postings.setdefault(term, {})[doc_id] = tf
+            if vocabulary_changed:
+                self._vocabulary = sorted(self._postings.keys() | self._detail_postings.keys())
+        return added
+
+    def update_details(self, detail_cache):
+        """Index whatever arrived in a DetailCache since the last call (a no-op if nothing did)"""
+        revision = detail_cache.revision
+        if revision != self._details_revision:
+            self.add_details(detail_cache.all())
+            self._details_revision = revision
+        return self
+
+    def _detail_scores(self, term):
+        """(doc_ids, BM25 scores) of a term's hits in the detail fields"""
+        hits = self._detail_postings[term]
+        doc_ids = np.fromiter(hits.keys(), dtype=np.int32, count=len(hits))
+        tfs = np.fromiter(hits.values(), dtype=np.float64, count=len(hits))
+        avg_length = self._doc_lengths.mean() if self.doc_count else 0.0
+        length_norm = BM25_K1 * (1 - BM25_B + BM25_B * self._doc_lengths[doc_ids] / (avg_length or 1.0))
+        idf = math.log(1 + (self.doc_count - len(hits) + 0.5) / (len(hits) + 0.5))
+        return doc_ids, idf * tfs * (BM25_K1 + 1) / (tfs + length_norm)
+
+    def _expand_prefix(self, prefix):
+        """Vocabulary terms starting with prefix (for the word the user is still typing)"""
+        terms = []
+        start = bisect_left(self._vocabulary, prefix)
+        for term in self._vocabulary[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        return terms
+
+    def _query_terms(self, query):
+        """Query tokens, with the trailing token also matched as a prefix"""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+
+        terms = set(tokens)
+        if not query[-1:].isspace():
+            terms.update(self._expand_prefix(tokens[-1]))
+        return [term for term in terms if term in self._postings or term in self._detail_postings]
+
+    def search(self, query, hotness=None, mask=None, limit=None):
+        """Return index labels of matching tools, best match first
+
+        hotness: optional array of hotness scores aligned with the indexed frame's row order
+        mask: optional boolean array (same alignment) restricting the candidates, e.g. facet filters
+        """
+        with self._lock:
+            terms = self._query_terms(query)
+            if not terms:
+                return self.labels[:0]
+            hits = [self._postings[term] for term in terms if term in self._postings]
+            hits += [self._detail_scores(term) for term in terms if term in self._detail_postings]
+
+        if len(hits) == 1:
+            doc_ids, scores = hits[0]
+            scores = scores.astype(np.float64)
+        else:
+            all_ids = np.concatenate([doc_ids for doc_ids, _ in hits])
+            all_scores = np.concatenate([scores for _, scores in hits])
+            totals = np.bincount(all_ids, weights=all_scores, minlength=self.doc_count)
+            doc_ids = np.flatnonzero(totals)
+            scores = totals[doc_ids]
+
+        if mask is not None and len(mask) == self.doc_count:
+            keep = mask[doc_ids]
+            doc_ids, scores = doc_ids[keep], scores[keep]
+
+        if hotness is not None and len(hotness) == self.doc_count:
+            scores = scores * (1 + HOTNESS_WEIGHT * np.log1p(np.asarray(hotness, dtype=np.float64)[doc_ids]))
+
+        if limit is not None and limit < len(doc_ids):
+            top = np.argpartition(-scores, limit)[:limit]
+            order = top[np.argsort(-scores[top], kind='stable')]
+        else:
+            order = np.argsort(-scores, kind='stable')
+
+        return self.labels[doc_ids[order]]
@@ -0,0 +1,329 @@
+"""
+Shared cache for aINeedToKnow - lets several app replicas behind a load balancer share one
+catalog snapshot, one hotness overlay and one stream of vote deltas
+
+Backed by a SQLite file on a volume every replica mounts (SHARED_CACHE_PATH, WAL mode, so it
+needs a filesystem with working locks - a local or block volume, not NFS). The replica holding
+a refresh lease reads Google Sheets and publishes the result once; the others adopt it on
+their next poll, so Sheets load stays the same however many replicas run. Votes are appended
+as deltas and replayed by every other replica within SHARED_CACHE_POLL_INTERVAL.
+"""
+import gzip
+import io
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from config import *
+from hotness import COUNTS_HEADERS, HotnessCounters, get_hotness_counters, set_hotness_counters
+from snapshot import CatalogSnapshot, get_snapshot_store, get_detail_cache
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS published (
+    kind TEXT PRIMARY KEY,          -- catalog, hotness or links
+    generation INTEGER NOT NULL,    -- bumped on every publish, replicas adopt what they haven't seen
+    meta TEXT NOT NULL,             -- JSON: versions, timestamps, vote mark
+    payload BLOB NOT NULL,          -- gzipped CSV (catalog) or JSON
+    replica TEXT NOT NULL,
+    published_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS votes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    tool_id INTEGER NOT NULL,
+    voter INTEGER NOT NULL,
+    voted_at REAL NOT NULL,
+    replica TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+"""
+
+
+class SharedCache:
+    """One replica's handle on the shared cache file
+
+    Publishing and polling never raise: if the file is unavailable the replica keeps
+    working from its own caches, exactly as a single process would.
+    """
+
+    def __init__(self, path, poll_interval=SHARED_CACHE_POLL_INTERVAL, replica=None):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.replica = replica or f"{socket.gethostname()}-{os.getpid()}"
+        self.stats = {'published': 0, 'adopted': 0, 'votes_sent': 0, 'votes_replayed': 0,
+                      'leases_won': 0, 'leases_lost': 0}
+        self._seen = {}  # kind -> generation this replica already has
+        self._polled_at = 0.0
+        self._lease_lost = {}
+        self._local = threading.local()
+        self._sync_lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(SCHEMA)
+        # Votes cast before this replica started arrive with the next hotness publication
+        self._last_vote = self.vote_mark()
+
+    def _connect(self):
+        """This thread's connection (autocommit, every statement is its own transaction)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._local.conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    # Refresh leases
+
+    def try_lease(self, name, seconds):
+        """Claim the refresh called name for `seconds` unless another replica holds it
+
+        The winner reads Sheets and publishes, the others keep serving until the result
+        arrives with their next poll. Losers only retry once per poll interval.
+        """
+        now = time.time()
+        if now - self._lease_lost.get(name, 0) < self.poll_interval:
+            return False
+        try:
+            claimed = self._connect().execute(
+                "INSERT INTO leases VALUES (?, ?, ?) ON CONFLICT(name) DO UPDATE "
+                "SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE leases.owner = excluded.owner OR leases.expires_at <= ?",
+                (name, self.replica, now + seconds, now),
+            ).rowcount > 0
+        except sqlite3.Error as e:
+            print(f"❌ Shared cache lease failed, refreshing locally: {e}")
+            return True
+        self.stats['leases_won' if claimed else 'leases_lost'] += 1
+        if not claimed:
+            self._lease_lost[name] = now
+        return claimed
+
+    def adopt_fresh_catalog(self, max_age, wait=SHEETS_TIMEOUT * 3):
+        """Catalog another replica published less than max_age ago, None if this replica should
+        read Sheets itself
+
+        Used on cold starts: while another replica holds the catalog lease its fetch is awaited
+        (up to `wait` seconds) instead of every booting replica reading Sheets at once.
+        """
+        deadline = time.monotonic() + wait
+        while True:
+            self.sync(force=True)
+            current = get_snapshot_store().current()
+            if current is not None and current.source == "sheets" and current.age() < max_age:
+                return current
+            if time.monotonic() >= deadline or self.try_lease("catalog", max_age):
+                return None
+            time.sleep(0.2)
+
+    # Publishing
+
+    def publish_catalog(self, snapshot):
+        """Share a catalog fetched from Sheets (hotness travels separately, see publish_hotness)"""
+        buffer = io.StringIO()
+        snapshot.frame.to_csv(buffer, index=False)
+        meta = {'content_version': snapshot.content_version, 'created_at': snapshot.created_at, 'rows': len(snapshot)}
+        self._publish('catalog', meta, gzip.compress(buffer.getvalue().encode('utf-8'), compresslevel=6))
+
+    def publish_hotness(self, counters, hotness_at=None):
+        """Share counters rebuilt from the Hotness worksheets, then replay the vote deltas they lack into them"""
+        meta = {'hotness_at': hotness_at or time.time(), 'vote_mark': counters.vote_mark or 0}
+        payload = json.dumps(counters.counts_rows(), separators=(',', ':'))
+        try:
+            previous_mark = self._meta('hotness').get('vote_mark', 0)
+            if not self._publish('hotness', meta, gzip.compress(payload.encode('utf-8'))):
+                return counters
+            # Deltas up to both marks were cast before both reads, drop the ones the read counted. A vote
+            # the circuit breaker queued reaches the sheet only when the queue is flushed, so its delta
+            # stays (and is replayed) until a read has it
+            conn = self._connect()
+            done = conn.execute("SELECT id, tool_id, voter FROM votes WHERE id <= ?",
+                                (min(previous_mark, meta['vote_mark']),)).fetchall()
+            conn.executemany("DELETE FROM votes WHERE id = ?",
+                             [(vote_id,) for vote_id, tool_id, voter in done if counters.has_voted(tool_id, format(voter, 'x'))])
+            self._replay(counters, 0)
+        except sqlite3.Error as e:
+            print(f"❌ Shared cache vote replay failed: {e}")
+        return counters
+
+    def publish_links(self, entries):
+        """Share link check results ({url: [status, detail, checked_at]}) so only one replica checks"""
+        payload = json.dumps(entries, separators=(',', ':'))
+        self._publish('links', {'links': len(entries)}, gzip.compress(payload.encode('utf-8')))
+
+    def publish_vote(self, tool_id, voter, voted_at):
+        """Append one vote delta for the other replicas (voter is the integer voter digest)"""
+        try:
+            self._connect().execute(
+                "INSERT INTO votes (tool_id, voter, voted_at, replica) VALUES (?, ?, ?, ?)",
+                (int(tool_id), int(voter), float(voted_at), self.replica),
+            )
+            self.stats['votes_sent'] += 1
+        except sqlite3.Error as e:
+            print(f"❌ Could not share vote with other replicas: {e}")
+
+    def vote_mark(self):
+        """ID of the newest vote delta (0 if none yet)"""
+        try:
+            return self._connect().execute("SELECT COALESCE(MAX(id), 0) FROM votes").fetchone()[0]
+        except sqlite3.Error:
+            return 0
+
+    def _publish(self, kind, meta, payload):
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(
+                    "INSERT INTO published VALUES (?, 1, ?, ?, ?, ?) ON CONFLICT(kind) DO UPDATE "
+                    "SET generation = generation + 1, meta = excluded.meta, payload = excluded.payload, "
+                    "replica = excluded.replica, published_at = excluded.published_at",
+                    (kind, json.dumps(meta), payload, self.replica, time.time()),
+                )
+                generation = conn.execute("SELECT generation FROM published WHERE kind = ?", (kind,)).fetchone()[0]
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        except sqlite3.Error as e:
+            print(f"❌ Could not publish {kind} to the shared cache: {e}")
+            return False
+
+        self._seen[kind] = generation  # Nothing to adopt from our own publication
+        self.stats['published'] += 1
+        print(f"🤝 Published {kind} #{generation} to the shared cache ({len(payload) / 1024:.0f} KiB)")
+        return True
+
+    def _meta(self, kind):
+        row = self._connect().execute("SELECT meta FROM published WHERE kind = ?", (kind,)).fetchone()
+        return json.loads(row[0]) if row else {}
+
+    # Polling
+
+    def sync(self, force=False):
+        """Adopt whatever other replicas published since the last poll, True if anything changed
+
+        Polls at most once per poll_interval (force skips the wait) and from one thread at a time.
+        """
+        if not force and time.monotonic() - self._polled_at < self.poll_interval:
+            return False
+        if not self._sync_lock.acquire(blocking=False):
+            return False
+        try:
+            self._polled_at = time.monotonic()
+            return self._sync()
+        except Exception as e:
+            print(f"❌ Shared cache sync failed: {e}")
+            return False
+        finally:
+            self._sync_lock.release()
+
+    def _sync(self):
+        from link_health import with_link_status
+
+        conn = self._connect()
+        generations = dict(conn.execute("SELECT kind, generation FROM published").fetchall())
+        changed = {kind for kind, generation in generations.items() if self._seen.get(kind) != generation}
+        store = get_snapshot_store()
+
+        catalog = self._adopt_catalog(generations['catalog']) if 'catalog' in changed else None
+        if 'hotness' in changed:
+            counters, hotness_at = self._adopt_hotness(generations['hotness'])
+            replayed = True
+        else:
+            counters, hotness_at = get_hotness_counters(), None
+            replayed = self._replay(counters, self._last_vote, skip_own=True) > 0
+
+        current = store.current()
+        if hotness_at is None and current is not None:
+            hotness_at = current.hotness_at
+        if catalog is not None:
+            store.publish(with_link_status(catalog.with_hotness(counters, hotness_at=hotness_at)))
+            get_detail_cache().reset_for(catalog.content_version)
+        elif replayed:
+            store.update(lambda snapshot: snapshot.with_hotness(counters, hotness_at=hotness_at))
+
+        links = 'links' in changed and self._adopt_links(generations['links'])
+        return catalog is not None or replayed or links
+
+    def _adopt_catalog(self, generation):
+        from data_manager import read_catalog_csv
+
+        meta, payload = self._fetch('catalog')
+        frame = read_catalog_csv(io.BytesIO(gzip.decompress(payload)))
+        self._adopted('catalog', generation)
+        return CatalogSnapshot(frame, meta['content_version'], created_at=meta['created_at'], copy=False)
+
+    def _adopt_hotness(self, generation):
+        meta, payload = self._fetch('hotness')
+        counters = HotnessCounters().load_counts(dict(zip(COUNTS_HEADERS, row)) for row in json.loads(gzip.decompress(payload)))
+        counters.loaded_at = meta['hotness_at']
+        counters.vote_mark = meta['vote_mark']
+        # Every delta still shared, including our own: voter dedup skips the ones the publisher's read
+        # counted, the others are newer than the read or not in the sheet yet
+        self._replay(counters, 0)
+        self._adopted('hotness', generation)
+        return set_hotness_counters(counters), meta['hotness_at']
+
+    def _adopt_links(self, generation):
+        from link_health import get_link_health, with_link_status
+
+        _, payload = self._fetch('links')
+        if get_link_health().put_many(json.loads(gzip.decompress(payload))):
+            get_snapshot_store().update(with_link_status)
+        self._adopted('links', generation)
+        return True
+
+    def _fetch(self, kind):
+        meta, payload = self._connect().execute("SELECT meta, payload FROM published WHERE kind = ?", (kind,)).fetchone()
+        return json.loads(meta), payload
+
+    def _adopted(self, kind, generation):
+        self._seen[kind] = generation
+        self.stats['adopted'] += 1
+        print(f"🤝 Adopted {kind} #{generation} from the shared cache")
+
+    def _replay(self, counters, after, skip_own=False):
+        """Count vote deltas newer than `after` into counters, returns how many were new"""
+        rows = self._connect().execute(
+            "SELECT id, tool_id, voter, voted_at, replica FROM votes WHERE id > ? ORDER BY id", (after,)
+        ).fetchall()
+        replayed = 0
+        for vote_id, tool_id, voter, voted_at, replica in rows:
+            if not (skip_own and replica == self.replica) and counters.add_once(tool_id, voted_at, voter):
+                replayed += 1
+        if rows:
+            self._last_vote = max(self._last_vote, rows[-1][0])
+        self.stats['votes_replayed'] += replayed
+        return replayed
+
+    def status(self):
+        """Generations and counters for diagnostics"""
+        return {'path': self.path, 'replica': self.replica, 'seen': dict(self._seen),
+                'last_vote': self._last_vote, **self.stats}
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_cache():
+    """This process's handle on the shared cache, None when SHARED_CACHE_PATH isn't set"""
+    global _shared
+    if not SHARED_CACHE_PATH:
+        return None
+    with _shared_lock:
+        if _shared is None:
+            try:
+                _shared = SharedCache(SHARED_CACHE_PATH)
+                print(f"🤝 Shared cache at {SHARED_CACHE_PATH} (replica {_shared.replica})")
+            except (sqlite3.Error, OSError) as e:
+                print(f"❌ Shared cache unavailable, caching per process: {e}")
+                _shared = False  # Don't retry on every rerun
+        return _shared or None
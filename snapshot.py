@@ -0,0 +1,205 @@
+"""
+Shared catalog snapshot for aINeedToKnow - one immutable, versioned copy of the catalog
+per process that every session reads without pickling or copying
+"""
+import threading
+import time
+from datetime import datetime
+import pandas as pd
+
+# Copy-on-Write makes every frame handed out by a snapshot safe to modify: the first write
+# copies the touched column instead of reaching the shared buffers (always on in pandas >= 3).
+# Every entry point (app, feed API, maintenance CLI) reads the catalog through this module.
+if int(pd.__version__.split('.')[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+
+class CatalogSnapshot:
+    """Immutable catalog frame plus its hotness and link status overlays
+
+    Frames handed out share the snapshot's buffers, which is safe with pandas Copy-on-Write
+    (turned on above). Their column arrays are read-only, so even a stray in-place write fails loudly.
+    """
+
+    __slots__ = ('version', 'content_version', 'hotness_revision', 'link_revision', 'source',
+                 'created_at', 'hotness_at', '_frame', '_hotness_counts')
+
+    def __init__(self, frame, content_version, hotness_counts=None, hotness_revision=0,
+                 source="sheets", created_at=None, hotness_at=None, copy=True, link_revision=0):
+        # Own the buffers: a snapshot must never share them with a frame someone else can write to
+        if copy:
+            frame = frame.copy()
+        hotness_counts = dict(hotness_counts or {})
+
+        now = time.time()
+        set_slot = object.__setattr__
+        set_slot(self, '_frame', frame)
+        set_slot(self, '_hotness_counts', hotness_counts)
+        set_slot(self, 'content_version', content_version)
+        set_slot(self, 'hotness_revision', hotness_revision)
+        set_slot(self, 'link_revision', link_revision)
+        set_slot(self, 'version', f"{content_version}.{hotness_revision}.{link_revision}")
+        set_slot(self, 'source', source)
+        set_slot(self, 'created_at', created_at or now)
+        set_slot(self, 'hotness_at', hotness_at or now)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("CatalogSnapshot is immutable, publish a new one instead")
+
+    def __delattr__(self, name):
+        raise AttributeError("CatalogSnapshot is immutable, publish a new one instead")
+
+    def __len__(self):
+        return len(self._frame)
+
+    @property
+    def frame(self):
+        """Zero-copy view of the catalog: shares the column buffers, copies only on write"""
+        return self._frame.copy(deep=False)
+
+    @property
+    def empty(self):
+        return self._frame.empty
+
+    def hotness_counts(self):
+        return dict(self._hotness_counts)
+
+    def age(self):
+        """Seconds since the catalog was fetched"""
+        return time.time() - self.created_at
+
+    def hotness_age(self):
+        """Seconds since the hotness overlay was fetched"""
+        return time.time() - self.hotness_at
+
+    def with_hotness(self, counters, hotness_at=None):
+        """New snapshot sharing this catalog with a fresh hotness overlay from HotnessCounters"""
+        frame = self._frame.copy(deep=False)
+        overlay = pd.DataFrame(counters.overlay()).set_index('tool_id')
+        if not frame.empty:
+            # One integer-keyed reindex aligns every hotness column with the catalog rows
+            hotness = overlay.reindex(frame['tool_id'].to_numpy(), fill_value=0)
+            for column in overlay.columns:
+                frame[column] = hotness[column].to_numpy(dtype=overlay[column].dtype)
+        return CatalogSnapshot(
+            frame, self.content_version, dict(zip(overlay.index.tolist(), overlay['hotness_count'].tolist())),
+            hotness_revision=self.hotness_revision + 1, source=self.source,
+            created_at=self.created_at, hotness_at=hotness_at, copy=False, link_revision=self.link_revision,
+        )
+
+    def with_link_status(self, statuses):
+        """New snapshot sharing this catalog with a link_status column from {url: status}
+        (links not checked yet are "")"""
+        frame = self._frame.copy(deep=False)
+        if not frame.empty and 'Source_URL' in frame.columns:
+            status = frame['Source_URL'].astype(str).str.strip().map(statuses).fillna('')
+            frame['link_status'] = status.astype('category')
+        return CatalogSnapshot(
+            frame, self.content_version, self._hotness_counts,
+            hotness_revision=self.hotness_revision, source=self.source,
+            created_at=self.created_at, hotness_at=self.hotness_at, copy=False, link_revision=self.link_revision + 1,
+        )
+
+    def info(self):
+        """Snapshot metadata for diagnostics"""
+        return {
+            'version': self.version,
+            'source': self.source,
+            'rows': len(self),
+            'created_at': datetime.fromtimestamp(self.created_at),
+            'hotness_at': datetime.fromtimestamp(self.hotness_at),
+        }
+
+
+class SnapshotStore:
+    """Process-wide holder of the current snapshot; publishing swaps one reference"""
+
+    def __init__(self):
+        self._current = None
+        self._lock = threading.Lock()
+        self._refreshing = threading.Lock()
+
+    def current(self):
+        return self._current
+
+    def publish(self, snapshot):
+        with self._lock:
+            self._current = snapshot
+        print(f"📸 Published catalog snapshot {snapshot.version} ({len(snapshot)} tools, {snapshot.source})")
+        return snapshot
+
+    def update(self, change):
+        """Atomically publish change(current) - used for small overlays like a single vote"""
+        with self._lock:
+            if self._current is None:
+                return None
+            self._current = change(self._current)
+            return self._current
+
+    def try_begin_refresh(self):
+        """Claim the refresh slot so concurrent sessions don't stampede Google Sheets"""
+        return self._refreshing.acquire(blocking=False)
+
+    def begin_refresh(self):
+        """Wait for the refresh slot (used when there is nothing to serve yet)"""
+        self._refreshing.acquire()
+
+    def end_refresh(self):
+        self._refreshing.release()
+
+
+class DetailCache:
+    """Process-wide cache of detail fields (e.g. Integration_Steps) keyed by tool ID
+
+    The list snapshot leaves these long columns out; they are loaded for the tiles on
+    screen (and the next page) and when a tile is flipped.
+    """
+
+    def __init__(self):
+        self._details = {}
+        self._content_version = None
+        self._lock = threading.Lock()
+        # Bumped whenever details arrive, so the search index picks them up incrementally
+        self.revision = 0
+
+    def reset_for(self, content_version):
+        """Drop cached details when the catalog content changed (tool IDs may point elsewhere)"""
+        with self._lock:
+            if self._content_version != content_version:
+                self._details = {}
+                self._content_version = content_version
+                self.revision += 1
+
+    def get_many(self, tool_ids):
+        """Cached details for tool_ids, plus the IDs that still need fetching"""
+        with self._lock:
+            found = {tool_id: self._details[tool_id] for tool_id in tool_ids if tool_id in self._details}
+        missing = [tool_id for tool_id in tool_ids if tool_id not in found]
+        return found, missing
+
+    def put_many(self, details):
+        with self._lock:
+            if any(self._details.get(tool_id) != value for tool_id, value in details.items()):
+                self._details.update(details)
+                self.revision += 1
+
+    def all(self):
+        with self._lock:
+            return dict(self._details)
+
+    def __len__(self):
+        return len(self._details)
+
+
+_store = SnapshotStore()
+_details = DetailCache()
+
+
+def get_snapshot_store():
+    """The catalog snapshot store shared by every session in this process"""
+    return _store
+
+
+def get_detail_cache():
+    """The tool detail cache shared by every session in this process"""
+    return _details
@@ -0,0 +1,259 @@
+"""
+Static export for aINeedToKnow - pre-renders the ranked catalog (feed with spotlight, domain
+pages, tool pages) to plain HTML and JSON files that any web server or CDN can serve
+
+Every file's inputs are fingerprinted in a manifest, so a re-export only rewrites the pages
+whose tools' content, hotness or position changed, and deletes the ones that disappeared.
+"""
+import hashlib
+import html
+import json
+import os
+import re
+import time
+from config import *
+from api import CatalogViews, tool_record
+from snapshot import get_detail_cache
+
+MANIFEST = "manifest.json"
+EXPORT_PAGE_SIZE = 30
+
+
+def slugify(text):
+    return re.sub(r'[^a-z0-9]+', '-', str(text).lower()).strip('-') or 'general'
+
+
+def domain_slugs(domains):
+    """{domain: slug}, numbering domains whose names slugify alike ("AI & ML", "AI/ML") in sorted order"""
+    slugs = {}
+    taken = set()
+    for domain in sorted(domains):
+        base = slug = slugify(domain)
+        number = 1
+        while slug in taken:
+            number += 1
+            slug = f"{base}-{number}"
+        taken.add(slug)
+        slugs[domain] = slug
+    return slugs
+
+
+def fingerprint(value):
+    return hashlib.sha1(json.dumps(value, sort_keys=True, default=str).encode('utf-8')).hexdigest()[:16]
+
+
+class StaticExporter:
+    """Renders one snapshot into out_dir, incrementally against the previous export's manifest"""
+
+    def __init__(self, out_dir, data_manager=None, page_size=EXPORT_PAGE_SIZE):
+        self.out_dir = out_dir
+        self.data_manager = data_manager
+        self.page_size = page_size
+        self.files = {}
+        self.stats = {'written': 0, 'unchanged': 0, 'removed': 0}
+        self.slugs = {}
+
+    def export(self, snapshot):
+        """Write every page of the snapshot, return counts of written/unchanged/removed files"""
+        started = time.monotonic()
+        previous = self._read_manifest()
+        self.files = {}
+        self.stats = {'written': 0, 'unchanged': 0, 'removed': 0}
+
+        views = CatalogViews(snapshot)
+        frame = views.frame
+        details = self._details(frame, previous)
+        records = {}
+        for row in frame.to_dict('records'):
+            record = tool_record(row)
+            # Trending decays every second, the static pages keep the vote counts only
+            del record['hotness']['trending']
+            record['details'] = {column: details.get(record['tool_id'], {}).get(column, '') for column in DETAIL_COLUMNS}
+            records[record['tool_id']] = record
+        tool_prints = {tool_id: fingerprint(record) for tool_id, record in records.items()}
+        ranked = [int(tool_id) for tool_id in frame['tool_id'].to_numpy()[views.ranked]]
+
+        # Spotlight: same rule as the app's feed
+        spotlight = None
+        if ranked and records[ranked[0]]['hotness']['week'] >= SPOTLIGHT_MIN_VOTES:
+            spotlight, ranked = records[ranked[0]], ranked[1:]
+
+        domains = sorted(views.facets.domains)
+        self.slugs = domain_slugs(domains)
+        self._list_pages("feed", "🤖 AI Tools & Insights", ranked, records, tool_prints, domains, previous,
+                         spotlight=spotlight)
+        for domain in domains:
+            tool_ids = [tool_id for tool_id in ranked if records[tool_id]['domain'] == domain]
+            self._list_pages(f"domains/{self.slugs[domain]}", f"🔍 {domain}", tool_ids, records, tool_prints,
+                             domains, previous)
+        domains_print = fingerprint(domains)  # Every page links to every domain
+        for tool_id, record in records.items():
+            self._write(f"tools/{tool_id}.json", tool_prints[tool_id], previous,
+                        lambda: json.dumps({'tool': record}))
+            self._write(f"tools/{tool_id}.html", f"{tool_prints[tool_id]}:{domains_print}", previous,
+                        lambda: self._tool_page(record, domains))
+
+        for path in set(previous) - set(self.files):
+            full_path = os.path.join(self.out_dir, path)
+            if os.path.exists(full_path):
+                os.remove(full_path)
+            self.stats['removed'] += 1
+
+        self._atomic_write(MANIFEST, json.dumps({'version': snapshot.version, 'files': self.files}, indent=0))
+        self.stats['seconds'] = round(time.monotonic() - started, 2)
+        print(f"🗂️ Static export of {snapshot.version} to {self.out_dir}: {self.stats['written']} written, "
+              f"{self.stats['unchanged']} unchanged, {self.stats['removed']} removed in {self.stats['seconds']}s")
+        return self.stats
+
+    def _details(self, frame, previous):
+        """Detail fields for every tool: the shared cache, else the whole columns from Google Sheets,
+        else the tool's page from the last export (so an offline re-export keeps its integration steps)"""
+        details, missing = get_detail_cache().get_many(frame['tool_id'].tolist())
+        if missing and self.data_manager is not None and self.data_manager.sheet:
+            try:
+                details.update(self.data_manager.load_all_details(frame))
+            except Exception as e:
+                print(f"⚠️ Could not load tool details from Google Sheets: {e}")
+            missing = [tool_id for tool_id in missing if tool_id not in details]
+
+        for tool_id in missing:
+            path = f"tools/{tool_id}.json"
+            if path not in previous:
+                continue
+            try:
+                with open(os.path.join(self.out_dir, path), encoding='utf-8') as f:
+                    details[tool_id] = json.load(f)['tool']['details']
+            except (OSError, ValueError, KeyError):
+                pass
+        return details
+
+    def _list_pages(self, prefix, title, tool_ids, records, tool_prints, domains, previous, spotlight=None):
+        """prefix/<n>.html and .json per page (the feed's first page is also the site's index.html)"""
+        total_pages = max((len(tool_ids) - 1) // self.page_size + 1, 1)
+        root = "../" * (prefix.count('/') + 1)
+        for page in range(1, total_pages + 1):
+            page_ids = tool_ids[(page - 1) * self.page_size:page * self.page_size]
+            page_spotlight = spotlight if page == 1 else None
+            # A page changes when one of its tools does, when tools move between pages or when the nav changes
+            inputs = fingerprint([title, page, total_pages, len(tool_ids), domains,
+                                  page_spotlight and tool_prints[page_spotlight['tool_id']],
+                                  [(tool_id, tool_prints[tool_id]) for tool_id in page_ids]])
+            page_records = [records[tool_id] for tool_id in page_ids]
+
+            self._write(f"{prefix}/{page}.json", inputs, previous, lambda: json.dumps({
+                'spotlight': page_spotlight, 'total': len(tool_ids), 'page': page, 'per_page': self.page_size,
+                'tools': page_records,
+            }))
+            self._write(f"{prefix}/{page}.html", inputs, previous, lambda: self._list_page(
+                root, prefix, title, page, total_pages, len(tool_ids), page_records, domains, page_spotlight))
+            if prefix == "feed" and page == 1:
+                self._write("index.html", inputs, previous, lambda: self._list_page(
+                    "", prefix, title, page, total_pages, len(tool_ids), page_records, domains, page_spotlight))
+
+    def _write(self, path, inputs, previous, render):
+        """Write render() to path unless the last export wrote it from the same inputs"""
+        self.files[path] = inputs
+        if previous.get(path) == inputs and os.path.exists(os.path.join(self.out_dir, path)):
+            self.stats['unchanged'] += 1
+            return
+        self._atomic_write(path, render())
+        self.stats['written'] += 1
+
+    def _atomic_write(self, path, content):
+        # Readers never see a half-written page: write aside, then rename over the old file
+        full_path = os.path.join(self.out_dir, path)
+        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+        temp_path = f"{full_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(temp_path, full_path)
+
+    def _read_manifest(self):
+        try:
+            with open(os.path.join(self.out_dir, MANIFEST), encoding='utf-8') as f:
+                return json.load(f).get('files', {})
+        except (OSError, ValueError):
+            return {}
+
+    # HTML
+
+    def _slug(self, domain):
+        return self.slugs.get(domain) or slugify(domain)
+
+    def _layout(self, root, heading, body, domains):
+        nav = ' '.join(
+            f'<a class="pill" href="{root}domains/{self._slug(domain)}/1.html" '
+            f'style="color: {DOMAIN_COLORS.get(domain, "#667eea")}">{html.escape(domain)}</a>'
+            for domain in domains
+        )
+        return f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>{html.escape(APP_TITLE)} - {html.escape(heading)}</title>
+<style>
+    body {{ margin: 0 auto; max-width: 1200px; padding: 1rem; font-family: sans-serif; background: #0e1117; color: #fafafa; }}
+    a {{ color: inherit; }}
+    .tagline, .meta, .note {{ color: #a0aec0; }}
+    .grid {{ display: grid; grid-template-columns: repeat(auto-fill, minmax(min(100%, {MOBILE_BREAKPOINT // 2}px), 1fr)); gap: 1rem; }}
+    .tile {{ border: 1px solid rgba(250, 250, 250, 0.2); border-radius: 0.5rem; padding: 1rem; background: #1a1c24; }}
+    .spotlight {{ border: 3px solid #ffd700; box-shadow: 0 8px 25px rgba(255, 215, 0, 0.3); margin-bottom: 2rem; }}
+    .pill {{ display: inline-block; padding: 2px 8px; border-radius: 12px; background: #ffffff10; text-decoration: none; margin: 2px; }}
+    .pages {{ text-align: center; margin: 2rem 0; }}
+    .pages a {{ margin: 0 0.5rem; }}
+</style>
+</head>
+<body>
+<header>
+    <h1><a href="{root}index.html" style="text-decoration: none">{html.escape(APP_TITLE)}</a></h1>
+    <div class="tagline">{html.escape(APP_TAGLINE)}</div>
+    <nav style="margin: 1rem 0">{nav}</nav>
+</header>
+<h2>{html.escape(heading)}</h2>
+{body}
+</body>
+</html>
+"""
+
+    def _tile(self, root, record, spotlight=False):
+        color = DOMAIN_COLORS.get(record['domain'], "#667eea")
+        hotness = record['hotness']
+        visit = (f' • <a href="{html.escape(record["source_url"])}" target="_blank" rel="noopener">🔗 Visit Tool</a>'
+                 if record['source_url'] else '')
+        badge = '<div style="color: #ffd700; font-weight: 700">🏆 MOST TEMPTING AI TOOL</div>' if spotlight else ''
+        return f"""<article class="tile{' spotlight' if spotlight else ''}">
+    {badge}
+    <h3>🤖 <a href="{root}tools/{record['tool_id']}.html">{html.escape(record['title'])}</a></h3>
+    <p style="color: {color}">{html.escape(record['summary'])}</p>
+    <div class="meta">
+        <a class="pill" href="{root}domains/{self._slug(record['domain'])}/1.html" style="color: {color}">{html.escape(record['domain'])}</a>
+        {html.escape(record['author'])} • 📅 {record['date_added'] or 'Recent'} •
+        🔥 {hotness['total']} ({hotness['today']} today, {hotness['week']} this week){visit}
+    </div>
+</article>"""
+
+    def _list_page(self, root, prefix, title, page, total_pages, total, records, domains, spotlight):
+        links = []
+        if page > 1:
+            links.append(f'<a href="{root}{prefix}/{page - 1}.html">◀️ Previous</a>')
+        links.append(f'Page {page} of {total_pages}')
+        if page < total_pages:
+            links.append(f'<a href="{root}{prefix}/{page + 1}.html">Next ▶️</a>')
+
+        body = (self._tile(root, spotlight, spotlight=True) if spotlight else '') + f"""
+<div class="meta">{total} tools • sorted by hotness 🔥</div>
+<div class="grid">
+{''.join(self._tile(root, record) for record in records)}
+</div>
+<div class="pages">{' '.join(links)}</div>"""
+        return self._layout(root, title, body, domains)
+
+    def _tool_page(self, record, domains):
+        steps = [step.strip() for step in str(record['details'].get('Integration_Steps', '')).split('\n') if step.strip()]
+        steps_html = ('<ul>' + ''.join(f'<li>{html.escape(step)}</li>' for step in steps) + '</ul>' if steps
+                      else '<p class="note">Integration steps will be available soon.</p>')
+        body = self._tile("../", record) + f"""
+<h3>🚀 How to Integrate: {html.escape(record['title'])}</h3>
+{steps_html}"""
+        return self._layout("../", record['title'], body, domains)
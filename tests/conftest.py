@@ -0,0 +1,38 @@
+import os
+import sys
+import pytest
+
+# The modules live at the repository root, next to app.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Voter digests are keyed with this instead of a secret generated under cache/
+os.environ.setdefault("VOTER_KEY_SECRET", "tests")
+
+
+@pytest.fixture
+def standin_spreadsheet():
+    """Spreadsheet of local stand-in worksheets (see benchmark.py) instead of Google Sheets"""
+    from benchmark import StandInSpreadsheet
+
+    return StandInSpreadsheet()
+
+
+@pytest.fixture
+def synthetic_catalog():
+    """Builds a cleaned synthetic catalog frame of the given number of tools"""
+    from benchmark import synthetic_catalog
+
+    return synthetic_catalog
+
+
+@pytest.fixture
+def standin_data_manager(monkeypatch, tmp_path):
+    """Builds a DataManager wired to stand-in worksheets holding the given number of tools"""
+    import benchmark
+    import data_manager
+
+    monkeypatch.setattr(data_manager, 'NEWS_CACHE_PATH', str(tmp_path / "news_cache.csv"))
+    monkeypatch.setattr(data_manager, 'USERS_CSV_PATH', str(tmp_path / "users.csv"))
+    # The synthetic tools link to made-up hosts, refreshes must not go and check them
+    monkeypatch.setattr(data_manager, 'start_link_check', lambda: None)
+    return benchmark.standin_data_manager
@@ -0,0 +1,87 @@
+import json
+import socket
+import pandas as pd
+from api import FeedAPI, start_api_server
+from hotness import HotnessCounters
+from snapshot import CatalogSnapshot
+
+
+def snapshot():
+    frame = pd.DataFrame({
+        'tool_id': [1, 2, 3],
+        'sheet_row': [2, 3, 4],
+        'Title': ["SQL Copilot", "Meeting Notes", "Sheet Helper"],
+        'Summary': ["Writes sql", "Summarizes meetings", "Fills spreadsheets"],
+        'Source_URL': ["https://a.example", "https://b.example", "https://c.example"],
+        'Author/Company': ["Acme", "Beta", "Acme"],
+        'Domain': ["Data", "Meetings", "Data"],
+        'Date_Added': pd.to_datetime(["2025-01-01", "2025-02-01", None]),
+    })
+    counters = HotnessCounters()
+    counters.add(3, 1_700_000_000)
+    return CatalogSnapshot(frame, "v1").with_hotness(counters)
+
+
+def feed_api(current):
+    api = FeedAPI()
+    api.current_snapshot = lambda: current[0]
+    api.connected_data_manager = lambda: None
+    return api
+
+
+def test_feed_etag_and_conditional_request():
+    api = feed_api([snapshot()])
+    status, headers, body = api.handle('/api/feed')
+    assert status == 200
+    assert [tool['tool_id'] for tool in json.loads(body)['tools']] == [3, 2, 1]
+
+    status, again, body = api.handle('/api/feed', if_none_match=f'"other", {headers["ETag"]}')
+    assert (status, body, again['ETag']) == (304, b'', headers['ETag'])
+
+
+def test_errors_and_loading():
+    current = [None]
+    api = feed_api(current)
+    assert api.handle('/api/feed')[0] == 503
+
+    current[0] = snapshot()
+    assert api.handle('/api/domains/Dat')[0] == 404
+    assert api.handle('/api/search')[0] == 400
+    status, _, body = api.handle('/api/domains/Data')
+    assert status == 200 and json.loads(body)['total'] == 2
+
+
+def test_hotness_update_reranks_without_rebuilding_indexes():
+    current = [snapshot()]
+    api = feed_api(current)
+    status, headers, _ = api.handle('/api/feed')
+    views = api._views
+
+    counters = HotnessCounters()
+    counters.add(1, 1_700_000_000)
+    counters.add(1, 1_700_000_001)
+    current[0] = current[0].with_hotness(counters)
+    status, new_headers, body = api.handle('/api/feed', if_none_match=headers['ETag'])
+    assert status == 200 and new_headers['ETag'] != headers['ETag']
+    assert json.loads(body)['tools'][0]['tool_id'] == 1
+    assert api._views.indexes is views.indexes
+    ranked = api._views.ranked
+
+    # A link status update keeps the ranking too
+    current[0] = current[0].with_link_status({})
+    api.handle('/api/feed')
+    assert api._views.ranked is ranked and api._views.indexes is views.indexes
+
+
+def test_launcher_keeps_going_when_the_port_is_taken():
+    with socket.socket() as taken:
+        taken.bind(('127.0.0.1', 0))
+        taken.listen()
+        assert start_api_server(taken.getsockname()[1]) is None
+
+    server = start_api_server(0)
+    try:
+        assert server.server_address[0] == '127.0.0.1'
+    finally:
+        server.shutdown()
+        server.server_close()
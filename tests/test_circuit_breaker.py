@@ -0,0 +1,84 @@
+import threading
+import pytest
+from circuit_breaker import CircuitBreaker, CircuitOpenError
+
+
+class BackendError(Exception):
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+class Backend:
+    """Records writes, failing the next ones with the queued HTTP codes"""
+
+    def __init__(self):
+        self.rows = []
+        self.failures = []
+
+    def write(self, row):
+        if self.failures:
+            raise BackendError(self.failures.pop(0))
+        self.rows.append(row)
+
+
+def breaker(**kwargs):
+    return CircuitBreaker("test", failure_threshold=2, probe_interval=60, failure_types=(BackendError,),
+                          retryable=lambda error: error.code >= 500 or error.code == 429, **kwargs)
+
+
+def test_opens_after_threshold_and_fails_fast():
+    backend, circuit = Backend(), breaker()
+    backend.failures = [503, 503]
+    for _ in range(2):
+        with pytest.raises(BackendError):
+            circuit.call(backend.write, 1)
+    assert circuit.is_open()
+    with pytest.raises(CircuitOpenError):
+        circuit.call(backend.write, 1)
+
+
+def test_queued_write_is_replayed_after_a_success_while_closed():
+    backend, circuit = Backend(), breaker()
+    backend.failures = [503]
+    with pytest.raises(BackendError):
+        circuit.call(backend.write, "vote")
+    circuit.enqueue("vote", backend.write, "vote")
+    assert not circuit.is_open()
+
+    circuit.call(backend.write, "next")
+    for thread in threading.enumerate():
+        if thread.name == "test-flush":
+            thread.join(5)
+    assert backend.rows == ["next", "vote"]
+    assert circuit.status()['pending_writes'] == 0
+
+
+def test_permanent_failures_are_dead_lettered_not_blocking():
+    backend, circuit = Backend(), breaker()
+    for row in ("bad", "good"):
+        circuit.enqueue(row, backend.write, row)
+    backend.failures = [400]
+
+    circuit.flush()
+    assert backend.rows == ["good"]
+    assert circuit.status()['dead_letters'] == ["bad: HTTP 400"]
+
+
+def test_retryable_failure_keeps_the_queue_in_order():
+    backend, circuit = Backend(), breaker()
+    for row in ("first", "second"):
+        circuit.enqueue(row, backend.write, row)
+    backend.failures = [503]
+
+    circuit.flush()
+    assert backend.rows == [] and circuit.status()['pending_writes'] == 2
+    circuit.flush()
+    assert backend.rows == ["first", "second"]
+
+
+def test_queue_is_bounded():
+    backend, circuit = Backend(), breaker(max_pending=2)
+    assert [circuit.enqueue(str(i), backend.write, i) for i in range(3)] == [True, True, False]
+    assert circuit.status()['dropped_writes'] == 1
+    assert circuit.is_retryable(CircuitOpenError()) and not circuit.is_retryable(BackendError(404))
@@ -0,0 +1,45 @@
+import data_manager
+import pytest
+from snapshot import DetailCache
+
+
+@pytest.fixture
+def detail_cache(monkeypatch):
+    cache = DetailCache()
+    monkeypatch.setattr(data_manager, 'get_detail_cache', lambda: cache)
+    return cache
+
+
+def test_details_are_fetched_by_row_and_cached_by_tool(standin_data_manager, synthetic_catalog, detail_cache):
+    dm = standin_data_manager(5)
+    catalog = synthetic_catalog(5)
+    sheet_rows = dict(zip(catalog['tool_id'].tolist(), catalog['sheet_row'].tolist()))
+
+    details = dm.get_tool_details(sheet_rows)
+    assert details == {tool_id: {'Integration_Steps': steps}
+                       for tool_id, steps in zip(catalog['tool_id'].tolist(), catalog['Integration_Steps'])}
+    calls = dm.sheet.api_calls
+    assert dm.get_tool_details(sheet_rows) == details and dm.sheet.api_calls == calls
+
+
+def test_rows_that_moved_since_the_refresh_are_skipped(standin_data_manager, synthetic_catalog, detail_cache):
+    dm = standin_data_manager(5)
+    catalog = synthetic_catalog(5)
+    sheet_rows = dict(zip(catalog['tool_id'].tolist(), catalog['sheet_row'].tolist()))
+    # A tool inserted at the top pushes every other tool one row down
+    dm.sheet.rows.insert(1, ["Brand New Tool", "Summary", "", "", "Data", "Its own steps", "2025-01-01"])
+
+    assert dm.get_tool_details(sheet_rows) == {}
+    assert len(detail_cache) == 0
+    assert dm.load_all_details(catalog) == {}
+
+
+def test_waiting_reuses_the_prefetch_in_flight(standin_data_manager, synthetic_catalog, detail_cache):
+    dm = standin_data_manager(5, latency=0.05)
+    catalog = synthetic_catalog(5)
+    sheet_rows = dict(zip(catalog['tool_id'].tolist(), catalog['sheet_row'].tolist()))
+
+    dm.prefetch_tool_details(sheet_rows)
+    details = dm.wait_for_tool_details(dict(list(sheet_rows.items())[:1]))
+    assert len(details) == 1 and len(detail_cache) == 5
+    assert dm.sheet.api_calls == 2  # The header and one batch_get, both made by the prefetch
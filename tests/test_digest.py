@@ -0,0 +1,91 @@
+import smtplib
+import threading
+import digest
+import pandas as pd
+import pytest
+from digest import DigestBuilder, DigestSender, send_digest
+from hotness import HotnessCounters
+from snapshot import CatalogSnapshot
+
+
+def snapshot():
+    frame = pd.DataFrame({
+        'tool_id': [1, 2, 3],
+        'sheet_row': [2, 3, 4],
+        'Title': ["SQL Copilot", "Meeting Notes", "Sheet Helper"],
+        'Summary': ["Writes sql", "Summarizes meetings", "Fills spreadsheets"],
+        'Source_URL': ["https://a.example", "https://b.example", "https://c.example"],
+        'Author/Company': ["Acme", "Beta", "Acme"],
+        'Domain': ["Data", "Meetings", "Data"],
+        'Date_Added': pd.to_datetime(["2025-01-01", "2025-02-01", "2025-03-01"]),
+    })
+    return CatalogSnapshot(frame, "v1").with_hotness(HotnessCounters())
+
+
+class FakeSMTP:
+    """Stands in for smtplib.SMTP: refuses bounce@ for good, greylists greylisted@ once"""
+
+    lock = threading.Lock()
+    connections = 0
+    delivered = []
+    greylisted = set()
+
+    def __init__(self, host, port, timeout=None):
+        with self.lock:
+            FakeSMTP.connections += 1
+
+    def sendmail(self, sender, recipients, payload):
+        [recipient] = recipients
+        if recipient.startswith("bounce@"):
+            raise smtplib.SMTPRecipientsRefused({recipient: (550, b"No such user")})
+        with self.lock:
+            if recipient.startswith("greylisted@") and recipient not in self.greylisted:
+                self.greylisted.add(recipient)
+                raise smtplib.SMTPResponseException(451, b"Try again later")
+            self.delivered.append((recipient, payload))
+
+    def quit(self):
+        pass
+
+
+@pytest.fixture
+def smtp(monkeypatch):
+    monkeypatch.setattr(digest.smtplib, 'SMTP', FakeSMTP)
+    monkeypatch.setattr(FakeSMTP, 'connections', 0)
+    monkeypatch.setattr(FakeSMTP, 'delivered', [])
+    monkeypatch.setattr(FakeSMTP, 'greylisted', set())
+    return FakeSMTP
+
+
+def test_messages_are_rendered_once_per_segment():
+    builder = DigestBuilder(snapshot())
+    first = builder.message(("Ann", "ann@example.com", ["Data"]))
+    second = builder.message(("Bob", "bob@example.com", ["Data", "Unknown"]))
+    everything = builder.message(("Cy", "cy@example.com", []))
+    assert builder.message(("Dé", "dé@example.com", [])) is None  # Needs SMTPUTF8
+
+    assert builder.segments == 2
+    assert first[1].split(b"\r\n", 1)[1] == second[1].split(b"\r\n", 1)[1]
+    assert b"Meeting Notes" in everything[1] and b"Meeting Notes" not in first[1]
+
+
+def test_sender_reuses_connections_and_retries_temporary_failures(smtp):
+    messages = [(f"user{i}@example.com", b"Subject: hi\r\n\r\nhi") for i in range(20)]
+    messages += [("greylisted@example.com", b"x"), ("bounce@example.com", b"x")]
+
+    stats = DigestSender(host="smtp.test", port=25, concurrency=4, retries=2, backoff=0).send_all(messages)
+    assert stats['sent'] == 21 and stats['retried'] == 1
+    assert [recipient for recipient, _ in stats['failed']] == ["bounce@example.com"]
+    assert 1 <= smtp.connections <= 4  # One per worker, reused for every message
+
+
+def test_dry_run_counts_without_sending(smtp):
+    class Subscribers:
+        def iter_subscribers(self):
+            yield ("Ann", "ann@example.com", ["Data"])
+            yield ("Bob", "bob@example.com", ["Meetings"])
+
+    assert send_digest(Subscribers(), snapshot(), dry_run=True) == {'sent': 0, 'subscribers': 2, 'segments': 2}
+    assert smtp.connections == 0
+    stats = send_digest(Subscribers(), snapshot(), host="smtp.test", port=25, concurrency=1, backoff=0)
+    assert stats['sent'] == 2 and [recipient for recipient, _ in smtp.delivered] == ["ann@example.com", "bob@example.com"]
@@ -0,0 +1,41 @@
+from datetime import datetime, timedelta
+import numpy as np
+import pandas as pd
+from facets import FacetIndex
+
+
+def catalog():
+    today = pd.Timestamp(datetime.now().date())
+    return pd.DataFrame({
+        'Domain': ["AI", "AI Ethics", "Email", "AI", None],
+        'Author/Company': ["Acme", "Beta", "Acme", "Gamma", "Beta"],
+        'Date_Added': [today, today - timedelta(days=10), today - timedelta(days=100), None, today - timedelta(days=3)],
+    })
+
+
+def test_domain_selection_matches_exact_values_only():
+    index = FacetIndex(catalog())
+    assert index.domain_bitmap(["AI"]).tolist() == [True, False, False, True, False]
+    assert index.domain_bitmap(["AI", "Email"]).tolist() == [True, False, True, True, False]
+    assert not index.domain_bitmap(["ai"]).any()
+    assert not index.domain_bitmap(["Unknown"]).any()
+
+
+def test_missing_values_are_not_facets():
+    index = FacetIndex(catalog())
+    assert index.domain_values() == ["AI", "AI Ethics", "Email"]
+    assert index.author_values() == ["Acme", "Beta", "Gamma"]
+
+
+def test_date_windows_skip_undated_rows():
+    index = FacetIndex(catalog())
+    week = index.date_bitmap(start=datetime.now() - timedelta(days=7))
+    assert week.tolist() == [True, False, False, False, True]
+    assert index.date_bitmap().sum() == 4
+
+
+def test_combined_filter_is_an_and_of_facets():
+    index = FacetIndex(catalog())
+    assert index.filter().all()
+    assert index.filter(domains=["AI"], authors=["Acme"]).tolist() == [True, False, False, False, False]
+    assert np.flatnonzero(index.filter(authors=["Beta"], days=30)).tolist() == [1, 4]
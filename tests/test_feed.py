@@ -0,0 +1,105 @@
+import json
+import os
+import data_manager
+import hotness
+import pytest
+import snapshot
+import warmup
+from components import tile_grid as tile_grid_module
+from streamlit.testing.v1 import AppTest
+from ui_state import TileState
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+@pytest.fixture
+def feed(standin_data_manager, monkeypatch):
+    """Runs the app against a stand-in catalog of 100 tools, returning the AppTest"""
+    # Process-wide state the app reads, fresh for each test
+    monkeypatch.setattr(snapshot, '_store', snapshot.SnapshotStore())
+    monkeypatch.setattr(snapshot, '_details', snapshot.DetailCache())
+    monkeypatch.setattr(hotness, '_counters', hotness.HotnessCounters())
+    started = warmup.WarmUp()
+    started._thread = True  # Nothing to warm up, the snapshot is published below
+    monkeypatch.setattr(warmup, '_warm_up', started)
+
+    dm = standin_data_manager(100)
+    snapshot.get_snapshot_store().publish(dm._fetch_fresh_data_with_hotness())
+
+    def run(mobile=False, flipped=()):
+        at = AppTest.from_file(APP_PATH, default_timeout=60)
+        at.session_state['data_manager'] = dm
+        tile_state = TileState()
+        for tool_id in flipped:
+            tile_state.set_flipped(tool_id)
+        at.session_state['tile_state'] = tile_state
+        at.query_params['mobile'] = "1" if mobile else "0"
+        return at.run()
+
+    run.dm = dm
+    return run
+
+
+def grids(at):
+    """Args of every tile grid component on the page"""
+    found = []
+
+    def walk(node):
+        proto = getattr(node, 'proto', None)
+        if type(proto).__name__ == 'ComponentInstance' and proto.component_name.endswith("tile_grid"):
+            found.append(json.loads(proto.json_args))
+        for child in getattr(node, 'children', {}).values():
+            walk(child)
+
+    walk(at.main)
+    return found
+
+
+def wait_for_prefetch():
+    with data_manager._prefetching_lock:
+        pending = set(data_manager._prefetching.values())
+    for future in pending:
+        future.result(timeout=10)
+
+
+def test_desktop_page_is_one_grid_without_tile_widgets(feed):
+    at = feed()
+    assert not at.exception
+    [grid] = grids(at)
+    assert (len(grid['tiles']), grid['columns'], grid['mobile']) == (30, 2, False)
+    assert not [button for button in at.button if button.label in ("🔥", "How to Integrate?")]
+
+
+def test_next_page_details_are_prefetched(feed):
+    at = feed()
+    wait_for_prefetch()
+    # The first two pages are in memory before the user clicks "Next"
+    assert len(snapshot.get_detail_cache()) == 60
+
+    calls = feed.dm.sheet.api_calls
+    [button for button in at.button if button.label == "Next ▶️"][0].click().run()
+    [grid] = grids(at)
+    assert all(tile['steps'] is not None for tile in grid['tiles'])
+    wait_for_prefetch()  # Page three, in the background
+    assert feed.dm.sheet.api_calls == calls + 1
+
+
+def test_mobile_layout_sends_a_smaller_page_without_steps(feed):
+    first = grids(feed(mobile=True))[0]['tiles'][0]['tool_id']
+    wait_for_prefetch()
+
+    at = feed(mobile=True, flipped=[first])
+    [grid] = grids(at)
+    assert (len(grid['tiles']), grid['columns'], grid['mobile']) == (10, 1, True)
+    assert [tile['tool_id'] for tile in grid['tiles'] if tile['steps'] is not None] == [first]
+
+
+def test_grid_events_are_returned_once(monkeypatch):
+    state = {}
+    monkeypatch.setattr(tile_grid_module.st, 'session_state', state)
+    sent = []
+    monkeypatch.setattr(tile_grid_module, '_tile_grid', lambda **kwargs: sent.append(kwargs) or {'id': "e1", 'type': 'vote', 'tool_id': 7})
+
+    assert tile_grid_module.tile_grid([])['tool_id'] == 7
+    assert tile_grid_module.tile_grid([]) is None  # The component keeps returning its last value
+    assert sent[-1]['handled'] == "e1"
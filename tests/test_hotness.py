@@ -0,0 +1,96 @@
+import time
+import pytest
+from data_manager import DataManager
+from hotness import COUNTS_HEADERS, VOTE_HEADERS, VOTERS_PER_CELL, HotnessCounters
+
+
+@pytest.fixture
+def hotness_manager(standin_spreadsheet):
+    """Builds a DataManager over stand-in Hotness worksheets holding (tool, voted_at, voter) votes"""
+    def build(votes, counts_rows=None):
+        dm = DataManager.__new__(DataManager)
+        dm.hotness_sheet = standin_spreadsheet.add_worksheet("Hotness")
+        dm.hotness_sheet.rows = [VOTE_HEADERS] + [[tool, format(voter, 'x'), voted_at] for tool, voted_at, voter in votes]
+        dm.hotness_counts_sheet = None
+        if counts_rows is not None:
+            dm.hotness_counts_sheet = standin_spreadsheet.add_worksheet("Hotness_Counts")
+            dm.hotness_counts_sheet.rows = counts_rows
+        dm._legacy_votes = None
+        return dm
+
+    return build
+
+
+def test_buckets_and_trending():
+    now = 1_700_000_000
+    counters = HotnessCounters(half_life_hours=1)
+    counters.add(1, now - 3600, voter=1)
+    counters.add(1, now, voter=2)
+    counters.add(2, now - 8 * 24 * 3600, voter=1)
+
+    assert counters.totals() == {1: 2, 2: 1}
+    assert counters.last_days(1, 7, now=now) == 2
+    assert counters.last_days(2, 7, now=now) == 0
+    assert abs(counters.trending(1, now=now) - 1.5) < 1e-9
+    assert counters.has_voted(1, format(2, 'x')) and not counters.has_voted(2, format(2, 'x'))
+    assert not counters.add_once(1, now, 2)
+
+
+def test_counts_rows_split_voters_across_cells():
+    counters = HotnessCounters()
+    for voter in range(VOTERS_PER_CELL * 2 + 5):
+        counters.add(7, 1_700_000_000, voter=voter)
+    counters.compacted_through = 1_700_000_000.0
+
+    rows = counters.counts_rows(now=1_700_000_000)
+    assert len(rows) == 3
+    assert max(len(row[-1]) for row in rows) < 50_000
+
+    restored = HotnessCounters().load_counts(dict(zip(COUNTS_HEADERS, row)) for row in rows)
+    assert restored.totals() == {7: VOTERS_PER_CELL * 2 + 5}
+    assert restored._tools[7].voters == counters._tools[7].voters
+    assert restored.compacted_through == counters.compacted_through
+
+
+def test_compaction_resizes_counts_and_keeps_totals(hotness_manager):
+    old, recent = time.time() - 3 * 24 * 3600, time.time()
+    votes = [(tool, old + i, 1000 + i) for i, tool in enumerate([1, 2, 1, 3])] + [(1, recent, 9)]
+    # A freshly created worksheet has 1000 blank rows
+    dm = hotness_manager(votes, counts_rows=[COUNTS_HEADERS] + [[] for _ in range(999)])
+    log_before = dm.hotness_sheet.get_all_values()
+
+    assert dm.compact_hotness_log(older_than_hours=24) == 4
+    assert len(dm.hotness_counts_sheet.rows) == 4  # Header and tools 1, 2 and 3
+    assert len(dm.hotness_sheet.rows) == 2
+    assert dm.load_hotness_counters().totals() == {1: 3, 2: 1, 3: 1}
+
+    # A reader that got the log before the rows were deleted doesn't count them twice
+    dm.hotness_sheet.rows = log_before
+    assert dm.load_hotness_counters().totals() == {1: 3, 2: 1, 3: 1}
+
+
+def test_compaction_leaves_votes_appended_out_of_order(hotness_manager):
+    old = time.time() - 3 * 24 * 3600
+    # The last vote is older than the first one, so the watermark can't move past either
+    dm = hotness_manager([(1, old, 1), (2, time.time(), 2), (3, old - 60, 3)])
+
+    assert dm.compact_hotness_log(older_than_hours=24) == 0
+    assert dm.load_hotness_counters().totals() == {1: 1, 2: 1, 3: 1}
+
+
+def test_today_counts_from_the_hour_holding_local_midnight(monkeypatch):
+    monkeypatch.setenv('TZ', "Asia/Kolkata")  # UTC+5:30
+    time.tzset()
+    try:
+        midnight = 1_700_000_000 // 86400 * 86400 - 5.5 * 3600  # 00:00 IST, 18:30 UTC
+        counters = HotnessCounters()
+        counters.add(1, midnight - 20 * 60)  # 23:40 IST, in the 18:00 UTC bucket
+        counters.add(1, midnight - 40 * 60)  # 23:20 IST, the bucket before
+        counters.add(1, midnight + 3600)
+
+        now = midnight + 10 * 3600
+        assert counters.today(1, now=now) == 2
+        assert counters.overlay(now=now)['hotness_today'].tolist() == [2]
+    finally:
+        monkeypatch.undo()
+        time.tzset()
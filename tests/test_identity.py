@@ -0,0 +1,38 @@
+import hashlib
+import identity
+from identity import SessionIdentity, client_address, voter_digest
+
+
+def test_voter_keys_are_keyed_with_the_server_secret(monkeypatch):
+    unsalted = int.from_bytes(hashlib.sha1(b"203.0.113.7").digest()[:4], 'big')
+    digest = voter_digest("203.0.113.7")
+    assert digest == voter_digest("203.0.113.7") != unsalted
+    assert SessionIdentity("203.0.113.7", 'connection').voter == f"{digest:08x}"
+
+    monkeypatch.setattr(identity, '_voter_secret', b"another secret")
+    assert voter_digest("203.0.113.7") != digest
+
+
+def test_generated_secret_is_kept_on_disk(monkeypatch, tmp_path):
+    path = tmp_path / "voter_secret"
+    monkeypatch.setattr(identity, 'VOTER_SECRET_PATH', str(path))
+    secret = identity._load_voter_secret()
+    assert len(secret) == 64
+    assert identity._load_voter_secret() == secret == path.read_text()
+
+
+def test_client_address_trusts_only_proxy_added_hops():
+    forged = {'X-Forwarded-For': "1.2.3.4, 198.51.100.7, 10.0.0.2"}
+    assert client_address(forged, "10.0.0.3", trusted_proxies=1) == ("10.0.0.2", 'x-forwarded-for')
+    assert client_address(forged, "10.0.0.3", trusted_proxies=2) == ("198.51.100.7", 'x-forwarded-for')
+    assert client_address({'X-Forwarded-For': "198.51.100.7"}, None, trusted_proxies=2) == ("198.51.100.7", 'x-forwarded-for')
+    assert client_address({'X-Real-Ip': "198.51.100.8"}, None, trusted_proxies=1) == ("198.51.100.8", 'x-real-ip')
+
+
+def test_client_address_ignores_headers_without_proxies():
+    assert client_address({'X-Forwarded-For': "1.2.3.4"}, "198.51.100.9", trusted_proxies=0) == ("198.51.100.9", 'connection')
+    assert client_address({'X-Forwarded-For': "1.2.3.4"}, None, trusted_proxies=0) == (None, None)
+
+
+def test_forwarding_headers_are_ignored_by_default():
+    assert client_address({'X-Forwarded-For': "1.2.3.4"}, "198.51.100.9") == ("198.51.100.9", 'connection')
@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+from data_manager import CONTENT_COLUMNS
+
+
+def test_import_dedups_against_the_sheet_and_within_the_file(standin_data_manager, synthetic_catalog):
+    dm = standin_data_manager(5)
+    existing = synthetic_catalog(5)['Title'].iloc[0]
+    df = pd.DataFrame([
+        {'Title': "New Tool", 'Summary': "Does things", 'Source_URL': "https://new.example"},
+        {'Title': f" {existing} ", 'Summary': "Already there"},
+        {'Title': "New Tool", 'Summary': "Same title again"},
+        {'Title': "Draft", 'Summary': ""},
+        {'Title': "Bad Link", 'Summary': "x", 'Source_URL': "javascript:alert(1)"},
+        {'Title': "Bad Date", 'Summary': "x", 'Date_Added': "someday"},
+    ])
+    rows_before = len(dm.sheet.rows)
+
+    report = dm.import_tools(df)
+    assert report['added'] == ["New Tool"]
+    assert [(row, reason) for row, _, reason in report['rejected']] == [
+        (2, "already in the catalog"),
+        (3, "same title as row 1"),
+        (4, "missing Summary"),
+        (5, "Source_URL is not an http(s) link"),
+        (6, "invalid Date_Added 'someday'"),
+    ]
+    assert len(dm.sheet.rows) == rows_before + 1
+    assert dm.sheet.rows[-1][:3] == ["New Tool", "Does things", "https://new.example"]
+
+
+def test_dry_run_writes_nothing(standin_data_manager):
+    dm = standin_data_manager(5)
+    rows_before = len(dm.sheet.rows)
+    report = dm.import_tools(pd.DataFrame([{'Title': "New Tool", 'Summary': "Does things"}]), dry_run=True)
+    assert report['added'] == ["New Tool"] and len(dm.sheet.rows) == rows_before
+
+
+def test_sheet_without_a_content_column_is_refused(standin_data_manager):
+    dm = standin_data_manager(5)
+    dm.sheet.rows[0] = [col for col in CONTENT_COLUMNS if col != 'Domain']
+    with pytest.raises(ValueError, match="Domain"):
+        dm.import_tools(pd.DataFrame([{'Title': "New Tool", 'Summary': "Does things"}]))
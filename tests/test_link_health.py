@@ -0,0 +1,49 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from link_health import LINK_DEAD, LINK_OK, LINK_UNKNOWN, LinkHealthCache, _Host, classify, safe_url
+
+
+def test_classify():
+    assert [classify(code) for code in (200, 301, 404, 410, 403, 429, 503)] == [
+        LINK_OK, LINK_OK, LINK_DEAD, LINK_DEAD, LINK_UNKNOWN, LINK_UNKNOWN, LINK_UNKNOWN,
+    ]
+
+
+def test_safe_url_keeps_http_links_only():
+    assert safe_url(" https://tool.example/a ") == "https://tool.example/a"
+    assert safe_url("HTTP://tool.example") == "HTTP://tool.example"
+    assert [safe_url(url) for url in ("javascript:alert(1)", " JavaScript:x", "data:text/html,x", "tool.example", None)] == [''] * 5
+
+
+def test_requests_to_a_host_start_delay_apart():
+    host = _Host(2)
+    starts = []
+
+    def request(turn, late):
+        time.sleep(late)  # The pool thread picked the request up late
+        starts.append(time.monotonic())
+        _Host.started(turn)
+
+    async def check(pool, late):
+        turn = await host.turn(0.05)
+        await asyncio.get_running_loop().run_in_executor(pool, request, turn, late)
+
+    async def check_all():
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            await asyncio.gather(*(check(pool, late) for late in (0.08, 0, 0.08, 0)))
+
+    asyncio.run(check_all())
+    starts.sort()
+    assert min(b - a for a, b in zip(starts, starts[1:])) >= 0.05
+
+
+def test_cache_expiry_and_prune(tmp_path):
+    cache = LinkHealthCache(str(tmp_path / "links.json"))
+    now = time.time()
+    assert cache.put_many({"https://a.example": [LINK_OK, 200, now], "https://b.example": [LINK_DEAD, 404, now - 7200]})
+    assert cache.stale(["https://a.example", "https://b.example", "https://c.example"], now=now) == [
+        "https://b.example", "https://c.example",
+    ]
+    cache.prune(["https://a.example"])
+    assert LinkHealthCache(cache.path).statuses() == {"https://a.example": LINK_OK}
@@ -0,0 +1,39 @@
+from identity import SessionIdentity
+from rate_limit import SlidingWindowLimiter, VoteRateLimiter, ip_prefix
+
+
+def test_ip_prefix_groups_networks():
+    assert ip_prefix("198.51.100.7") == "198.51.100.0/24"
+    assert ip_prefix("::ffff:198.51.100.7") == "198.51.100.0/24"
+    assert ip_prefix("2001:db8:1:2::1") == "2001:db8:1::/48"
+    assert ip_prefix("session_abc") == "no-address"
+
+
+def test_sliding_window_weights_the_previous_window():
+    limiter = SlidingWindowLimiter(limit=4, window=60)
+    for _ in range(4):
+        limiter.hit("a", 30)
+    assert limiter.count("a", 59) == 4
+    # A quarter into the next window, three quarters of the old count still overlap
+    assert limiter.count("a", 75) == 3
+    assert limiter.retry_after("a", 75) == 0
+    assert limiter.count("a", 200) == 0
+
+
+def test_keys_are_bounded():
+    limiter = SlidingWindowLimiter(limit=1, window=60, max_keys=2)
+    for key in "abc":
+        limiter.hit(key, 0)
+    assert len(limiter) == 2 and limiter.evicted == 1
+
+
+def test_votes_limited_per_voter_and_per_prefix():
+    limiter = VoteRateLimiter(per_voter=2, per_prefix=3, window=60)
+    voter = SessionIdentity("198.51.100.7", 'connection')
+    assert [limiter.allow(voter, now=0) for _ in range(3)] == [True, True, False]
+    assert limiter.retry_after(voter, now=0) == 60
+
+    neighbours = [SessionIdentity(f"198.51.100.{i}", 'connection') for i in (8, 9)]
+    assert [limiter.allow(identity, now=1) for identity in neighbours] == [True, False]
+    assert limiter.allow(SessionIdentity("203.0.113.1", 'connection'), now=1)
+    assert limiter.status()['limited_prefix'] == 1
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+from data_manager import assign_tool_ids, compact_catalog, dataset_version, memory_report
+
+
+def raw_catalog():
+    return pd.DataFrame({
+        'Title': ["SQL Copilot", "Meeting Notes", None],
+        'Summary': ["Writes sql", "Summarizes meetings", "Fills spreadsheets"],
+        'Domain': ["Data", "Meetings", "Data"],
+        'Author/Company': ["Acme", None, "Acme"],
+        'tool_id': ["1", "2", "x"],
+        'sheet_row': [2, 3, 4],
+        'hotness_count': [3, None, 1],
+        'hotness_trending': [0.5, None, 2],
+    })
+
+
+def test_compact_schema_dtypes():
+    df = compact_catalog(raw_catalog())
+    assert isinstance(df['Domain'].dtype, pd.CategoricalDtype)
+    assert df['Domain'].cat.categories.tolist() == ["Data", "Meetings"]
+    assert df['Author/Company'].tolist() == ["Acme", "", "Acme"]
+    assert df['Title'].tolist() == ["SQL Copilot", "Meeting Notes", ""]
+    assert df['tool_id'].dtype == np.int64 and df['tool_id'].tolist() == [1, 2, 0]
+    assert df['sheet_row'].dtype == df['hotness_count'].dtype == np.int32
+    assert df['hotness_count'].tolist() == [3, 0, 1]
+    assert df['hotness_trending'].dtype == np.float32
+
+
+def test_compacting_keeps_the_input_and_the_version():
+    raw = raw_catalog()
+    df = compact_catalog(assign_tool_ids(raw.fillna({'Title': "Sheet Helper"})))
+    assert raw['Domain'].dtype != df['Domain'].dtype
+    assert dataset_version(df) == dataset_version(compact_catalog(df))
+    assert compact_catalog(pd.DataFrame()).empty
+
+
+def test_memory_report_covers_every_column():
+    df = compact_catalog(raw_catalog())
+    report = memory_report(df)
+    assert report['version'] == dataset_version(df) and report['rows'] == 3
+    assert set(report['columns']) == {'Index', *df.columns}
+    assert report['columns']['Domain']['dtype'] == 'category'
+    assert report['total_bytes'] == sum(column['bytes'] for column in report['columns'].values())
+    assert report['bytes_per_tool'] == report['total_bytes'] // 3
+    assert memory_report(pd.DataFrame())['bytes_per_tool'] == 0
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+from search_index import SearchIndex, tokenize
+
+
+def catalog():
+    return pd.DataFrame({
+        'tool_id': [10, 11, 12, 13],
+        'Title': ["SQL Copilot", "Meeting Notes", "Dashboard Builder", "Forecast Studio"],
+        'Summary': [
+            "Writes sql queries from plain English",
+            "Summarizes meetings and action items",
+            "Turns a sql table into a dashboard",
+            "Predictive models for spreadsheets",
+        ],
+    }, index=[100, 101, 102, 103])
+
+
+def test_tokenize_drops_stopwords_and_punctuation():
+    assert tokenize("The SQL-to-Chart tool, for you!") == ['sql', 'chart', 'tool']
+    assert tokenize(None) == []
+
+
+def test_title_hits_rank_above_summary_hits():
+    labels = SearchIndex(catalog()).search("sql ")
+    assert list(labels) == [100, 102]
+
+
+def test_trailing_word_matches_as_prefix():
+    index = SearchIndex(catalog())
+    assert list(index.search("dash")) == [102]
+    assert list(index.search("dash ")) == []
+
+
+def test_hotness_lifts_an_equally_relevant_tool():
+    index = SearchIndex(catalog())
+    assert list(index.search("sql ")) == [100, 102]
+    assert list(index.search("sql ", hotness=np.array([0, 0, 500, 0])))[0] == 102
+
+
+def test_mask_and_limit():
+    index = SearchIndex(catalog())
+    assert list(index.search("sql ", mask=np.array([False, True, True, True]))) == [102]
+    assert len(index.search("sql ", limit=1)) == 1
+
+
+def test_details_are_indexed_by_tool_id():
+    index = SearchIndex(catalog(), details={13: {'Integration_Steps': "Connect your warehouse"}})
+    assert list(index.search("warehouse ")) == [103]
+    assert list(index.search("nothing ")) == []
+
+
+def test_details_arriving_later_are_indexed_incrementally():
+    from snapshot import DetailCache
+
+    index = SearchIndex(catalog())
+    cache = DetailCache()
+    assert list(index.update_details(cache).search("warehouse ")) == []
+
+    cache.put_many({12: {'Integration_Steps': "Point it at your warehouse"}})
+    assert list(index.update_details(cache).search("warehouse ")) == [102]
+    assert list(index.search("wareh")) == [102]
+    # Title hits still outrank detail hits
+    cache.put_many({11: {'Integration_Steps': "Share the dashboard link"}})
+    assert list(index.update_details(cache).search("dashboard "))[0] == 102
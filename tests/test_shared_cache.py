@@ -0,0 +1,65 @@
+import time
+from hotness import HotnessCounters
+from shared_cache import SharedCache
+
+
+def replicas(tmp_path, count=2):
+    path = str(tmp_path / "shared.sqlite")
+    return [SharedCache(path, poll_interval=0, replica=f"replica-{i}") for i in range(count)]
+
+
+def test_one_replica_holds_a_lease_until_it_expires(tmp_path):
+    first, second = replicas(tmp_path)
+    assert first.try_lease("catalog", 0.2)
+    assert not second.try_lease("catalog", 0.2)
+    assert first.try_lease("catalog", 0.2)  # The holder renews its own lease
+
+    time.sleep(0.25)
+    assert second.try_lease("catalog", 60)
+    assert not first.try_lease("catalog", 60)
+    assert (first.stats['leases_won'], second.stats['leases_lost']) == (2, 1)
+
+
+def test_losers_retry_once_per_poll_interval(tmp_path):
+    first, second = replicas(tmp_path)
+    second.poll_interval = 60
+    assert first.try_lease("hotness", 0.01)
+    assert not second.try_lease("hotness", 60)
+
+    time.sleep(0.02)
+    assert not second.try_lease("hotness", 60)  # Expired, but too soon to ask again
+    assert second.stats['leases_lost'] == 1
+
+
+def test_vote_deltas_replay_once(tmp_path):
+    first, second = replicas(tmp_path)
+    first.publish_vote(7, 0xabc, 1_700_000_000)
+    first.publish_vote(7, 0xabc, 1_700_000_000)
+    first.publish_vote(8, 0xdef, 1_700_000_001)
+
+    counters = HotnessCounters()
+    assert second._replay(counters, 0) == 2
+    assert counters.totals() == {7: 1, 8: 1}
+    assert second._replay(counters, second._last_vote) == 0
+    assert first._replay(HotnessCounters(), 0, skip_own=True) == 0
+
+
+def test_deltas_stay_until_a_hotness_read_counted_them(tmp_path):
+    first, second = replicas(tmp_path)
+    # Queued by the circuit breaker: shared right away, in the sheet only after the queue flushes
+    first.publish_vote(7, 0xabc, 1_700_000_000)
+
+    def read(*votes):
+        counters = HotnessCounters()
+        for tool, voter in votes:
+            counters.add(tool, 1_700_000_000, voter=voter)
+        counters.vote_mark = first.vote_mark()
+        return counters
+
+    for _ in range(2):
+        assert first.publish_hotness(read()).totals() == {7: 1}
+    assert second._replay(HotnessCounters(), 0) == 1  # Still shared
+
+    first.publish_hotness(read((7, 0xabc)))
+    first.publish_hotness(read((7, 0xabc)))
+    assert first._replay(HotnessCounters(), 0) == 0
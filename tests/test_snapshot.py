@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+from hotness import HotnessCounters
+from snapshot import CatalogSnapshot
+
+
+def snapshot():
+    frame = pd.DataFrame({'tool_id': [1, 2], 'Title': ["A", "B"], 'Source_URL': ["https://a.example ", "ftp://b"]})
+    return CatalogSnapshot(frame, "v1")
+
+
+def test_snapshot_is_immutable_and_owns_its_buffers():
+    frame = pd.DataFrame({'tool_id': [1, 2]})
+    current = CatalogSnapshot(frame, "v1")
+    frame.loc[0, 'tool_id'] = 9
+    assert current.frame['tool_id'].tolist() == [1, 2]
+    with pytest.raises(AttributeError):
+        current.version = "v2"
+    with pytest.raises(ValueError):
+        current.frame['tool_id'].to_numpy()[0] = 9
+
+
+def test_frames_handed_out_copy_on_write():
+    current = snapshot()
+    frame = current.frame
+    frame.loc[0, 'Title'] = "Changed"
+    assert current.frame['Title'].tolist() == ["A", "B"]
+
+
+def test_overlays_bump_their_own_revision():
+    current = snapshot()
+    counters = HotnessCounters()
+    counters.add(1, 1_700_000_000)
+    hot = current.with_hotness(counters)
+    linked = hot.with_link_status({"https://a.example": "ok"})
+
+    assert (hot.hotness_revision, hot.link_revision) == (1, 0)
+    assert (linked.hotness_revision, linked.link_revision) == (1, 1)
+    assert linked.version == "v1.1.1"
+    assert linked.frame['link_status'].astype(str).tolist() == ["ok", ""]
+    assert linked.frame['hotness_count'].tolist() == [1, 0]
+    # Link status survives the next hotness overlay
+    assert 'link_status' in linked.with_hotness(counters).frame.columns
@@ -0,0 +1,89 @@
+import json
+import pandas as pd
+import pytest
+import static_export
+from hotness import HotnessCounters
+from snapshot import CatalogSnapshot, DetailCache
+from static_export import StaticExporter, domain_slugs
+
+
+def snapshot(votes=()):
+    frame = pd.DataFrame({
+        'tool_id': [1, 2, 3],
+        'sheet_row': [2, 3, 4],
+        'Title': ["SQL Copilot", "Meeting Notes", "Sheet Helper"],
+        'Summary': ["Writes sql", "Summarizes meetings", "Fills spreadsheets"],
+        'Source_URL': ["https://a.example", "https://b.example", "https://c.example"],
+        'Author/Company': ["Acme", "Beta", "Acme"],
+        'Domain': ["AI & ML", "AI/ML", "Data"],
+        'Date_Added': pd.to_datetime(["2025-01-01", "2025-02-01", "2025-03-01"]),
+    })
+    counters = HotnessCounters()
+    for tool in votes:
+        counters.add(tool, 1_700_000_000)
+    return CatalogSnapshot(frame, "v1").with_hotness(counters)
+
+
+class StandInDataManager:
+    sheet = True
+
+    def __init__(self):
+        self.loads = 0
+
+    def load_all_details(self, frame):
+        self.loads += 1
+        return {tool_id: {'Integration_Steps': f"Install tool {tool_id}\nConnect it"} for tool_id in frame['tool_id']}
+
+
+@pytest.fixture(autouse=True)
+def detail_cache(monkeypatch):
+    cache = DetailCache()
+    monkeypatch.setattr(static_export, 'get_detail_cache', lambda: cache)
+    return cache
+
+
+def read(out, path):
+    with open(out / path, encoding='utf-8') as f:
+        return f.read()
+
+
+def test_domains_that_slugify_alike_get_their_own_pages(tmp_path):
+    assert domain_slugs(["AI/ML", "Data", "AI & ML"]) == {"AI & ML": "ai-ml", "AI/ML": "ai-ml-2", "Data": "data"}
+
+    StaticExporter(str(tmp_path)).export(snapshot())
+    assert "SQL Copilot" in read(tmp_path, "domains/ai-ml/1.html")
+    assert "Meeting Notes" in read(tmp_path, "domains/ai-ml-2/1.html")
+    assert 'href="../domains/ai-ml-2/1.html"' in read(tmp_path, "tools/2.html")
+
+
+def test_tool_pages_get_details_from_sheets_or_the_last_export(tmp_path):
+    dm = StandInDataManager()
+    StaticExporter(str(tmp_path), data_manager=dm).export(snapshot())
+    assert dm.loads == 1 and "<li>Install tool 1</li>" in read(tmp_path, "tools/1.html")
+
+    # Offline re-export from the disk snapshot: the steps stay
+    stats = StaticExporter(str(tmp_path)).export(snapshot())
+    assert stats['written'] == 0
+    assert "<li>Install tool 1</li>" in read(tmp_path, "tools/1.html")
+
+
+def test_reexport_rewrites_only_changed_pages(tmp_path):
+    exporter = StaticExporter(str(tmp_path), data_manager=StandInDataManager())
+    first = exporter.export(snapshot())
+    manifest = json.loads(read(tmp_path, "manifest.json"))
+    assert manifest['version'] == snapshot().version and first['written'] == len(manifest['files'])
+
+    # A vote for tool 3 changes its tool files, its domain page and the feed, not the AI domains
+    again = exporter.export(snapshot(votes=[3]))
+    changed = {path for path, inputs in json.loads(read(tmp_path, "manifest.json"))['files'].items()
+               if manifest['files'].get(path) != inputs}
+    assert changed == {"tools/3.json", "tools/3.html", "domains/data/1.json", "domains/data/1.html",
+                       "feed/1.json", "feed/1.html", "index.html"}
+    assert (again['written'], again['removed']) == (len(changed), 0)
+
+    # A tool that left the catalog takes its files along
+    frame = snapshot().frame
+    smaller = CatalogSnapshot(frame[frame['tool_id'] != 2], "v2").with_hotness(HotnessCounters())
+    removed = exporter.export(smaller)['removed']
+    assert removed == 4  # tools/2.json, tools/2.html and the AI/ML domain page pair
+    assert not (tmp_path / "tools/2.html").exists() and not (tmp_path / "domains/ai-ml-2/1.html").exists()
@@ -0,0 +1,49 @@
+import threading
+import ui_state
+from ui_state import RenderTimeline, TileState, session_memory_report
+
+
+def test_tile_state_keeps_the_current_page_and_evicts_the_oldest():
+    state = TileState(max_entries=3)
+    for tool_id in range(6):
+        state.set_flipped(tool_id)
+    state.toggle_expanded(0)
+    state.set_flipped(1)  # Flipping again makes it the newest entry
+
+    state.evict(keep=[0, 2])
+    assert list(state.flipped) == [0, 2, 1]
+    assert state.is_expanded(0) and len(state) == 4
+
+    state.set_flipped(2, False)
+    state.toggle_expanded(0)
+    assert not state.is_flipped(2) and not state.is_expanded(0)
+
+
+def test_eviction_never_drops_tiles_on_the_page():
+    state = TileState(max_entries=2)
+    for tool_id in range(5):
+        state.set_flipped(tool_id)
+    state.evict(keep=range(5))
+    assert len(state.flipped) == 5
+
+
+def test_render_timeline_keeps_a_few_reruns():
+    timeline = RenderTimeline()
+    for _ in range(8):
+        timeline.mark("first_tile")
+        timeline.mark("first_tile")
+        timeline.start()
+    assert len(timeline.history) == 5
+    assert all(list(marks) == ["first_tile"] for _, marks in timeline.history)
+
+
+def test_session_memory_report(monkeypatch):
+    state = TileState()
+    for tool_id in range(100):
+        state.set_flipped(tool_id)
+    monkeypatch.setattr(ui_state.st, 'session_state', {'tile_state': state, 'lock': threading.Lock()})
+
+    report = session_memory_report()
+    assert list(report['entries']) == ['tile_state', 'lock']  # Largest first, the lock isn't picklable
+    assert report['entries']['tile_state'] > 100
+    assert report['total_bytes'] == sum(report['entries'].values())
@@ -0,0 +1,44 @@
+import data_manager
+import pytest
+from snapshot import CatalogSnapshot
+from warmup import WarmUp, load_disk_snapshot
+
+
+@pytest.fixture
+def warm_up(monkeypatch):
+    """Builds a WarmUp whose DataManager's refresh returns the given snapshot"""
+    def build(snapshot):
+        class StandInDataManager:
+            sheet = object()
+
+            def refresh_snapshot(self):
+                return snapshot
+
+        monkeypatch.setattr(data_manager, 'DataManager', StandInDataManager)
+        warm_up = WarmUp()
+        warm_up._refresh()
+        return warm_up
+
+    return build
+
+
+def test_disk_snapshot_round_trips_the_saved_catalog(synthetic_catalog, tmp_path):
+    catalog = synthetic_catalog(20)
+    path = tmp_path / "news_cache.csv"
+    catalog.to_csv(path, index=False)
+
+    snapshot = load_disk_snapshot(str(path))
+    assert snapshot.source == "disk" and len(snapshot) == 20
+    assert snapshot.frame['tool_id'].tolist() == catalog['tool_id'].tolist()
+    assert load_disk_snapshot(str(tmp_path / "missing.csv")) is None
+
+
+def test_ready_only_after_a_sheets_refresh(warm_up, synthetic_catalog):
+    catalog = synthetic_catalog(5)
+    ready = warm_up(CatalogSnapshot(catalog, "v1"))
+    assert ready.is_ready() and ready.status()['error'] is None
+
+    # Sheets failed and the refresh fell back to the cache file
+    fallback = warm_up(CatalogSnapshot(catalog, "v1", source="disk"))
+    assert fallback.is_finished() and not fallback.is_ready()
+    assert "cached catalog" in fallback.status()['error']
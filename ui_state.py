@@ -0,0 +1,131 @@
+"""
+Per-session UI state for aINeedToKnow - flipped/expanded tiles kept as two small ordered
+sets of tool IDs instead of one session_state entry per tile, bounded as the user pages
+"""
+import pickle
+import re
+import sys
+import time
+import streamlit as st
+from config import *
+from identity import request_headers
+
+MOBILE_USER_AGENT = re.compile(r"Mobi|Android|iPhone|iPod", re.IGNORECASE)
+
+
+class TileState:
+    """Flipped and expanded tool IDs for one session (oldest entries are evicted first)"""
+
+    __slots__ = ('flipped', 'expanded', 'max_entries')
+
+    def __init__(self, max_entries=MAX_TILE_STATE):
+        # Dicts as insertion-ordered sets
+        self.flipped = {}
+        self.expanded = {}
+        self.max_entries = max_entries
+
+    def is_flipped(self, tool_id):
+        return tool_id in self.flipped
+
+    def is_expanded(self, tool_id):
+        return tool_id in self.expanded
+
+    def set_flipped(self, tool_id, flipped=True):
+        self._set(self.flipped, tool_id, flipped)
+
+    def toggle_expanded(self, tool_id):
+        self._set(self.expanded, tool_id, tool_id not in self.expanded)
+
+    def _set(self, entries, tool_id, on):
+        entries.pop(tool_id, None)
+        if on:
+            entries[tool_id] = None
+
+    def __len__(self):
+        return len(self.flipped) + len(self.expanded)
+
+    def evict(self, keep=()):
+        """Drop the oldest entries for tools not in keep (the current page) once over the bound"""
+        keep = set(keep)
+        for entries in (self.flipped, self.expanded):
+            stale = [tool_id for tool_id in entries if tool_id not in keep]
+            for tool_id in stale[:max(len(entries) - self.max_entries, 0)]:
+                del entries[tool_id]
+
+
+def get_tile_state():
+    """This session's TileState"""
+    if 'tile_state' not in st.session_state:
+        st.session_state.tile_state = TileState()
+    return st.session_state.tile_state
+
+
+class RenderTimeline:
+    """When each part of the page was sent during this rerun (ms since the script started)
+
+    The last few reruns are kept in history as (started, marks), e.g. to follow a page
+    that streams in over a follow-up rerun.
+    """
+
+    __slots__ = ('started', 'marks', 'history')
+
+    def __init__(self):
+        self.marks = {}
+        self.history = []
+        self.start()
+
+    def start(self):
+        if self.marks:
+            self.history = self.history[-4:] + [(self.started, self.marks)]
+        self.started = time.perf_counter()
+        self.marks = {}
+
+    def mark(self, label):
+        """Record label the first time it is reached in this rerun"""
+        self.marks.setdefault(label, round((time.perf_counter() - self.started) * 1000, 1))
+
+
+def get_render_timeline():
+    """This session's RenderTimeline"""
+    if 'render_timeline' not in st.session_state:
+        st.session_state.render_timeline = RenderTimeline()
+    return st.session_state.render_timeline
+
+
+def is_mobile_layout():
+    """Phone layout for this session: ?mobile=1/0 wins, then the viewport width the page
+    reported (see components.tile_grid), then a User-Agent guess for the first render"""
+    override = st.query_params.get("mobile")
+    if override in ("0", "1"):
+        return override == "1"
+
+    width = st.session_state.get('viewport_width')
+    if width:
+        return width < MOBILE_BREAKPOINT
+
+    try:
+        user_agent = request_headers().get('User-Agent', '')
+    except Exception:
+        user_agent = ''
+    return bool(MOBILE_USER_AGENT.search(user_agent or ''))
+
+
+def set_viewport_width(width):
+    """Remember the reported viewport width; True if that switches the layout"""
+    was_mobile = is_mobile_layout()
+    st.session_state.viewport_width = int(width or 0)
+    return is_mobile_layout() != was_mobile
+
+
+def session_memory_report():
+    """Approximate bytes held by each st.session_state entry of this session"""
+    sizes = {}
+    for key, value in st.session_state.items():
+        try:
+            sizes[str(key)] = len(pickle.dumps(value))
+        except Exception:
+            sizes[str(key)] = sys.getsizeof(value)  # Not picklable (e.g. the DataManager), shallow size
+    return {
+        'total_bytes': sum(sizes.values()),
+        'entries': dict(sorted(sizes.items(), key=lambda item: item[1], reverse=True)),
+    }
@@ -0,0 +1,136 @@
+"""
+Server boot warm-up for aINeedToKnow - serves the last on-disk snapshot right away
+and refreshes the catalog from Google Sheets in the background
+"""
+import os
+import threading
+import time
+from datetime import datetime
+from config import *
+from snapshot import CatalogSnapshot, get_snapshot_store
+from shared_cache import get_shared_cache
+from link_health import with_link_status
+
+
+class WarmUp:
+    """Process-wide warm-up state shared by every session"""
+
+    def __init__(self):
+        self.snapshot_loaded_at = None
+        self.refreshed_at = None
+        self.data_manager = None
+        self.error = None
+        self._connected = threading.Event()
+        self._finished = threading.Event()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Load the on-disk snapshot and kick off the background refresh (only once per process)"""
+        with self._lock:
+            if self._thread is not None:
+                return self
+
+            self._load_snapshot()
+            self._thread = threading.Thread(target=self._refresh, name="catalog-warm-up", daemon=True)
+            self._thread.start()
+        return self
+
+    def wait_for_connection(self, timeout=None):
+        """Block until the shared DataManager has authorized (or the timeout expired)"""
+        self._connected.wait(timeout)
+        return self.data_manager if self.data_manager and self.data_manager.sheet else None
+
+    def is_finished(self):
+        """True once the background refresh is over, whether it succeeded or not"""
+        return self._finished.is_set()
+
+    def is_ready(self):
+        """True once fresh data from Google Sheets is in the shared snapshot"""
+        return self._finished.is_set() and self.error is None
+
+    def wait(self, timeout=None):
+        """Block until the background refresh is over (or the timeout expired)"""
+        return self._finished.wait(timeout)
+
+    def status(self):
+        """Readiness signal for diagnostics"""
+        snapshot = get_snapshot_store().current()
+        return {
+            'ready': self.is_ready(),
+            'finished': self.is_finished(),
+            'snapshot': snapshot.info() if snapshot is not None else None,
+            'snapshot_loaded_at': self.snapshot_loaded_at,
+            'refreshed_at': self.refreshed_at,
+            'error': self.error,
+        }
+
+    def _load_snapshot(self):
+        """Publish the last saved catalog from the local cache file"""
+        try:
+            snapshot = load_disk_snapshot()
+            if snapshot is None:
+                print("⚠️ No on-disk snapshot yet, first refresh will start cold")
+                return
+
+            store = get_snapshot_store()
+            if store.current() is None:
+                store.publish(with_link_status(snapshot))
+            self.snapshot_loaded_at = datetime.now()
+            print(f"📦 Loaded on-disk snapshot with {len(snapshot)} tools")
+
+        except Exception as e:
+            print(f"❌ Error loading on-disk snapshot: {e}")
+
+    def _refresh(self):
+        """Authorize, fetch tools + hotness and publish the fresh snapshot"""
+        store = get_snapshot_store()
+        store.begin_refresh()
+        try:
+            from data_manager import DataManager
+
+            print("🔥 Warming up catalog cache...")
+            started = time.monotonic()
+            self.data_manager = DataManager()
+            self._connected.set()
+            if not self.data_manager.sheet:
+                raise RuntimeError("No Google Sheets connection")
+
+            # Another replica may have published a fresh catalog already, only read Sheets if not
+            shared = get_shared_cache()
+            snapshot = shared.adopt_fresh_catalog(CACHE_DURATION * 3600) if shared is not None else None
+            if snapshot is None:
+                snapshot = self.data_manager.refresh_snapshot()
+            # refresh_snapshot falls back to the cache file instead of raising when Sheets fails
+            if snapshot.source != "sheets":
+                raise RuntimeError("Google Sheets refresh failed, serving the cached catalog")
+            self.refreshed_at = datetime.now()
+            print(f"✅ Warm-up finished in {time.monotonic() - started:.1f}s with {len(snapshot)} tools")
+
+        except Exception as e:
+            self.error = str(e)
+            print(f"❌ Warm-up refresh failed: {e}")
+
+        finally:
+            store.end_refresh()
+            self._connected.set()
+            self._finished.set()
+
+
+def load_disk_snapshot(path=NEWS_CACHE_PATH):
+    """The last saved catalog (with its hotness columns) as a snapshot, None if there is none"""
+    if not os.path.exists(path):
+        return None
+
+    from data_manager import dataset_version, read_catalog_csv
+
+    df = read_catalog_csv(path)
+    return CatalogSnapshot(df, dataset_version(df), source="disk", created_at=os.path.getmtime(path), copy=False)
+
+
+_warm_up = WarmUp()
+
+
+def start_warm_up():
+    """Start the process-wide warm-up (safe to call on every rerun)"""
+    return _warm_up.start()